@@ -0,0 +1,654 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2016 Zuse Institute Berlin, www.zib.de
+
+Permissions are granted as stated in the license file you have obtained
+with this software. If you find the library useful for your purpose,
+please refer to README.md for how to cite IPET.
+
+@author: Gregor Hendel
+"""
+from ipet import Key
+import numpy as np
+import pandas as pd
+
+KIND_BOOL = "bool"
+KIND_INT = "int"
+KIND_FLOAT = "float"
+KIND_OBJECT = "object"
+
+kind2dtype = {
+              KIND_BOOL : np.bool_,
+              KIND_INT : np.int64,
+              KIND_FLOAT : np.float64,
+              KIND_OBJECT : object
+              }
+"""map from the kinds of data columns to the dtypes of their arrays"""
+
+kind2fillvalue = {
+                  KIND_BOOL : False,
+                  KIND_INT : 0,
+                  KIND_FLOAT : np.nan,
+                  KIND_OBJECT : np.nan
+                  }
+"""map from the kinds of data columns to the values of unset entries"""
+
+INT64_MIN = np.iinfo(np.int64).min
+INT64_MAX = np.iinfo(np.int64).max
+
+type2kind = {
+             float : KIND_FLOAT,
+             bool : KIND_BOOL,
+             str : KIND_OBJECT,
+             type(None) : None
+             }
+"""shortcut for the kinds of the most frequent value types; integers need a range check"""
+
+dtypekind2kind = {
+                  "b" : KIND_BOOL,
+                  "i" : KIND_INT,
+                  "f" : KIND_FLOAT
+                  }
+"""map from the dtype kinds of numeric arrays to the kinds of data columns"""
+
+def getKind(value):
+    """ Return the kind of a data column that can store the given value
+
+    None fits into columns of every kind, integers that exceed the 64 bit range are stored as objects
+    """
+    if value is None:
+        return None
+    if isinstance(value, (bool, np.bool_)):
+        return KIND_BOOL
+    if isinstance(value, (int, np.integer)):
+        return KIND_INT if INT64_MIN <= value <= INT64_MAX else KIND_OBJECT
+    if isinstance(value, (float, np.floating)):
+        return KIND_FLOAT
+    return KIND_OBJECT
+
+def getArrayKind(values, valuetypes):
+    """ Return the kind of a data column that can store all values of a list or an object array, see getKind()
+
+    Parameters
+    ----------
+    values
+        list or object array of values
+    valuetypes
+        the set of the types of the values
+    """
+    kind = None
+    if valuetypes.issubset(type2kind):
+        for valuetype in valuetypes:
+            kind = promoteKinds(kind, type2kind[valuetype])
+    else:
+        for value in values:
+            valuetype = type(value)
+            kind = promoteKinds(kind, type2kind[valuetype] if valuetype in type2kind else getKind(value))
+    return kind
+
+def promoteKinds(kind, otherkind):
+    """ Return the kind of a data column that can store the values of two kinds
+    """
+    if kind is None or kind == otherkind:
+        return otherkind
+    if otherkind is None:
+        return kind
+    if {kind, otherkind} == {KIND_INT, KIND_FLOAT}:
+        return KIND_FLOAT
+    return KIND_OBJECT
+
+class DataColumn:
+    """
+    a growable, typed array for the data of a single data key, indexed by problem id
+
+    Problems for which no data was stored and problems whose value is None are marked in two separate masks.
+    The array has the narrowest kind that represents all stored values, see getKind(); storing a value
+    of another kind promotes the whole column.
+    """
+    INITIAL_CAPACITY = 16
+
+    def __init__(self):
+        self.kind = None
+        self.values = np.empty(0, dtype = np.float64)
+        self.isset = np.zeros(0, dtype = np.bool_)
+        self.isnone = np.zeros(0, dtype = np.bool_)
+
+    def __getstate__(self):
+        # do not pickle the unused capacity of the arrays
+        length = len(self)
+        return {"kind" : self.kind, "values" : self.values[:length].copy(), "isset" : self.isset[:length].copy(),
+                "isnone" : self.isnone[:length].copy()}
+
+    def __len__(self):
+        """ Return one more than the largest problem id with stored data
+        """
+        setpositions = np.flatnonzero(self.isset)
+        return int(setpositions[-1]) + 1 if len(setpositions) > 0 else 0
+
+    def ensureCapacity(self, capacity):
+        """ Grow the arrays of this column such that they can store data for at least capacity problems
+        """
+        oldcapacity = len(self.values)
+        if capacity <= oldcapacity:
+            return
+        newcapacity = max(capacity, 2 * oldcapacity, DataColumn.INITIAL_CAPACITY)
+        values = np.full(newcapacity, kind2fillvalue[self.kind or KIND_FLOAT], dtype = kind2dtype[self.kind or KIND_FLOAT])
+        values[:oldcapacity] = self.values
+        isset = np.zeros(newcapacity, dtype = np.bool_)
+        isset[:oldcapacity] = self.isset
+        isnone = np.zeros(newcapacity, dtype = np.bool_)
+        isnone[:oldcapacity] = self.isnone
+        self.values = values
+        self.isset = isset
+        self.isnone = isnone
+
+    def promote(self, kind):
+        """ Convert this column such that it can store values of the given kind
+        """
+        newkind = promoteKinds(self.kind, kind)
+        if newkind == self.kind:
+            return
+        values = self.values.astype(kind2dtype[newkind])
+        # the fill values of integer and boolean columns are no valid data of other kinds
+        values[~self.isset] = kind2fillvalue[newkind]
+        values[self.isnone] = None if newkind == KIND_OBJECT else kind2fillvalue[newkind]
+        self.values = values
+        self.kind = newkind
+
+    def set(self, problemid, value):
+        """ Store the value for the given problem id
+        """
+        valuetype = type(value)
+        kind = type2kind[valuetype] if valuetype in type2kind else getKind(value)
+        if kind != self.kind and kind is not None:
+            self.promote(kind)
+        if problemid >= len(self.values):
+            self.ensureCapacity(problemid + 1)
+        if value is None:
+            self.isnone[problemid] = True
+            if self.kind != KIND_OBJECT:
+                value = kind2fillvalue[self.kind or KIND_FLOAT]
+        elif self.isnone[problemid]:
+            self.isnone[problemid] = False
+        self.values[problemid] = value
+        self.isset[problemid] = True
+
+    def setValues(self, problemids, values):
+        """ Store the values for a list or an array of distinct problem ids at once, see set()
+
+        The values are a list or an array, numeric arrays are stored without inspecting their single values
+        """
+        if len(problemids) == 0:
+            return
+        isnumeric = isinstance(values, np.ndarray) and values.dtype.kind in dtypekind2kind
+        valuetypes = None if isnumeric else set(map(type, values))
+        kind = dtypekind2kind[values.dtype.kind] if isnumeric else getArrayKind(values, valuetypes)
+        if kind != self.kind and kind is not None:
+            self.promote(kind)
+        problemids = np.asarray(problemids, dtype = np.int64)
+        self.ensureCapacity(int(problemids.max()) + 1)
+
+        if isnumeric:
+            self.values[problemids] = values.astype(self.values.dtype)
+            self.isnone[problemids] = False
+            self.isset[problemids] = True
+            return
+
+        if type(None) in valuetypes:
+            isnone = np.fromiter((value is None for value in values), dtype = np.bool_, count = len(values))
+        else:
+            isnone = np.zeros(len(values), dtype = np.bool_)
+        if self.kind == KIND_OBJECT:
+            array = values if isinstance(values, np.ndarray) else np.fromiter(values, dtype = object, count = len(values))
+        else:
+            fillvalue = kind2fillvalue[self.kind or KIND_FLOAT]
+            array = np.array([fillvalue if value is None else value for value in values], dtype = self.values.dtype)
+        self.values[problemids] = array
+        self.isnone[problemids] = isnone
+        self.isset[problemids] = True
+
+    def get(self, problemid):
+        """ Return the value for the given problem id, or None, if no value was stored
+        """
+        if problemid >= len(self.values) or not self.isset[problemid] or self.isnone[problemid]:
+            return None
+        value = self.values[problemid]
+        if self.kind == KIND_OBJECT:
+            return value
+        return value.item()
+
+    def unset(self, problemid):
+        """ Delete the value for the given problem id
+        """
+        if problemid < len(self.values):
+            self.values[problemid] = kind2fillvalue[self.kind or KIND_FLOAT]
+            self.isset[problemid] = False
+            self.isnone[problemid] = False
+
+    def items(self):
+        """ Return a list of (problem id, value) tuples for all stored values
+        """
+        return [(int(problemid), self.get(problemid)) for problemid in np.flatnonzero(self.isset)]
+
+    def append(self, column, offset):
+        """ Store the values of another column, whose problem ids are shifted by offset
+        """
+        self.promote(column.kind)
+        positions = np.flatnonzero(column.isset)
+        if len(positions) == 0:
+            return
+        self.ensureCapacity(offset + int(positions[-1]) + 1)
+        values = column.values[positions].astype(self.values.dtype)
+        isnone = column.isnone[positions]
+        if self.kind == KIND_OBJECT:
+            values[isnone] = None
+        self.values[positions + offset] = values
+        self.isset[positions + offset] = True
+        self.isnone[positions + offset] = isnone
+
+    def toArray(self, index):
+        """ Return an array of the values of the given problem ids; unset values become NaN
+        """
+        if len(index) > 0:
+            self.ensureCapacity(int(index[-1]) + 1)
+        values = self.values[index]
+        isvalid = self.isset[index] & ~self.isnone[index]
+        if not isvalid.all():
+            if self.kind == KIND_INT:
+                values = values.astype(np.float64)
+                values[~isvalid] = np.nan
+            elif self.kind == KIND_BOOL:
+                values = values.astype(object)
+                values[~isvalid] = np.nan
+        return values
+
+    def getValues(self, index):
+        """ Return the raw values of the given problem ids and the mask of the values that are neither unset nor None
+        """
+        if len(index) > 0:
+            self.ensureCapacity(int(index[-1]) + 1)
+        return self.values[index], self.isset[index] & ~self.isnone[index]
+
+    @staticmethod
+    def fromSeries(series):
+        """ Return a column that stores the values of a series, indexed by problem id
+        """
+        column = DataColumn()
+        if series.dtype == np.bool_:
+            column.kind = KIND_BOOL
+        elif series.dtype.kind in "iu":
+            column.kind = KIND_INT
+        elif series.dtype.kind == "f":
+            column.kind = KIND_FLOAT
+        else:
+            column.kind = KIND_OBJECT
+        positions = np.asarray(series.index, dtype = np.int64)
+        column.ensureCapacity(int(positions.max()) + 1 if len(positions) > 0 else 0)
+        column.values[positions] = series.to_numpy(dtype = kind2dtype[column.kind])
+        column.isset[positions] = True
+        return column
+
+    def hasValue(self, problemid):
+        return problemid < len(self.isset) and self.isset[problemid]
+
+class HistoryColumn:
+    """
+    a ragged column of (time, value) histories, e.g., the primal bound history of every problem
+
+    The times and values of all problems are stored in two contiguous float64 arrays. The history of a problem
+    is the slice [start, start + length) of these arrays, such that get() returns views instead of copies.
+    Histories that are stored again leave unused entries behind, which compact() removes.
+    """
+    INITIAL_CAPACITY = 64
+
+    def __init__(self):
+        self.times = np.empty(0, dtype = np.float64)
+        self.values = np.empty(0, dtype = np.float64)
+        self.size = 0
+        self.starts = np.zeros(0, dtype = np.int64)
+        # a negative length marks problems without history
+        self.lengths = np.full(0, -1, dtype = np.int64)
+
+    def __getstate__(self):
+        # do not pickle unused entries and unused capacity
+        self.compact()
+        return {"times" : self.times, "values" : self.values, "size" : self.size,
+                "starts" : self.starts, "lengths" : self.lengths}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # the per-problem arrays are modified when histories are stored or deleted, even if the points are memory-mapped
+        for attr in ("starts", "lengths"):
+            if not getattr(self, attr).flags.writeable:
+                setattr(self, attr, getattr(self, attr).copy())
+
+    def ensureCapacity(self, size, nproblems):
+        """ Grow the arrays of this column such that they can store size points of nproblems problems
+        """
+        if size > len(self.times):
+            newcapacity = max(size, 2 * len(self.times), HistoryColumn.INITIAL_CAPACITY)
+            for attr in ("times", "values"):
+                array = np.empty(newcapacity, dtype = np.float64)
+                array[:self.size] = getattr(self, attr)[:self.size]
+                setattr(self, attr, array)
+        if nproblems > len(self.lengths):
+            newcapacity = max(nproblems, 2 * len(self.lengths), DataColumn.INITIAL_CAPACITY)
+            starts = np.zeros(newcapacity, dtype = np.int64)
+            starts[:len(self.starts)] = self.starts
+            lengths = np.full(newcapacity, -1, dtype = np.int64)
+            lengths[:len(self.lengths)] = self.lengths
+            self.starts = starts
+            self.lengths = lengths
+
+    def set(self, problemid, history):
+        """ Store the history of a problem
+
+        Parameters
+        ----------
+        problemid
+            the id of the problem
+        history
+            a list of (time, value) tuples, or a tuple of a times array and a values array
+        """
+        if history is None:
+            self.unset(problemid)
+            return
+        if type(history) is tuple and len(history) == 2 and isinstance(history[0], np.ndarray):
+            times, values = history
+        else:
+            points = np.asarray(history, dtype = np.float64).reshape(-1, 2)
+            times, values = points[:, 0], points[:, 1]
+        length = len(times)
+        self.ensureCapacity(self.size + length, problemid + 1)
+        if length > 0:
+            self.times[self.size:self.size + length] = times
+            self.values[self.size:self.size + length] = values
+        self.starts[problemid] = self.size
+        self.lengths[problemid] = length
+        self.size += length
+
+    def get(self, problemid):
+        """ Return views of the times and values of the history of a problem, or None, if the problem has no history
+        """
+        if not self.hasValue(problemid):
+            return None
+        start = self.starts[problemid]
+        end = start + self.lengths[problemid]
+        return self.times[start:end], self.values[start:end]
+
+    def hasValue(self, problemid):
+        return problemid < len(self.lengths) and self.lengths[problemid] >= 0
+
+    def unset(self, problemid):
+        """ Delete the history of a problem
+        """
+        if problemid < len(self.lengths):
+            self.lengths[problemid] = -1
+
+    def getProblemIds(self):
+        """ Return the sorted array of problem ids with a history
+        """
+        return np.flatnonzero(self.lengths >= 0)
+
+    def items(self):
+        """ Return a list of (problem id, (times, values)) tuples for all stored histories
+        """
+        return [(int(problemid), self.get(problemid)) for problemid in self.getProblemIds()]
+
+    def compact(self):
+        """ Store the histories contiguously in the order of their problem ids and release unused entries
+        """
+        problemids = self.getProblemIds()
+        lengths = self.lengths[problemids]
+        starts = self.starts[problemids]
+        size = int(lengths.sum())
+        newstarts = np.zeros(len(problemids), dtype = np.int64)
+        np.cumsum(lengths[:-1], out = newstarts[1:])
+        if size < self.size or not np.array_equal(starts, newstarts):
+            # positions of all points in the old arrays, problem by problem
+            positions = np.repeat(starts - newstarts, lengths) + np.arange(size)
+            self.times = self.times[positions]
+            self.values = self.values[positions]
+        elif size < len(self.times):
+            self.times = self.times[:size].copy()
+            self.values = self.values[:size].copy()
+        # else, the arrays are already compact and kept, which avoids copying memory-mapped arrays
+        self.size = size
+        nproblems = int(problemids[-1]) + 1 if len(problemids) > 0 else 0
+        self.starts = np.zeros(nproblems, dtype = np.int64)
+        self.lengths = np.full(nproblems, -1, dtype = np.int64)
+        self.starts[problemids] = newstarts
+        self.lengths[problemids] = lengths
+
+    def getArrays(self, problemids):
+        """ Return the times, values, and offsets of the histories of the given problems
+
+        The history of the i-th problem is the slice [offsets[i], offsets[i + 1]) of times and values;
+        problems without history have an empty slice. For the sorted ids of all problems with a history,
+        the arrays are views of the column.
+        """
+        problemids = np.asarray(problemids, dtype = np.int64)
+        self.compact()
+        lengths = np.zeros(len(problemids), dtype = np.int64)
+        known = problemids < len(self.lengths)
+        lengths[known] = np.maximum(self.lengths[problemids[known]], 0)
+        offsets = np.zeros(len(problemids) + 1, dtype = np.int64)
+        np.cumsum(lengths, out = offsets[1:])
+        if np.array_equal(problemids, self.getProblemIds()):
+            return self.times, self.values, offsets
+        if offsets[-1] == 0:
+            return self.times[:0], self.values[:0], offsets
+        positions = np.repeat(self.starts[np.where(known, problemids, 0)] - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return self.times[positions], self.values[positions], offsets
+
+    def append(self, column, offset):
+        """ Store the histories of another column, whose problem ids are shifted by offset
+        """
+        for problemid, history in column.items():
+            self.set(problemid + offset, history)
+
+    def toSeries(self, index):
+        """ Return an object series of lists of (time, value) tuples for the given problem ids, the format of older test runs
+
+        Problems without history have a missing value
+        """
+        data = [None] * len(index)
+        for position, problemid in enumerate(index):
+            history = self.get(problemid)
+            if history is not None:
+                data[position] = list(zip(history[0].tolist(), history[1].tolist()))
+        return pd.Series(data, index = index, dtype = object)
+
+    @staticmethod
+    def fromSeries(series):
+        """ Return a column that stores the histories of a series of lists of (time, value) tuples
+        """
+        column = HistoryColumn()
+        for problemid, history in series.items():
+            if isinstance(history, (list, tuple)):
+                column.set(int(problemid), history)
+        return column
+
+class ColumnBuilder:
+    """
+    collects the data of a test run column by column
+
+    Every data key is stored in a typed DataColumn, such that the data frame of a test run
+    can be constructed without boxing every single value into a dictionary of dictionaries.
+    The bound histories are stored in HistoryColumns instead, which are not part of the data frame.
+    A problem id belongs to the collected data as soon as a value is stored for it under any key.
+    """
+    historykeys = [Key.PrimalBoundHistory, Key.DualBoundHistory]
+    """ data keys whose data are lists of (time, value) tuples """
+
+    def __init__(self):
+        self.columns = {}
+        self.rows = np.zeros(0, dtype = np.bool_)
+
+    def __getstate__(self):
+        length = self.getNumberOfRows()
+        return {"columns" : self.columns, "rows" : self.rows[:length].copy()}
+
+    def isEmpty(self):
+        """ Return True if no data key was stored yet
+        """
+        return len(self.columns) == 0
+
+    def keys(self):
+        """ Return the data keys in the order in which they were first stored
+        """
+        return self.columns.keys()
+
+    def hasKey(self, datakey):
+        return datakey in self.columns
+
+    def newColumn(self, datakey):
+        """ Add and return an empty column for a data key
+        """
+        column = self.columns[datakey] = HistoryColumn() if datakey in ColumnBuilder.historykeys else DataColumn()
+        return column
+
+    def getHistories(self):
+        """ Return a dictionary of the history columns of this builder
+        """
+        return {datakey : column for datakey, column in self.columns.items() if type(column) is HistoryColumn}
+
+    def getColumn(self, datakey):
+        """ Return the column of a data key, or None, if the data key was not stored yet
+        """
+        return self.columns.get(datakey)
+
+    def getNumberOfRows(self):
+        """ Return one more than the largest problem id with stored data
+        """
+        setpositions = np.flatnonzero(self.rows)
+        return int(setpositions[-1]) + 1 if len(setpositions) > 0 else 0
+
+    def getProblemIds(self):
+        """ Return the sorted array of problem ids with stored data
+        """
+        return np.flatnonzero(self.rows)
+
+    def markRows(self, positions):
+        """ Mark problem ids as collected
+        """
+        if len(positions) == 0:
+            return
+        capacity = int(np.max(positions)) + 1
+        if capacity > len(self.rows):
+            rows = np.zeros(max(capacity, 2 * len(self.rows), DataColumn.INITIAL_CAPACITY), dtype = np.bool_)
+            rows[:len(self.rows)] = self.rows
+            self.rows = rows
+        self.rows[positions] = True
+
+    def set(self, datakey, problemid, value):
+        """ Store a value for a data key and a problem id
+        """
+        column = self.columns.get(datakey)
+        if column is None:
+            column = self.newColumn(datakey)
+        column.set(problemid, value)
+        if problemid < len(self.rows):
+            self.rows[problemid] = True
+        else:
+            self.markRows([problemid])
+
+    def setValues(self, datakey, problemids, values):
+        """ Store the values of a data key for a list of distinct problem ids at once
+        """
+        column = self.columns.get(datakey)
+        if column is None:
+            column = self.newColumn(datakey)
+        if type(column) is HistoryColumn:
+            for problemid, value in zip(problemids, values):
+                column.set(problemid, value)
+        else:
+            column.setValues(problemids, values)
+        self.markRows(np.asarray(problemids, dtype = np.int64))
+
+    def getValues(self, datakey, problemids):
+        """ Return the raw values of a data key for a sorted array of problem ids and the mask of the stored values
+
+        The values of a data key that was not stored yet are NaN, and none of them is stored
+        """
+        column = self.columns.get(datakey)
+        if column is None or type(column) is HistoryColumn:
+            return np.full(len(problemids), np.nan), np.zeros(len(problemids), dtype = np.bool_)
+        return column.getValues(problemids)
+
+    def setRow(self, problemid, rowdata):
+        """ Store the values of a dictionary that maps data keys to values for a problem id
+        """
+        columns = self.columns
+        for datakey, value in rowdata.items():
+            column = columns.get(datakey)
+            if column is None:
+                column = self.newColumn(datakey)
+            column.set(problemid, value)
+        if len(rowdata) > 0:
+            self.markRows([problemid])
+
+    def get(self, datakey, problemid):
+        """ Return the value for a data key and a problem id, or None, if no value was stored
+        """
+        column = self.columns.get(datakey)
+        if column is None:
+            return None
+        return column.get(problemid)
+
+    def getRow(self, problemid):
+        """ Return a dictionary of the stored values of a problem id
+        """
+        return {datakey : column.get(problemid) for datakey, column in self.columns.items() if column.hasValue(problemid)}
+
+    def deleteRow(self, problemid):
+        """ Delete all values of a problem id
+        """
+        for column in self.columns.values():
+            column.unset(problemid)
+        if problemid < len(self.rows):
+            self.rows[problemid] = False
+
+    def append(self, builder, offset):
+        """ Store the data of another builder, whose problem ids are shifted by offset
+        """
+        for datakey, column in builder.columns.items():
+            if datakey not in self.columns:
+                self.newColumn(datakey)
+            self.columns[datakey].append(column, offset)
+        self.markRows(builder.getProblemIds() + offset)
+
+    def toDataFrame(self):
+        """ Return a data frame with one column per data key and one row per collected problem id
+
+        History columns are not part of the data frame, see getHistories()
+        """
+        index = self.getProblemIds()
+        columns = {datakey : column.toArray(index) for datakey, column in self.columns.items() if type(column) is DataColumn}
+        data = pd.DataFrame(columns, index = index, columns = list(columns.keys()))
+        # let pandas infer the dtypes of object columns, e.g., strings
+        return data.infer_objects()
+
+    @staticmethod
+    def fromDataFrame(data, histories = {}):
+        """ Return a builder that contains the data of a data frame whose index consists of problem ids
+
+        Parameters
+        ----------
+        data
+            data frame whose index consists of problem ids
+        histories
+            dictionary of history columns that are taken over by the builder, see getHistories()
+        """
+        builder = ColumnBuilder()
+        for datakey, column in histories.items():
+            builder.columns[datakey] = column
+            builder.markRows(column.getProblemIds())
+        for datakey in data.columns:
+            if datakey in ColumnBuilder.historykeys:
+                builder.columns[datakey] = HistoryColumn.fromSeries(data[datakey])
+            else:
+                builder.columns[datakey] = DataColumn.fromSeries(data[datakey])
+        builder.markRows(np.asarray(data.index, dtype = np.int64))
+        return builder
@@ -0,0 +1,313 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2016 Zuse Institute Berlin, www.zib.de
+
+Permissions are granted as stated in the license file you have obtained
+with this software. If you find the library useful for your purpose,
+please refer to README.md for how to cite IPET.
+
+@author: Gregor Hendel
+
+columnar file format for the data of test runs
+
+A column store is a single file that consists of
+
+    - the magic bytes MAGIC,
+    - the length of the header as little-endian unsigned 64 bit integer,
+    - a JSON header that describes every block of the file,
+    - the blocks, each aligned to BLOCK_ALIGNMENT bytes relative to the end of the header.
+
+Every column of the data frame, the index, and every bound history is stored in its own blocks, such that
+a reader only touches the bytes of the columns it actually requests. Numeric blocks are raw little-endian arrays,
+which a reader of an uncompressed file can expose as read-only numpy.memmap views instead of reading them. Processes
+that open the same file share its pages through the page cache of the operating system.
+"""
+from ipet.ColumnBuilder import HistoryColumn
+from ipet.misc import misc
+import json
+import os
+import pickle
+import struct
+import numpy as np
+import pandas as pd
+
+MAGIC = b"IPETCOL\x00"
+FORMAT_VERSION = 1
+BLOCK_ALIGNMENT = 8
+
+KIND_NUMERIC = "numeric"
+KIND_CATEGORY = "category"
+KIND_STRING = "string"
+KIND_PICKLE = "pickle"
+
+def isColumnStore(filename):
+    """ Return True if the (possibly compressed) file is a column store, and False, e.g., for pickled test runs
+    """
+    try:
+        with misc.openFile(filename, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except (OSError, EOFError):
+        return False
+
+class ColumnStoreWriter:
+    """
+    collects the blocks of a column store in memory and writes them into a file
+    """
+
+    def __init__(self):
+        self.blocks = []
+        self.size = 0
+        self.header = {"version" : FORMAT_VERSION, "columns" : {}, "columnorder" : [], "histories" : {}}
+
+    def addBlock(self, data):
+        """ Add a block of bytes and return its description
+        """
+        padding = -self.size % BLOCK_ALIGNMENT
+        if padding:
+            self.blocks.append(b"\x00" * padding)
+            self.size += padding
+        self.blocks.append(data)
+        block = {"offset" : self.size, "nbytes" : len(data)}
+        self.size += len(data)
+        return block
+
+    def addArray(self, array):
+        """ Add a one-dimensional numeric array as a raw little-endian block and return its description
+        """
+        array = np.ascontiguousarray(array)
+        dtype = array.dtype.newbyteorder("<") if array.dtype.byteorder == ">" else array.dtype
+        block = self.addBlock(array.astype(dtype, copy = False).tobytes())
+        block["dtype"] = dtype.str
+        block["length"] = len(array)
+        return block
+
+    def addPickle(self, obj):
+        return self.addBlock(pickle.dumps(obj, protocol = pickle.HIGHEST_PROTOCOL))
+
+    def addColumn(self, datakey, column):
+        """ Add a column of a data frame
+        """
+        dtype = column.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            categories = column.cat.categories
+            description = {"kind" : KIND_CATEGORY, "codes" : self.addArray(column.cat.codes.to_numpy())}
+            if pd.api.types.is_string_dtype(categories.dtype) and all(type(c) is str for c in categories):
+                description["categories"] = list(categories)
+            else:
+                description["categoryblock"] = self.addPickle(categories)
+        elif pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_float_dtype(dtype):
+            if isinstance(dtype, np.dtype):
+                description = {"kind" : KIND_NUMERIC, "values" : self.addArray(column.to_numpy())}
+            else:
+                # nullable extension arrays keep their dtype through pickling
+                description = {"kind" : KIND_PICKLE, "values" : self.addPickle(column.array)}
+        elif pd.api.types.is_string_dtype(dtype) and column.map(lambda x : x is None or type(x) is str or x != x).all():
+            values = [None if x is None or x != x else x for x in column]
+            description = {"kind" : KIND_STRING, "dtype" : str(dtype),
+                           "values" : self.addBlock(json.dumps(values).encode("utf-8"))}
+        else:
+            description = {"kind" : KIND_PICKLE, "values" : self.addPickle(column.array)}
+        self.header["columns"][datakey] = description
+        self.header["columnorder"].append(datakey)
+
+    def addHistory(self, datakey, historycolumn):
+        """ Add a history column, see ipet.ColumnBuilder.HistoryColumn
+        """
+        historycolumn.compact()
+        self.header["histories"][datakey] = {attr : self.addArray(getattr(historycolumn, attr))
+                                             for attr in ("times", "values", "starts", "lengths")}
+
+    def write(self, filename, compresslevel = None):
+        """ Write the column store into a file, which is compressed if its name has a compression extension
+        """
+        header = json.dumps(self.header, separators = (",", ":")).encode("utf-8")
+        # pad the header with whitespace such that the blocks are aligned in the file, too
+        header += b" " * (-(len(MAGIC) + 8 + len(header)) % BLOCK_ALIGNMENT)
+
+        # write to a temporary file first, such that memory maps of an older version of the file remain valid
+        tmpfilename = misc.getTemporaryFileName(filename)
+        try:
+            with misc.openFile(tmpfilename, "wb", compresslevel) as f:
+                f.write(MAGIC)
+                f.write(struct.pack("<Q", len(header)))
+                f.write(header)
+                for block in self.blocks:
+                    f.write(block)
+            os.replace(tmpfilename, filename)
+        finally:
+            if os.path.exists(tmpfilename):
+                os.remove(tmpfilename)
+
+def writeColumnStore(filename, data, histories = {}, state = {}, compresslevel = None):
+    """ Write the data of a test run into a column store
+
+    Parameters
+    ----------
+    filename
+        name of the file that is written
+    data
+        data frame of the test run, whose index consists of problem ids
+    histories
+        dictionary of history columns of the test run
+    state
+        dictionary of the remaining attributes of the test run, which is pickled as a single block
+    compresslevel
+        the compression level if filename has a compression extension, see ipet.misc.openFile()
+    """
+    writer = ColumnStoreWriter()
+    writer.header["index"] = writer.addArray(np.asarray(data.index, dtype = np.int64))
+    for datakey in data.columns:
+        writer.addColumn(datakey, data[datakey])
+    for datakey, historycolumn in histories.items():
+        writer.addHistory(datakey, historycolumn)
+    writer.header["state"] = writer.addPickle(state)
+    writer.write(filename, compresslevel)
+
+class ColumnStoreReader:
+    """
+    reads single columns of a column store
+
+    Only the header is read on construction, every column is read when it is requested. The block offsets of the
+    header are only valid for the file that was opened, such that reading from a column store that was
+    replaced or modified in the meantime raises an IOError.
+    """
+
+    def __init__(self, filename, memorymap = False):
+        """
+        constructs a reader of a column store
+
+        Parameters
+        ----------
+        filename : name of the column store
+        memorymap : should numeric columns and bound histories be memory-mapped instead of read?
+                    Compressed files are always read
+        """
+        self.filename = filename
+        self.memorymap = memorymap and not misc.isCompressed(filename)
+        self.mapped = None
+        with misc.openFile(filename, "rb") as f:
+            self.signature = self.getSignature(f)
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError("%s is not a column store" % filename)
+            headerlength, = struct.unpack("<Q", f.read(8))
+            self.header = json.loads(f.read(headerlength).decode("utf-8"))
+        if self.header["version"] > FORMAT_VERSION:
+            raise ValueError("Column store %s has version %d, can only read up to version %d" %
+                             (filename, self.header["version"], FORMAT_VERSION))
+        self.datastart = len(MAGIC) + 8 + headerlength
+
+    def getSignature(self, f):
+        """ Return the device, inode, size, and modification time of an open file
+        """
+        stat = os.fstat(f.fileno())
+        return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def checkSignature(self, f):
+        """ Raise an IOError if the open file is not the file whose header was read on construction
+        """
+        if self.getSignature(f) != self.signature:
+            raise IOError("Column store %s has changed since it was opened, load it again" % self.filename)
+
+    def getColumnKeys(self):
+        """ Return the data keys of the columns in their original order
+        """
+        return list(self.header["columnorder"])
+
+    def getHistoryKeys(self):
+        return list(self.header["histories"].keys())
+
+    def readBlocks(self, blocks):
+        """ Return the bytes of a list of block descriptions, reading the file only once
+        """
+        result = [None] * len(blocks)
+        with misc.openFile(self.filename, "rb") as f:
+            self.checkSignature(f)
+            # seeking backwards in a compressed file decompresses it again from its beginning
+            for position in sorted(range(len(blocks)), key = lambda i : blocks[i]["offset"]):
+                f.seek(self.datastart + blocks[position]["offset"])
+                result[position] = f.read(blocks[position]["nbytes"])
+        return result
+
+    def toArray(self, block, data):
+        return np.frombuffer(data, dtype = np.dtype(block["dtype"]), count = block["length"])
+
+    def mapArray(self, block):
+        """ Return a read-only, memory-mapped view of a numeric block
+        """
+        if self.mapped is None:
+            # the mapping keeps the mapped file valid even if it is replaced later
+            with open(self.filename, "rb") as f:
+                self.checkSignature(f)
+                self.mapped = np.memmap(f, dtype = np.uint8, mode = "r")
+        start = self.datastart + block["offset"]
+        return self.mapped[start:start + block["nbytes"]].view(dtype = np.dtype(block["dtype"]), type = np.ndarray)
+
+    def readIndex(self):
+        block = self.header["index"]
+        return self.toArray(block, self.readBlocks([block])[0])
+
+    def readState(self):
+        return pickle.loads(self.readBlocks([self.header["state"]])[0])
+
+    def readColumns(self, datakeys, index = None):
+        """ Return a data frame of the requested columns in the order of the store
+
+        Parameters
+        ----------
+        datakeys
+            the data keys of the requested columns, data keys that are not stored are ignored
+        index
+            the index of the data frame, which is read from the store if not given
+        """
+        datakeys = set(datakeys)
+        datakeys = [datakey for datakey in self.header["columnorder"] if datakey in datakeys]
+        descriptions = [self.header["columns"][datakey] for datakey in datakeys]
+
+        # read the blocks of all requested columns in a single pass over the file
+        blocks = [] if index is not None else [self.header["index"]]
+        for description in descriptions:
+            if self.memorymap and description["kind"] == KIND_NUMERIC:
+                continue
+            for name in ("values", "codes", "categoryblock"):
+                if name in description:
+                    blocks.append(description[name])
+        data = iter(self.readBlocks(blocks))
+        if index is None:
+            index = self.toArray(self.header["index"], next(data))
+
+        columns = {}
+        for datakey, description in zip(datakeys, descriptions):
+            kind = description["kind"]
+            if kind == KIND_NUMERIC and self.memorymap:
+                values = self.mapArray(description["values"])
+            elif kind == KIND_NUMERIC:
+                values = self.toArray(description["values"], next(data)).copy()
+            elif kind == KIND_CATEGORY:
+                codes = self.toArray(description["codes"], next(data))
+                if "categories" in description:
+                    categories = description["categories"]
+                else:
+                    categories = pickle.loads(next(data))
+                values = pd.Categorical.from_codes(codes, categories = categories)
+            elif kind == KIND_STRING:
+                values = pd.array(json.loads(next(data).decode("utf-8")), dtype = description["dtype"])
+            else:
+                values = pickle.loads(next(data))
+            columns[datakey] = values
+        return pd.DataFrame(columns, index = pd.Index(index), columns = datakeys, copy = False)
+
+    def readHistory(self, datakey):
+        """ Return the history column of a data key
+        """
+        description = self.header["histories"][datakey]
+        # the per-problem arrays are always read, because they are modified when histories are stored or deleted
+        attrs = ("starts", "lengths") if self.memorymap else ("times", "values", "starts", "lengths")
+        column = HistoryColumn()
+        for attr, data in zip(attrs, self.readBlocks([description[attr] for attr in attrs])):
+            setattr(column, attr, self.toArray(description[attr], data).copy())
+        if self.memorymap:
+            column.times = self.mapArray(description["times"])
+            column.values = self.mapArray(description["values"])
+        column.size = len(column.times)
+        return column
@@ -9,19 +9,37 @@ please refer to README.md for how to cite IPET.
 
 @author: Gregor Hendel
 """
-from ipet import misc, Key
+from ipet import misc, Key, Schema, ExperimentSnapshot, Validation
 from .TestRun import TestRun
 from ipet.concepts.Manager import Manager
-from ipet.misc.integrals import calcIntegralValue, getProcessPlotData
-from ipet.parsing import ErrorFileReader, BestSolInfeasibleReader, ObjlimitReader, ObjsenseReader
+from ipet.misc.integrals import calcIntegralValues, getProcessPlotArrays, getIntegralSweep, DEFAULT_CUTOFFGAP, \
+    DEFAULT_XLIMITKEY
+from ipet.parsing import ErrorFileReader, BestSolInfeasibleReader, ObjlimitReader, ObjsenseReader, SoluFileReader
 from ipet.parsing.ReaderManager import ReaderManager
-from pandas import Panel
 
 import pandas as pd
+import numpy as np
 import pickle
 import os
 import sys
 import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+def collectTestRunData(readermanagerdump, testrun):
+    """ Collect the data of a single test run in a worker process
+
+    Parameters
+    ----------
+    readermanagerdump
+        pickled reader manager, see ReaderManager.dumpWithoutTestRun()
+    testrun
+        the worker's copy of the test run to collect data for
+    """
+    readermanager = pickle.loads(readermanagerdump)
+    readermanager.setTestRun(testrun)
+    testrun.setupForDataCollection()
+    readermanager.collectData()
+    return testrun
 
 class Experiment:
     """
@@ -37,9 +55,12 @@ class Experiment:
         self.readermanager = ReaderManager()
         self.readermanager.registerDefaultReaders()
         self.solufiles = []
+        self.soludata = None
+        self.soludatastamp = None
         self.externaldata = None
         self.basename2testrun = {}
         self.probnamelist = []
+        self.pendingtestruns = []
 
         for filename in files:
             self.addOutputFile(filename)
@@ -66,19 +87,21 @@ class Experiment:
         TestRun files or raw solver output files or .solu files with additional information.
 
         If a file with an unrecognized file extension is passed to this method, a ValueError is raised.
+        Files compressed with gzip, bzip2, or xz, e.g., 'check.out.gz', are decompressed while they are read.
 
         For a list of allowed file extensions, see ipet.parsing.ReaderManager.
         """
 
-        filebasename = os.path.splitext(os.path.basename(filename))[0]
-        fileextension = os.path.splitext(filename)[-1]
+        filebasename, fileextension = misc.splitFilename(os.path.basename(filename))
 
         if not fileextension in [TestRun.FILE_EXTENSION] + self.readermanager.getFileExtensions():
             raise ValueError("Experiment cannot handle extension '%s' of file '%s'" % (fileextension, filename))
 
         if fileextension == TestRun.FILE_EXTENSION:
             try:
-                testrun = TestRun.loadFromFile(filename)
+                # columns are loaded on demand, e.g., only those that an evaluation requires,
+                # and numeric columns are memory-mapped instead of copied into memory
+                testrun = TestRun.loadFromFile(filename, datakeys = [], memorymap = True)
             except IOError as e:
                 sys.stderr.write(" Loading testrun from file %s caused an exception\n%s\n" % (filename, e))
                 return
@@ -111,6 +134,7 @@ class Experiment:
     def removeTestrun(self, testrun):
         """ Remove a testrun object from the experiment
         """
+        self.loadPendingTestRuns()
         self.testrunmanager.deleteManageable(testrun)
 
     def addReader(self, reader):
@@ -131,8 +155,22 @@ class Experiment:
     def getTestRuns(self):
         """ Returns all TestRuns
         """
+        self.loadPendingTestRuns()
         return self.testrunmanager.getManageables()
 
+    def loadPendingTestRuns(self):
+        """ Load the test runs of a snapshot that have not been accessed yet, see ipet.ExperimentSnapshot
+        """
+        # experiments that were pickled by older versions have no pending test runs
+        pendingtestruns = getattr(self, "pendingtestruns", [])
+        self.pendingtestruns = []
+        for entry in pendingtestruns:
+            testrun = TestRun.loadFromFile(entry["file"], datakeys = [], memorymap = True)
+            if entry["active"]:
+                self.testrunmanager.addAndActivate(testrun)
+            else:
+                self.testrunmanager.addManageable(testrun)
+
     def getReaderManager(self):
         """ Return the Readermanager
         """
@@ -171,40 +209,147 @@ class Experiment:
         this will return the testrun manager object of this experiment
         """
         lowerclass = managedclass.lower()
+        if lowerclass == 'testrun':
+            self.loadPendingTestRuns()
         if hasattr(self, lowerclass + 'manager'):
             return getattr(self, lowerclass + 'manager')
 
     def getManagers(self):
         """ Return a dictionary of all managers of this experiment object
         """
+        self.loadPendingTestRuns()
         managernames = [name for name in dir(self) if name.endswith('manager')]
         return {name:getattr(self, name) for name in managernames}
 
-    def addExternalDataFile(self, filename):
+    @staticmethod
+    def readExternalDataFile(filename):
+        """ Return the table of an external data file indexed by problem name
+
+        The problem names are taken from the column 'ProblemName', or from the first column if there is no such column.
+        If a problem name occurs repeatedly, its last row is valid
+        """
+        data = pd.read_table(filename, sep = r"\s+", engine = "python", header = 1)
+        data = data.drop_duplicates(Key.ProblemName if Key.ProblemName in data.columns else data.columns[0], keep = "last")
+        data = data.set_index(Key.ProblemName if Key.ProblemName in data.columns else data.columns[0])
+        data.index.name = Key.ProblemName
+        return data
+
+    def readTable(self, filename, kind, parser, cache = None):
+        """ Return the table that parser reads from a file shared by all test runs, e.g., a solu file
+
+        If a ParseCache is given, the table is cached under the content hash of the file
+        """
+        key = cache.getTableKey(filename, kind) if cache is not None else None
+        table = cache.loadTable(key) if key is not None else None
+        if table is None:
+            table = parser(filename)
+            if key is not None:
+                cache.storeTable(key, table)
+        return table
+
+    def addExternalDataFile(self, filename, cache = None):
         """ Add a filename pointing to an external file, eg a solu file with additional information
+
+        The table of the file is indexed by problem name, see readExternalDataFile(), and joined onto the data of
+        every test run by problem name, see getJoinedData()
         """
         try:
-            self.externaldata = pd.read_table(filename, sep = " *", engine = 'python', header = 1, skipinitialspace = True)
+            self.externaldata = self.readTable(filename, "external", Experiment.readExternalDataFile, cache)
             self.updateDatakeys()
             logging.debug("Experiment read external data file %s" % filename)
             logging.debug("%s" % self.externaldata.head(5))
         except:
             raise ValueError("Error reading file name %s" % filename)
 
-    def collectData(self):
+    def collectData(self, workers = 1, cache = None):
         """ Iterate over log files and solu file and collect data via installed readers
-        """
-        # add solu file to testrun if it's not yet done
+
+        Parameters
+        ----------
+        workers
+            number of processes to parse test runs in parallel. If there are at least as many test runs
+            as workers, every test run is parsed by a separate copy of the reader manager, and the results
+            are merged before gaps, integrals and problem statuses are calculated. Otherwise,
+            the test runs are parsed one after the other, and the workers split the log files
+            at problem boundaries. Test runs that read from standard input are always parsed
+            in this process. Default: 1 (serial parsing)
+        cache
+            a ParseCache for test runs whose files and readers did not change since they were parsed, or None
+            to parse all test runs
+        """
+        # solu files are not read per test run, but joined onto all test runs at the end, see addSoluData()
         testruns = self.getTestRuns()
-        for testrun in testruns:
-            for solufilename in self.solufiles:
-                testrun.appendFilename(solufilename)
 
+        testrun2cachekey = {}
+        testrunstoparse = testruns
+        if cache is not None:
+            readerfingerprint = cache.getReaderFingerprint(self.readermanager)
+            testrunstoparse = []
+            for testrun in testruns:
+                testrun2cachekey[testrun] = cache.getKey(testrun, readerfingerprint)
+                cachedtestrun = cache.load(testrun2cachekey[testrun], testrun.filenames)
+                if cachedtestrun is not None:
+                    testrun.setupForDataCollection()
+                    testrun.mergeCollectedData(cachedtestrun)
+                else:
+                    testrunstoparse.append(testrun)
+
+        if workers > 1 and len(testrunstoparse) >= workers:
+            self.collectDataParallel(testrunstoparse, workers)
+        else:
+            for testrun in testrunstoparse:
+                self.readermanager.setTestRun(testrun)
+                testrun.setupForDataCollection()
+                self.readermanager.collectData(workers)
+
+        if cache is not None:
+            for testrun in testrunstoparse:
+                cache.store(testrun2cachekey[testrun], testrun)
+            logging.debug(cache.getStatistics())
+
+        self.finishDataCollection(cache)
+
+    def getSoluData(self, cache = None):
+        """ Return the data of all solu files as a data frame indexed by problem name, or None if there are no solu files
+
+        Every solu file is parsed only once per experiment, and again only after it changed. With a ParseCache,
+        solu files are not even parsed again by other experiments. If a problem name occurs repeatedly, its last
+        occurrence in the last solu file is valid
+        """
+        if len(self.solufiles) == 0:
+            return None
+        stamp = []
+        for solufilename in self.solufiles:
+            stat = os.stat(solufilename)
+            stamp.append((os.path.abspath(solufilename), stat.st_size, stat.st_mtime_ns))
+
+        # experiments that were pickled by older versions have no solu data yet
+        if getattr(self, "soludatastamp", None) != stamp:
+            soludata = pd.concat([self.readTable(solufilename, "solu", SoluFileReader.readSoluFile, cache)
+                                  for solufilename in self.solufiles])
+            soludata = soludata.drop_duplicates(Key.ProblemName, keep = "last").set_index(Key.ProblemName)
+            self.soludata = soludata
+            self.soludatastamp = stamp
+        return self.soludata
+
+    def addSoluData(self, testruns, cache = None):
+        """ Join the data of the solu files onto the collected problems of the test runs by problem name
+        """
+        soludata = self.getSoluData(cache)
+        if soludata is None:
+            return
         for testrun in testruns:
-            self.readermanager.setTestRun(testrun)
-            testrun.setupForDataCollection()
-            self.readermanager.collectData()
+            matched = soludata[soludata.index.isin(list(testrun.getProblemNameIndex().keys()))]
+            if len(matched) == 0:
+                continue
+            testrun.addDataByNames(SoluFileReader.datakeys, matched.index.tolist(),
+                                   [matched[Key.OptimalValue].astype(float).tolist(), matched[Key.SolutionFileStatus].tolist()])
 
+    def finishDataCollection(self, cache = None):
+        """ Join the solu file data, calculate gaps, integrals, and problem statuses of the collected data and set up the test run data frames
+        """
+        testruns = self.getTestRuns()
+        self.addSoluData(testruns, cache)
         # TODO Is this calculated only for validation?
         self.makeProbNameList()
         self.calculateGaps()
@@ -221,6 +366,64 @@ class Experiment:
         # post processing steps: things like primal integrals depend on several, independent data
         self.updateDatakeys()
 
+    def startFollowing(self):
+        """ Start following the log files of all test runs while they are still being written
+
+        Every test run is parsed by its own copy of the reader manager, which keeps the parser state between
+        calls of followData(). Test runs that read from standard input cannot be followed.
+        """
+        testruns = self.getTestRuns()
+        for testrun in testruns:
+            if "" in testrun.filenames:
+                raise ValueError("Cannot follow test run %s that reads from standard input" % testrun.getName())
+
+        self.testrun2readermanager = {}
+        readermanagerdump = self.readermanager.dumpWithoutTestRun()
+        for testrun in testruns:
+            readermanager = pickle.loads(readermanagerdump)
+            readermanager.setTestRun(testrun)
+            testrun.setupForDataCollection()
+            readermanager.startFollowing()
+            self.testrun2readermanager[testrun] = readermanager
+
+    def followData(self):
+        """ Parse the data that was appended to the followed log files since the last call
+
+        Returns
+        -------
+        list
+            a list of (testrun, problemids) tuples of the problems that were finished during this call
+        """
+        return [(testrun, readermanager.followLogFile()) for testrun, readermanager in self.testrun2readermanager.items()]
+
+    def stopFollowing(self):
+        """ Stop following the log files, parse the remaining data, and finish the data collection
+        """
+        for readermanager in self.testrun2readermanager.values():
+            readermanager.stopFollowing()
+        self.testrun2readermanager = {}
+
+        self.finishDataCollection()
+
+    def collectDataParallel(self, testruns, workers):
+        """ Parse the given test runs in a pool of worker processes and merge the results
+        """
+        stdintestruns = [tr for tr in testruns if "" in tr.filenames]
+        filetestruns = [tr for tr in testruns if "" not in tr.filenames]
+
+        logging.debug("Collecting data of %d test runs with %d worker processes" % (len(filetestruns), workers))
+        readermanagerdump = self.readermanager.dumpWithoutTestRun()
+        with ProcessPoolExecutor(max_workers = workers) as executor:
+            futures = [executor.submit(collectTestRunData, readermanagerdump, tr) for tr in filetestruns]
+            # merge in submission order to obtain the same result as serial parsing
+            for testrun, future in zip(filetestruns, futures):
+                testrun.mergeCollectedData(future.result())
+
+        for testrun in stdintestruns:
+            self.readermanager.setTestRun(testrun)
+            testrun.setupForDataCollection()
+            self.readermanager.collectData()
+
     def getDatakeys(self):
         return self.datakeymanager.getAllRepresentations()
 
@@ -229,65 +432,211 @@ class Experiment:
         """
         self.data = pd.concat([tr.data for tr in self.getTestRuns()])
 
+    def getProblemColumns(self, testruns, datakeys):
+        """ Return the problem ids of every test run and the columns of the data keys over all test runs
+
+        Returns
+        -------
+        tuple
+            a list of problem id arrays, one per test run, and a dictionary that maps every data key to a pair of
+            arrays of the concatenated values and the mask of the problems that have a value,
+            see ipet.TestRun.getColumnValues()
+        """
+        problemids = [np.arange(testrun.currentproblemid) for testrun in testruns]
+        columns = {}
+        for datakey in datakeys:
+            parts = [testrun.getColumnValues(datakey, ids) for testrun, ids in zip(testruns, problemids)]
+            if len(parts) == 0:
+                columns[datakey] = (np.empty(0), np.zeros(0, dtype = np.bool_))
+            else:
+                columns[datakey] = (np.concatenate([values for values, _ in parts]), np.concatenate([isvalid for _, isvalid in parts]))
+        return problemids, columns
+
+    def getProblemHistories(self, testruns, problemids, datakey):
+        """ Return the concatenated histories of a data key of the problems of all test runs
+
+        Returns
+        -------
+        tuple
+            arrays times, values, and offsets, where the history of the i-th problem over all test runs is
+            the slice [offsets[i], offsets[i + 1]) of times and values, see ipet.TestRun.getHistoryArrays()
+        """
+        parts = [testrun.getHistoryArrays(datakey, ids) for testrun, ids in zip(testruns, problemids)]
+        offsets = [np.zeros(1, dtype = np.int64)]
+        size = 0
+        for _, _, partoffsets in parts:
+            offsets.append(partoffsets[1:] + size)
+            size += partoffsets[-1]
+        return (np.concatenate([np.empty(0)] + [times for times, _, _ in parts]),
+                np.concatenate([np.empty(0)] + [values for _, values, _ in parts]),
+                np.concatenate(offsets))
+
+    def storeProblemData(self, testruns, problemids, datakey, data, mask = None):
+        """ Store the data of a data key that was calculated for the concatenated problems of all test runs
+
+        Parameters
+        ----------
+        testruns
+            list of test runs
+        problemids
+            list of problem id arrays, one per test run, see getProblemColumns()
+        datakey
+            the data key under which the data is stored
+        data
+            array with one entry per problem of all test runs
+        mask
+            boolean array of the problems whose data is stored, or None to store the data of all problems
+        """
+        offset = 0
+        for testrun, ids in zip(testruns, problemids):
+            part = slice(offset, offset + len(ids))
+            offset += len(ids)
+            if mask is not None:
+                testrun.addDataColumn(datakey, ids[mask[part]], data[part][mask[part]])
+            else:
+                testrun.addDataColumn(datakey, ids, data[part])
+
     def calculateGaps(self):
         """ Calculate and store primal and dual gap
+
+        The gaps of all problems of all test runs are calculated at once, see ipet.Validation.getGaps()
         """
-        for testrun in self.getTestRuns():
-            for problemid in testrun.getProblemIds():
-            
-                optval = testrun.getProblemDataById(problemid, Key.OptimalValue)
-                if optval is not None:
-                    for key in [Key.PrimalBound, Key.DualBound]:
-                        val = testrun.getProblemDataById(problemid, key)
-                        if val is not None:
-                            gap = misc.getGap(val, optval, True)
-                            # subtract 'Bound' and add 'Gap' from Key
-                            thename = key[:-5] + "Gap"
-                            testrun.addDataById(thename, gap, problemid)
-
-    def getJoinedData(self):
+        testruns = self.getTestRuns()
+        problemids, columns = self.getProblemColumns(testruns, [Key.OptimalValue, Key.PrimalBound, Key.DualBound])
+        optval = Validation.toFloat(columns[Key.OptimalValue])
+        hasoptval = columns[Key.OptimalValue][1]
+        for key in [Key.PrimalBound, Key.DualBound]:
+            hasvalue = columns[key][1]
+            gaps = Validation.getGaps(Validation.toFloat(columns[key]), hasvalue, optval, hasoptval, True)
+            # subtract 'Bound' and add 'Gap' from Key
+            self.storeProblemData(testruns, problemids, key[:-5] + "Gap", gaps, hasoptval & hasvalue)
+
+    def getJoinedData(self, datakeys = None, rowfilter = None):
         """ Concatenate the testrun data (possibly joined with external data)
         
         this may result in nonunique index, the data is simply concatenated
+
+        Parameters
+        ----------
+        datakeys
+            collection of the data keys that the joined data should contain, or None for all data keys.
+            Other columns are neither loaded from test run files nor concatenated
+        rowfilter
+            function that maps the data of a test run to a boolean series of the rows to keep, or None to keep all rows
         """
+        if datakeys is not None:
+            datakeys = set(datakeys)
         datalist = []
         for tr in self.getTestRuns():
-            trdata = tr.data
             if self.externaldata is not None:
-                # Suggestion:
-                # trdata = trdata.join(self.externaldata, on=Key.ProblemName, suffixes = ("", "_ext"))
-                trdata = trdata.merge(self.externaldata, left_index = True, right_index = True, how = "left", suffixes = ("", "_ext"))
+                # the external data is joined by problem name
+                trdata = tr.getData(None if datakeys is None else list(datakeys.union([Key.ProblemName])))
+                if Key.ProblemName in trdata.columns:
+                    trdata = trdata.join(self.externaldata, on = Key.ProblemName, rsuffix = "_ext")
+            else:
+                trdata = tr.getData(None if datakeys is None else list(datakeys))
+            if rowfilter is not None:
+                trdata = trdata[rowfilter(trdata)]
+            if datakeys is not None:
+                trdata = trdata.loc[:, [datakey for datakey in trdata.columns if datakey in datakeys]]
             datalist.append(trdata)
 
-        return pd.concat(datalist)
+        # categorical columns of different test runs have different categories and are concatenated as objects
+        return Schema.applySchema(pd.concat(datalist))
 
     def calculateIntegrals(self):
         """ Calculate and store primal and dual integral values
 
-        ... for every problem under 'PrimalIntegral' and 'DualIntegral'
+        ... for every problem under 'PrimalIntegral' and 'DualIntegral'. The integrals of all problems of all test runs
+        are calculated at once from their concatenated histories, see ipet.misc.integrals.getProcessPlotArrays()
         """
-        dualargs = dict(historytouse = Key.DualBoundHistory, boundkey = Key.DualBound)
-        for testrun in self.getTestRuns():
+        testruns = self.getTestRuns()
+        problemids, columns = self.getProblemColumns(testruns, [Key.SolvingTime, Key.TimeLimit, Key.OptimalValue])
+        solvingtime = Validation.toFloat(columns[Key.SolvingTime])
+        hassolvingtime = columns[Key.SolvingTime][1]
+        optval = Validation.toFloat(columns[Key.OptimalValue])
+        hasoptval = columns[Key.OptimalValue][1]
+        # the integrals are only defined for problems with a solving time or a time limit
+        isdefined = hassolvingtime | columns[Key.TimeLimit][1]
+
+        for historykey, integralkey, pwlinear in [(Key.PrimalBoundHistory, Key.PrimalIntegral, False),
+                                                  (Key.DualBoundHistory, Key.DualIntegral, True)]:
+            times, values, offsets = self.getProblemHistories(testruns, problemids, historykey)
+            x, y, plotoffsets = getProcessPlotArrays(times, values, offsets, solvingtime, hassolvingtime, optval, hasoptval)
+            self.storeProblemData(testruns, problemids, integralkey, calcIntegralValues(x, y, plotoffsets, pwlinear), isdefined)
 
-            # go through problems and calculate both primal and dual integrals
-            for problemid in testrun.getProblemIds():
-                processplotdata = getProcessPlotData(testrun, problemid)
-
-                # check for well defined data (may not exist sometimes)
-                if processplotdata:
-                    try:
-                        testrun.addDataById(Key.PrimalIntegral, calcIntegralValue(processplotdata), problemid)
-                        logging.debug("Computed primal integral %.1f for problem %s, data %s" % (testrun.getProblemDataById(problemid, 'PrimalIntegral'), problemid, repr(processplotdata)))
-                    except AssertionError as e:
-                        logging.error("Error for primal bound on problem %s, list: %s" % (problemid, processplotdata))
-
-                processplotdata = getProcessPlotData(testrun, problemid, **dualargs)
-                # check for well defined data (may not exist sometimes)
-                if processplotdata:
-                    try:
-                        testrun.addDataById(Key.DualIntegral, calcIntegralValue(processplotdata, pwlinear = True), problemid)
-                    except AssertionError as e:
-                        logging.error("Error for dual bound on problem %s, list: %s " % (problemid, processplotdata))
+    @staticmethod
+    def getIntegralSweepKey(integralkey, normalize, cutoffgap, xlimitkey):
+        """ Return the data key of an integral variant, e.g., 'PrimalIntegral_Gap100_TimeLimit' or 'PrimalIntegral_Raw'
+        """
+        parts = [integralkey, "Gap%g" % cutoffgap if normalize else "Raw"]
+        if xlimitkey is not None:
+            parts.append(xlimitkey)
+        return "_".join(parts)
+
+    def calculateIntegralSweep(self, cutoffgaps = [DEFAULT_CUTOFFGAP], xlimitkeys = [None], normalizations = [True, False],
+                               historykey = Key.PrimalBoundHistory, store = False):
+        """ Calculate a grid of integral variants of every problem from a single pass over the histories
+
+        Parameters
+        ----------
+        cutoffgaps
+            list of cutoff gaps of the normalized variants
+        xlimitkeys
+            list of data keys of time horizons, e.g., Key.TimeLimit, up to which the integrals are calculated.
+            None integrates up to the solving time like calculateIntegrals()
+        normalizations
+            list of True for integrals of the gaps to the optimal objective value and False for integrals of the raw bounds
+        historykey
+            either Key.PrimalBoundHistory for step-wise primal integrals or Key.DualBoundHistory for piece-wise linear
+            dual integrals
+        store
+            should every variant also be stored as a data column, see getIntegralSweepKey()?
+
+        Returns
+        -------
+        DataFrame
+            tidy table with one row per problem and variant with the columns 'TestRun', 'ProblemId', 'ProblemName',
+            'Normalize', 'CutoffGap', 'XLimitKey', and 'Integral'. Problems without a solving time and horizon are omitted
+        """
+        testruns = self.getTestRuns()
+        limitkeys = [DEFAULT_XLIMITKEY if xlimitkey is None else xlimitkey for xlimitkey in xlimitkeys]
+        problemids, columns = self.getProblemColumns(testruns, [Key.ProblemName, Key.SolvingTime, Key.OptimalValue] + limitkeys)
+        hassolvingtime = columns[Key.SolvingTime][1]
+        horizons = [None if xlimitkey is None else (Validation.toFloat(columns[xlimitkey]), columns[xlimitkey][1])
+                    for xlimitkey in xlimitkeys]
+        integralkey, pwlinear = {Key.PrimalBoundHistory : (Key.PrimalIntegral, False),
+                                 Key.DualBoundHistory : (Key.DualIntegral, True)}[historykey]
+
+        times, values, offsets = self.getProblemHistories(testruns, problemids, historykey)
+        variants = getIntegralSweep(times, values, offsets, Validation.toFloat(columns[Key.SolvingTime]), hassolvingtime,
+                                    Validation.toFloat(columns[Key.OptimalValue]), columns[Key.OptimalValue][1],
+                                    horizons, cutoffgaps, normalizations, pwlinear)
+
+        testrunnames = np.repeat(np.array([testrun.getName() for testrun in testruns], dtype = object),
+                                 [len(ids) for ids in problemids])
+        allproblemids = np.concatenate([np.empty(0, dtype = np.int64)] + problemids)
+        problemnames = np.where(columns[Key.ProblemName][1], columns[Key.ProblemName][0], None)
+        tables = []
+        for normalize, cutoffgap, position, integrals in variants:
+            # an integral is only defined for problems with a solving time or a horizon
+            isdefined = hassolvingtime | columns[limitkeys[position]][1]
+            if store:
+                self.storeProblemData(testruns, problemids,
+                                      self.getIntegralSweepKey(integralkey, normalize, cutoffgap, xlimitkeys[position]),
+                                      integrals, isdefined)
+            tables.append(pd.DataFrame({"TestRun" : testrunnames[isdefined],
+                                        "ProblemId" : allproblemids[isdefined],
+                                        Key.ProblemName : problemnames[isdefined],
+                                        "Normalize" : normalize,
+                                        "CutoffGap" : np.nan if cutoffgap is None else cutoffgap,
+                                        "XLimitKey" : xlimitkeys[position],
+                                        "Integral" : integrals[isdefined]}))
+        if store:
+            self.updateDatakeys()
+        if len(tables) == 0:
+            return pd.DataFrame(columns = ["TestRun", "ProblemId", Key.ProblemName, "Normalize", "CutoffGap", "XLimitKey", "Integral"])
+        return pd.concat(tables, ignore_index = True)
 
     def writeSolufile(self):
         """ Write a solu file based on the parsed results
@@ -512,75 +861,143 @@ class Experiment:
 
         return code
 
+    def determineStatus(self, testrun, problemid):
+        """ Determine the status of a single problem
+
+        This is the scalar counterpart of the status calculation in checkProblemStatus(), see ipet.Validation
+        """
+        solustatus = testrun.problemGetSoluFileStatus(problemid)
+        errcode = testrun.getProblemDataById(problemid, ErrorFileReader.datakey)
+
+        # an error code means that the instance aborted
+        if errcode is not None or testrun.getProblemDataById(problemid, Key.SolvingTime) is None:
+            code = Key.ProblemStatusCodes.FailAbort
+
+        # if the best solution was not feasible in the original problem, it's a fail
+        elif testrun.getProblemDataById(problemid, BestSolInfeasibleReader.datakey) == True:
+            code = Key.ProblemStatusCodes.FailSolInfeasible
+
+        # go through the possible solution statuses and determine the Status of the run accordingly
+        elif solustatus == 'opt':
+            code = self.determineStatusForOptProblem(testrun, problemid)
+        elif solustatus == "best":
+            code = self.determineStatusForBestProblem(testrun, problemid)
+        elif solustatus == "inf":
+            code = self.determineStatusForInfProblem(testrun, problemid)
+        else:
+            code = self.determineStatusForUnknProblem(testrun, problemid)
+
+        return code
+
     def checkProblemStatus(self):
         """ Check a problem solving status
 
-        Check whether the solver's return status matches the information about the instances
+        Check whether the solver's return status matches the information about the instances. The status codes
+        of all problems of all test runs are determined at once, see ipet.Validation.getProblemStatus()
         """
         logging.debug('Checking problem status')
-        for testrun in self.getTestRuns():
-            for problemid in testrun.getProblemIds():
-                solustatus = testrun.problemGetSoluFileStatus(problemid)
-                errcode = testrun.getProblemDataById(problemid, ErrorFileReader.datakey)
-
-                # an error code means that the instance aborted
-                if errcode is not None or testrun.getProblemDataById(problemid, Key.SolvingTime) is None:
-                    code = Key.ProblemStatusCodes.FailAbort
-
-                # if the best solution was not feasible in the original problem, it's a fail
-                elif testrun.getProblemDataById(problemid, BestSolInfeasibleReader.datakey) == True:
-                    code = Key.ProblemStatusCodes.FailSolInfeasible
-
-                # go through the possible solution statuses and determine the Status of the run accordingly
-                elif solustatus == 'opt':
-                    code = self.determineStatusForOptProblem(testrun, problemid)
-                elif solustatus == "best":
-                    code = self.determineStatusForBestProblem(testrun, problemid)
-                elif solustatus == "inf":
-                    code = self.determineStatusForInfProblem(testrun, problemid)
-                else:
-                    code = self.determineStatusForUnknProblem(testrun, problemid)
-
-                testrun.addDataById(Key.ProblemStatus, code, problemid)
-
-                logging.debug("Problem %s in testrun %s solustatus %s, errorcode %s -> Status %s" % (problemid, testrun.getName(), repr(solustatus), repr(errcode), testrun.getProblemDataById(problemid, "Status")))
+        testruns = self.getTestRuns()
+        problemids, columns = self.getProblemColumns(testruns, [Key.PrimalBound, Key.DualBound, Key.OptimalValue,
+                                                                   ObjlimitReader.datakey, Key.ObjectiveSense, Key.SolverStatus,
+                                                                   Key.SolutionFileStatus, ErrorFileReader.datakey,
+                                                                   BestSolInfeasibleReader.datakey, Key.SolvingTime])
+        status = Validation.getProblemStatus(columns, self.gaptol, self.validatedual)
+        self.storeProblemData(testruns, problemids, Key.ProblemStatus, status)
 
     def printToConsole(self, formatstr = "{idx} {d}"):
+        self.loadPendingTestRuns()
         for tr in self.testrunmanager.getActiveSet():
             tr.printToConsole(formatstr)
 
-    def saveToFile(self, filename):
-        """ Save the experiment instance to a file specified by 'filename'.
+    def saveTestRunFiles(self, compression = None, compresslevel = None, workers = 1):
+        """ Save every test run into a .trn-file next to its first log file, e.g., 'check.out' into 'check.trn.gz'
+
+        Parameters
+        ----------
+        compression
+            compression extension of the .trn-files, i.e., one of '.gz', '.bz2', or '.xz', or None for
+            uncompressed .trn-files, whose columns can be memory-mapped when they are loaded
+        compresslevel
+            the compression level, see ipet.misc.openFile()
+        workers
+            number of threads that write test runs concurrently. Compressing and writing release the
+            global interpreter lock, such that the threads overlap their compression and file system latencies
+
+        Returns
+        -------
+        list
+            a list of (testrun, filename) tuples, where filename is None for test runs that could not be saved
+        """
+        if compression is not None and compression not in misc.compressedfileopeners:
+            raise ValueError("Unknown compression %s, use one of %s" % (compression, ", ".join(misc.compressedfileopeners)))
+
+        def saveTestRun(testrun):
+            filename = "%s%s%s" % (misc.splitFilename(testrun.filenames[0])[0], TestRun.FILE_EXTENSION, compression or "")
+            if not testrun.saveToFile(filename, compresslevel = compresslevel):
+                raise IOError("Could not write %s" % filename)
+            return filename
+
+        testruns = self.getTestRuns()
+        with ThreadPoolExecutor(max_workers = max(workers, 1)) as executor:
+            futures = [executor.submit(saveTestRun, testrun) for testrun in testruns]
+        result = []
+        for testrun, future in zip(testruns, futures):
+            try:
+                result.append((testrun, future.result()))
+            except Exception as e:
+                logging.warning("Could not save test run %s: %s" % (testrun.getIdentification(), e))
+                result.append((testrun, None))
+        return result
+
+    def saveToFile(self, filename, snapshot = True, outofband = True):
+        """ Save the experiment instance as snapshot into the directory specified by 'filename'.
 
-        Save comprises testruns and their collected data as well as custom built readers.
-        @note: works for any file extension, preferred extension is '.cmp'
+        Save comprises testruns and their collected data as well as references to the solu files and custom
+        built readers, see ipet.ExperimentSnapshot for the format. An existing file or snapshot of the same name is replaced.
+        If snapshot is False, the experiment is pickled into a single file instead, whose arrays are stored out-of-band
+        in a sidecar file if outofband is True, see ipet.misc.dumpPickle().
+        @note: works for any directory name, preferred extension is '.cmp'
         """
         if not filename.endswith(".cmp"):
             print("Preferred file extension for experiment instances is '.cmp'")
 
         try:
-            f = open(filename, "wb")
+            if snapshot:
+                ExperimentSnapshot.saveSnapshot(self, filename)
+            else:
+                self.loadPendingTestRuns()
+                misc.dumpPickle(self, filename, outofband)
         except IOError:
-            print("Could not open file named", filename)
-            return
-        pickle.dump(self, f, protocol = 2)
+            print("Could not save experiment to", filename)
 
-        f.close()
+    def appendToFile(self, filename, testrun):
+        """ Add a test run to this experiment and append it to the snapshot specified by 'filename'
+
+        Only the new test run is written, the test runs that are already part of the snapshot are not rewritten.
+        """
+        ExperimentSnapshot.appendTestRun(filename, testrun)
+        if testrun not in self.getTestRuns():
+            self.testrunmanager.addAndActivate(testrun)
+        self.updateDatakeys()
 
     @staticmethod
     def loadFromFile(filename):
         """ Load an experiment instance from the file specified by filename.
 
-        This should work for all files generated by the saveToFile command.
+        This should work for all snapshots and pickles generated by the saveToFile command, and for experiments
+        that were pickled by earlier versions. The test runs of a snapshot are loaded when they are accessed.
         @return: a Experiment instance, or None if errors occured
         """
+        if os.path.isdir(filename):
+            comp = Experiment()
+            ExperimentSnapshot.loadSnapshot(filename, comp)
+            return comp
+
         try:
-            f = open(filename, "rb")
+            comp = misc.loadPickle(filename)
         except IOError:
             print("Could not open file named", filename)
             return
-        comp = pickle.load(f)
-        f.close()
 
         if not isinstance(comp, Experiment):
             print("the loaded data is not a experiment instance!")
@@ -589,10 +1006,11 @@ class Experiment:
             return comp
 
     def getDataPanel(self, onlyactive = False):
-        """ Return a pandas Data Panel of testrun data
+        """ Return the testrun data as one data frame with the testrun settings as outer index level
 
-        Create a panel from testrun data, using the testrun settings as key
+        pandas removed its Panel class, the data of a testrun is therefore selected by panel.loc[settings]
         Set onlyactive to True to only get active testruns as defined by the testrun manager
         """
-        trdatadict = {tr.getSettings():tr.data for tr in self.getTestRuns(onlyactive)}
-        return Panel(trdatadict)
+        self.loadPendingTestRuns()
+        trdatadict = {tr.getSettings():tr.getData() for tr in self.testrunmanager.getManageables(onlyactive)}
+        return pd.concat(trdatadict)
@@ -0,0 +1,169 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2016 Zuse Institute Berlin, www.zib.de
+
+Permissions are granted as stated in the license file you have obtained
+with this software. If you find the library useful for your purpose,
+please refer to README.md for how to cite IPET.
+
+@author: Gregor Hendel
+
+versioned snapshot format for experiments
+
+A snapshot is a directory that consists of
+
+    - a JSON manifest MANIFEST with the format version, the settings of the experiment, the references to the solu
+      files, and one entry per test run,
+    - the custom readers of the experiment as reader XML, see ipet.parsing.ReaderManager.toXMLElem(),
+    - the external data of the experiment, if any, as JSON table,
+    - one .trn-file per test run in the columnar format of ipet.ColumnStore.
+
+Test runs are only loaded when the experiment accesses them, and a test run can be appended to a snapshot by
+writing its .trn-file and replacing the manifest, without rewriting the other files of the snapshot.
+"""
+from ipet.parsing.ReaderManager import ReaderManager
+from ipet.version import __version__
+from .TestRun import TestRun
+import xml.etree.ElementTree as ElementTree
+import json
+import os
+import shutil
+import pandas as pd
+
+FORMAT = "ipet-experiment"
+FORMAT_VERSION = 1
+
+MANIFEST = "manifest.json"
+READERS = "readers.xml"
+EXTERNALDATA = "externaldata.json"
+TESTRUNDIR = "testruns"
+
+def isSnapshot(dirname):
+    """ Return True if the directory is an experiment snapshot, and False, e.g., for pickled experiments
+    """
+    return os.path.isfile(os.path.join(dirname, MANIFEST))
+
+def writeJson(filename, obj):
+    """ Write an object into a JSON file atomically, such that readers never see a partially written file
+    """
+    tmpfilename = "%s.%d.tmp" % (filename, os.getpid())
+    try:
+        with open(tmpfilename, "w") as f:
+            json.dump(obj, f, indent = 1)
+        os.replace(tmpfilename, filename)
+    finally:
+        if os.path.exists(tmpfilename):
+            os.remove(tmpfilename)
+
+def readManifest(dirname):
+    """ Return the manifest of a snapshot
+
+    Raises a ValueError if the directory is no snapshot or was written by a newer format version
+    """
+    if not isSnapshot(dirname):
+        raise ValueError("%s is not an experiment snapshot" % dirname)
+    with open(os.path.join(dirname, MANIFEST), "r") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT:
+        raise ValueError("%s is not an experiment snapshot" % dirname)
+    if manifest["version"] > FORMAT_VERSION:
+        raise ValueError("Experiment snapshot %s has version %d, can only read up to version %d" %
+                         (dirname, manifest["version"], FORMAT_VERSION))
+    return manifest
+
+def writeTestRun(dirname, manifest, testrun, active):
+    """ Write a test run into the test run directory of a snapshot and add its entry to the manifest
+    """
+    index = max([entry["index"] for entry in manifest["testruns"]], default = -1) + 1
+    filename = os.path.join(TESTRUNDIR, "%04d%s" % (index, TestRun.FILE_EXTENSION))
+    testrun.saveToFile(os.path.join(dirname, filename))
+    manifest["testruns"].append({"index" : index, "name" : testrun.getName(), "file" : filename, "active" : active})
+
+def saveSnapshot(experiment, dirname):
+    """ Save an experiment as snapshot into the given directory
+
+    The snapshot is written into a temporary directory that replaces an existing file or directory of the same name
+    only after it is complete.
+    """
+    tmpdirname = "%s.%d.tmp" % (dirname.rstrip(os.sep), os.getpid())
+    if os.path.exists(tmpdirname):
+        shutil.rmtree(tmpdirname)
+    os.makedirs(os.path.join(tmpdirname, TESTRUNDIR))
+    try:
+        manifest = {
+                    "format" : FORMAT,
+                    "version" : FORMAT_VERSION,
+                    "ipetversion" : __version__,
+                    "gaptol" : experiment.gaptol,
+                    "validatedual" : experiment.validatedual,
+                    "solufiles" : [os.path.abspath(solufile) for solufile in experiment.solufiles],
+                    "probnamelist" : list(experiment.probnamelist),
+                    "datakeys" : experiment.getDatakeys(),
+                    "readers" : READERS,
+                    "externaldata" : None,
+                    "testruns" : []
+                    }
+
+        ElementTree.ElementTree(experiment.readermanager.toXMLElem()).write(os.path.join(tmpdirname, READERS))
+
+        if experiment.externaldata is not None:
+            experiment.externaldata.to_json(os.path.join(tmpdirname, EXTERNALDATA), orient = "table")
+            manifest["externaldata"] = EXTERNALDATA
+
+        testrunmanager = experiment.getManager("testrun")
+        for testrun in testrunmanager.getManageables():
+            writeTestRun(tmpdirname, manifest, testrun, testrunmanager.isActive(testrun))
+
+        writeJson(os.path.join(tmpdirname, MANIFEST), manifest)
+
+        # test runs that are memory-mapped from an older snapshot remain valid after its files are removed
+        if os.path.isdir(dirname):
+            shutil.rmtree(dirname)
+        elif os.path.exists(dirname):
+            os.remove(dirname)
+        os.rename(tmpdirname, dirname)
+    finally:
+        if os.path.exists(tmpdirname):
+            shutil.rmtree(tmpdirname)
+
+def loadSnapshot(dirname, experiment):
+    """ Load a snapshot into an empty experiment
+
+    Test runs are not loaded yet, but registered as pending entries that the experiment loads on access,
+    see ipet.Experiment.loadPendingTestRuns()
+    """
+    manifest = readManifest(dirname)
+
+    experiment.gaptol = manifest["gaptol"]
+    experiment.validatedual = manifest["validatedual"]
+    for solufile in manifest["solufiles"]:
+        experiment.addSoluFile(solufile)
+    experiment.probnamelist = list(manifest["probnamelist"])
+
+    for reader in ReaderManager.fromXMLFile(os.path.join(dirname, manifest["readers"])).getManageables():
+        if not experiment.hasReader(reader):
+            experiment.addReader(reader)
+
+    if manifest["externaldata"] is not None:
+        experiment.externaldata = pd.read_json(os.path.join(dirname, manifest["externaldata"]), orient = "table")
+
+    for datakey in manifest["datakeys"]:
+        experiment.datakeymanager.addManageable(datakey)
+
+    experiment.pendingtestruns = [dict(entry, file = os.path.join(dirname, entry["file"]))
+                                  for entry in manifest["testruns"]]
+
+def appendTestRun(dirname, testrun, active = True):
+    """ Append a test run to an existing snapshot
+
+    Only the .trn-file of the new test run is written and the manifest is replaced, all other files of the
+    snapshot remain untouched.
+    """
+    manifest = readManifest(dirname)
+    if testrun.getName() in [entry["name"] for entry in manifest["testruns"]]:
+        raise KeyError("A test run of name %s is already part of snapshot %s" % (testrun.getName(), dirname))
+    writeTestRun(dirname, manifest, testrun, active)
+    manifest["datakeys"] += sorted(set(testrun.getKeySet()).difference(manifest["datakeys"]))
+    manifest["probnamelist"] = sorted(set(manifest["probnamelist"]).union(testrun.getProblemNames()))
+    writeJson(os.path.join(dirname, MANIFEST), manifest)
@@ -41,6 +41,12 @@ context2Sortkey = {
                    }
 """ defines a sorting order for file contexts """
 
+# constants that represent the sections of the log output of a single problem, as tracked by the solver
+SECTION_HEADER = "header"  # everything before presolving, e.g., the solver version and parameter settings
+SECTION_PRESOLVE = "presolve"  # the presolving output
+SECTION_TABLE = "table"  # the display table of the branch and bound search
+SECTION_STATISTICS = "statistics"  # the final status and statistics output
+
 BestSolutionInfeasible = "BestSolInfeas"
 DatetimeEnd = "Datetime_End"
 DatetimeStart = "Datetime_Start"
@@ -0,0 +1,128 @@
+""" This module declares the data types of data keys, see ipet.Key
+
+Test runs convert their collected data into the declared data types, which saves memory and allows
+vectorized computations on the columns. Data keys without a declaration keep the data type that pandas
+infers from their values. Readers can declare the data types of their own data keys, see registerDataType().
+"""
+from ipet import Key
+import logging
+import numpy as np
+import pandas as pd
+
+DTYPE_FLOAT64 = "float64"
+DTYPE_FLOAT32 = "float32"
+DTYPE_INT64 = "int64"
+DTYPE_INT32 = "int32"
+DTYPE_BOOL = "bool"
+DTYPE_CATEGORY = "category"
+
+DTYPES = [DTYPE_FLOAT64, DTYPE_FLOAT32, DTYPE_INT64, DTYPE_INT32, DTYPE_BOOL, DTYPE_CATEGORY]
+
+key2dtype = {
+             Key.DatetimeEnd : DTYPE_INT64,
+             Key.DatetimeStart : DTYPE_INT64,
+             Key.DualBound : DTYPE_FLOAT64,
+             Key.DualIntegral : DTYPE_FLOAT64,
+             Key.DualLpTime : DTYPE_FLOAT64,
+             Key.Gap : DTYPE_FLOAT64,
+             Key.LogFileName : DTYPE_CATEGORY,
+             Key.MaximumDepth : DTYPE_INT32,
+             Key.Nodes : DTYPE_INT64,
+             Key.ObjectiveLimit : DTYPE_FLOAT64,
+             Key.ObjectiveSense : DTYPE_INT32,
+             Key.OptimalValue : DTYPE_FLOAT64,
+             Key.PrimalBound : DTYPE_FLOAT64,
+             Key.PrimalIntegral : DTYPE_FLOAT64,
+             Key.ProblemName : DTYPE_CATEGORY,
+             Key.ProblemStatus : DTYPE_CATEGORY,
+             Key.RootNodeFixings : DTYPE_INT64,
+             Key.Settings : DTYPE_CATEGORY,
+             Key.SolutionFileStatus : DTYPE_CATEGORY,
+             Key.Solver : DTYPE_CATEGORY,
+             Key.SolverStatus : DTYPE_INT32,
+             Key.SolvingTime : DTYPE_FLOAT64,
+             Key.TimeLimit : DTYPE_FLOAT64,
+             Key.TimeToBestSolution : DTYPE_FLOAT64,
+             Key.TimeToFirstSolution : DTYPE_FLOAT64,
+             "DualGap" : DTYPE_FLOAT64,
+             "LineNumbers_BeginLogFile" : DTYPE_INT64,
+             "LineNumbers_EndLogFile" : DTYPE_INT64,
+             "PrimalGap" : DTYPE_FLOAT64
+             }
+"""map from data keys to their declared data types"""
+
+def registerDataType(datakey, dtype):
+    """ Declare the data type of a data key
+
+    Parameters
+    ----------
+    datakey
+        the data key, e.g., the data key of a custom reader
+    dtype
+        one of DTYPES
+    """
+    if dtype not in DTYPES:
+        raise ValueError("Unknown data type %s for data key %s, use one of %s" % (dtype, datakey, ", ".join(DTYPES)))
+    key2dtype[datakey] = dtype
+
+def getDataType(datakey):
+    """ Return the declared data type of a data key, or None, if the data type was not declared
+    """
+    return key2dtype.get(datakey)
+
+def convertColumn(column, dtype):
+    """ Return the column converted into the given data type, or None, if the column is left unchanged
+
+    Columns that cannot be represented by the data type, e.g., integer columns with missing values or
+    text columns that should be numeric, are left unchanged, such that the conversion never loses data.
+    """
+    if column.dtype == dtype:
+        return None
+    if dtype == DTYPE_CATEGORY:
+        if pd.api.types.is_object_dtype(column.dtype) or pd.api.types.is_string_dtype(column.dtype):
+            return column.astype(DTYPE_CATEGORY)
+        return None
+
+    isnull = column.isnull()
+    if isnull.all():
+        # columns without data, e.g., a bound that no solver reported, become floating point columns
+        return column.astype(DTYPE_FLOAT32 if dtype == DTYPE_FLOAT32 else DTYPE_FLOAT64)
+    if not pd.api.types.is_numeric_dtype(column.dtype):
+        return None
+    if dtype in (DTYPE_FLOAT64, DTYPE_FLOAT32):
+        return column.astype(dtype)
+    if isnull.any():
+        return None
+
+    values = column.to_numpy()
+    if dtype == DTYPE_BOOL:
+        return column.astype(dtype) if np.isin(values, (0, 1)).all() else None
+    if values.dtype != np.bool_ and not np.array_equal(values, np.floor(values)):
+        return None
+    for inttype in (dtype, DTYPE_INT64):
+        info = np.iinfo(inttype)
+        if info.min <= values.min() and values.max() <= info.max:
+            return column.astype(inttype) if column.dtype != inttype else None
+    return None
+
+def applySchema(data):
+    """ Return the data frame with all columns of declared data keys converted into their data types
+    """
+    converted = {}
+    for datakey in data.columns:
+        dtype = key2dtype.get(datakey)
+        if dtype is None:
+            continue
+        try:
+            column = convertColumn(data[datakey], dtype)
+        except (TypeError, ValueError) as e:
+            logging.debug("Could not convert data key %s into %s: %s" % (datakey, dtype, e))
+            continue
+        if column is not None:
+            converted[datakey] = column
+    if len(converted) == 0:
+        return data
+    data = data.copy(deep = False)
+    for datakey, column in converted.items():
+        data[datakey] = column
+    return data
@@ -11,11 +11,16 @@ please refer to README.md for how to cite IPET.
 """
 from ipet import Key
 from ipet import misc
+from ipet import Schema
+from ipet.ColumnBuilder import ColumnBuilder, HistoryColumn
+from ipet import ColumnStore
 from pandas import DataFrame, notnull
 from ipet.parsing import StatisticReader
 import os, sys
+import io
 import logging
 import pandas as pd
+import numpy as np
 #from lib2to3.fixes.fix_input import context
 #from matplotlib.tests import test_lines
 
@@ -38,7 +43,13 @@ class TestRun:
             self.appendFilename(filename)
         self.data = DataFrame(dtype = object)
 
-        self.datadict = {}
+        self.databuilder = ColumnBuilder()
+        self.histories = {}
+        """ bound histories are kept outside of the data frame, see ColumnBuilder.historykeys """
+        self.columnstore = None
+        """ reader of the column store that this test run was loaded from, as long as columns are not loaded yet """
+        self.problemnameindex = None
+        """ map from problem names to the sorted lists of their problem ids, built on demand, see getProblemNameIndex() """
         self.currentproblemdata = {}
         self.currentproblemid = 0
         """ meta data represent problem-independent data """
@@ -49,36 +60,132 @@ class TestRun:
         
         self.currentfileiterator = None
         self.currentfile = None
-        self.consumedStdinput = []
+        self.currentinput = None
+        self.consumedinput = []
+        self.followPrepare()
+
+    def __getstate__(self):
+        """ lazily loaded test runs read their remaining columns before they are pickled
+        """
+        self.loadColumns()
+        # the problem name index is rebuilt on demand
+        return dict(self.__dict__, problemnameindex = None)
+
+    def __setstate__(self, state):
+        """ restore a pickled test run; test runs from older pickles collected their data in a dictionary of dictionaries
+        """
+        datadict = state.pop("datadict", None)
+        self.__dict__.update(state)
+        if datadict is not None:
+            self.databuilder = ColumnBuilder()
+            for key, problemdata in datadict.items():
+                for problemid, datum in problemdata.items():
+                    self.databuilder.set(key, problemid, datum)
+        if "columnstore" not in state:
+            self.columnstore = None
+        self.problemnameindex = None
+        if "histories" not in state:
+            # older pickles store the bound histories as lists of tuples in the data frame
+            self.histories = {}
+            for datakey in ColumnBuilder.historykeys:
+                if datakey in self.data.columns:
+                    self.histories[datakey] = HistoryColumn.fromSeries(self.data[datakey])
+                    self.data = self.data.drop(columns = datakey)
 
     def __iter__(self):
-        if(self.currentfile != ""):
-            with open(self.currentfile, "r") as f:
-                for line in enumerate(f):
-                    yield line
-        else: 
-            for line in enumerate(self.consumedStdinput):
-                yield line
-            for line in enumerate(sys.stdin, len(self.consumedStdinput)):
-                yield line
+        """ iterate over the enumerated lines of the current file
+
+        lines that were already consumed from the input, see iterationAddConsumedInput(), are
+        yielded first, the remaining lines are read from the input that is still open
+        """
+        for line in enumerate(self.consumedinput):
+            yield line
+        for line in enumerate(self.iterationGetInput(), len(self.consumedinput)):
+            yield line
 
     def iterationPrepare(self):
         filenames = sorted(self.filenames, key = lambda x:misc.sortingKeyContext(misc.filenameGetContext(x)))
         self.currentfileiterator = iter(filenames)
         
     def iterationNextFile(self):
+        self.iterationCloseInput()
         try:
             self.currentfile = next(self.currentfileiterator)
             return True
         except StopIteration:
             return False
-    
-    def iterationAddConsumedStdinput(self, consumedlines):
-        if self.currentfile == "":
-            for line in consumedlines:
-                self.consumedStdinput.append(line)
-    
+
+    def iterationGetInput(self):
+        """ return the open input of the current file, which is opened on first use
+        """
+        if self.currentinput is None:
+            if self.currentfile != "":
+                self.currentinput = misc.openFile(self.currentfile, "r")
+            else:
+                self.currentinput = sys.stdin
+        return self.currentinput
+
+    def iterationCloseInput(self):
+        """ close the input of the current file and forget about its consumed lines
+        """
+        # test runs from older pickles have no input attribute yet
+        currentinput = getattr(self, "currentinput", None)
+        if currentinput is not None and currentinput is not sys.stdin:
+            currentinput.close()
+        self.currentinput = None
+        self.consumedinput = []
+
+    def iterationAddConsumedInput(self, consumedlines):
+        """ hand back lines that were consumed from the input of the current file
+
+        Subsequent iterations over this test run yield these lines before reading further from the input,
+        such that every file is read only once.
+        """
+        for line in consumedlines:
+            self.consumedinput.append(line)
+
+    def getLogFileName(self):
+        """ return the name of the log file of this test run, or None, if the test run has no log file
+        """
+        for filename in self.filenames:
+            if filename != "" and misc.filenameGetContext(filename) == Key.CONTEXT_LOGFILE:
+                return filename
+        return None
+
+    def followPrepare(self):
+        """ start following a log file from its beginning, see followGetAppendedLines()
+        """
+        self.followoffset = 0
+        self.followlinenumber = 0
+
+    def followGetAppendedLines(self, filename, complete = True):
+        """ return the enumerated lines that were appended to a file since the last call
+
+        Only the bytes behind the stored byte offset are read, such that the effort depends
+        on the amount of new data, not on the size of the file.
+
+        Parameters
+        ----------
+        filename
+            the file that is being written
+        complete
+            should only complete lines be returned? An incomplete last line is returned by a later call
+        """
+        with open(filename, "rb") as f:
+            f.seek(self.followoffset)
+            data = f.read()
+        if complete:
+            data = data[:data.rfind(b"\n") + 1]
+        self.followoffset += len(data)
+
+        # universal newlines as for log files that are opened in text mode
+        lines = io.StringIO(data.decode(), newline = None).readlines()
+        enumeratedlines = list(enumerate(lines, self.followlinenumber))
+        self.followlinenumber += len(lines)
+        return enumeratedlines
+
     def iterationCleanUp(self):
+        self.iterationCloseInput()
         self.currentfileiterator = None
         
     def iterationGetCurrentFile(self):
@@ -99,7 +206,7 @@ class TestRun:
         
         extension = misc.filenameGetContext(filename)
         if extension in [Key.CONTEXT_ERRFILE, Key.CONTEXT_LOGFILE]:
-            metafile = os.path.splitext(filename)[0]+".meta"
+            metafile = misc.splitFilename(filename)[0]+".meta"
 
             if os.path.isfile(metafile) and (metafile not in self.filenames):
                 self.filenames.append(metafile)
@@ -112,9 +219,45 @@ class TestRun:
 
         after data was added, the method getProblemDataById() can be used for access
         """
-        for problemid, name in self.datadict.setdefault(Key.ProblemName, {}).items():
-            if name == problem:
-                self.addDataById(datakeys, data, problemid)
+        if self.databuilder.isEmpty():
+            return
+        for problemid in self.getProblemIdsByName(problem):
+            self.addDataById(datakeys, data, problemid)
+
+    def addDataByNames(self, datakeys, problemnames, data):
+        """Add data to the problems of many names at once
+
+        Readers of files with one line per problem name, such as solu files, can collect their data and store
+        it with a single call. The data is only stored while data is collected, like in addDataByName(), and
+        names that do not belong to any problem of this test run are ignored. If a name occurs repeatedly,
+        its last occurrence is stored, as if addDataByName() was called for every name in order.
+
+        Parameters
+        ----------
+        datakeys
+            list of data keys
+        problemnames
+            list of problem names
+        data
+            list of columns of data, one column per data key, each with one entry per problem name
+        """
+        if self.databuilder.isEmpty():
+            return
+        index = self.getProblemNameIndex()
+        lastpositions = {name : position for position, name in enumerate(problemnames)}
+        problemids = []
+        positions = []
+        for name, position in lastpositions.items():
+            ids = index.get(name, ())
+            problemids.extend(ids)
+            positions.extend([position] * len(ids))
+        if len(problemids) == 0:
+            return
+        logging.debug("TestRun %s receives data Datakeys %s for %d problems" % (self.getName(), repr(datakeys), len(problemids)))
+        for datakey, column in zip(datakeys, data):
+            self.databuilder.setValues(datakey, problemids, [column[position] for position in positions])
+        if Key.ProblemName in datakeys:
+            self.problemnameindex = None
 
     def addData(self, datakey, data):
         """Add data to current problem
@@ -151,9 +294,42 @@ class TestRun:
 
         if type(datakeys) is list and type(data) is list:
             for key, datum in zip(datakeys, data):
-                self.datadict.setdefault(key, {})[problemid] = datum
+                self.databuilder.set(key, problemid, datum)
         else:
-            self.datadict.setdefault(datakeys, {})[problemid] = data
+            self.databuilder.set(datakeys, problemid, data)
+        if datakeys == Key.ProblemName or (type(datakeys) is list and Key.ProblemName in datakeys):
+            self.problemnameindex = None
+
+    def addDataByIds(self, datakey, problemids, data):
+        """Add the data of a single data key to many distinct problems at once, see addDataById()
+
+        Parameters
+        ----------
+        datakey
+            the data key
+        problemids
+            list or array of distinct problem ids
+        data
+            list or array of the data, one entry per problem id
+        """
+        if len(problemids) == 0:
+            return
+        self.databuilder.setValues(datakey, problemids, data)
+        if datakey == Key.ProblemName:
+            self.problemnameindex = None
+
+    def addDataColumn(self, datakey, problemids, data):
+        """Add the data of a single data key to many distinct problems, also after the data collection
+
+        In collection mode, this is the same as addDataByIds(). Otherwise, the data is stored as a column of the
+        data frame, where problems without data have a missing value
+        """
+        if not self.databuilder.isEmpty() or len(self.data.index) == 0:
+            self.addDataByIds(datakey, problemids, data)
+            return
+        self.data[datakey] = pd.Series(data, index = problemids).reindex(self.data.index)
+        if datakey == Key.ProblemName:
+            self.problemnameindex = None
 
     def addParameterValue(self, paramname, paramval):
         """Store the value for a parameter of a given name for this test run
@@ -181,15 +357,22 @@ class TestRun:
     def getKeySet(self):
         """Return a list or set of keys (which are the columns headers of the data)
         """
-        if self.datadict != {}:
-            return list(self.datadict.keys())
+        if not self.databuilder.isEmpty():
+            return list(self.databuilder.keys())
         else:
-            return set(self.data.columns)
+            keyset = set(self.data.columns).union(self.histories.keys())
+            if self.columnstore is not None:
+                keyset.update(self.columnstore.getColumnKeys())
+                keyset.update(self.columnstore.getHistoryKeys())
+            return keyset
 
     def emptyData(self):
         """Empty all data of current testrun
         """
         self.data = DataFrame(dtype = object)
+        self.histories = {}
+        self.columnstore = None
+        self.problemnameindex = None
 
     def getMetaData(self):
         """Return a data frame containing meta data
@@ -197,7 +380,7 @@ class TestRun:
         return DataFrame(self.metadatadict)
 
     def finalizeCurrentCollection(self, solver):
-        """ Any data of the current problem is saved as a new row in datadict
+        """ Any data of the current problem is saved as a new row of the collected data
         """
         if self.currentproblemdata != {}:
             # Add data collected by solver into currentproblemdata, such as primal and dual bound,
@@ -205,39 +388,95 @@ class TestRun:
             for key in self.metadatadict.keys():
                 self.addData(key, self.metadatadict[key])
 
-            for key in self.currentproblemdata.keys():
-                self.datadict.setdefault(key, {})[self.currentproblemid] = self.currentproblemdata[key]
+            self.databuilder.setRow(self.currentproblemid, self.currentproblemdata)
+            if self.problemnameindex is not None and Key.ProblemName in self.currentproblemdata:
+                self.problemnameindex.setdefault(self.currentproblemdata[Key.ProblemName], []).append(self.currentproblemid)
             self.currentproblemdata = {}
             self.currentproblemid = self.currentproblemid + 1
 
+    def getCollectedProblemData(self, problemid):
+        """ Return a dictionary of the data of a problem while the data collection is still running
+        """
+        return self.databuilder.getRow(problemid)
+
     def finishedReadingFile(self, solver):
         """ Save data of current problem
         """
         self.finalizeCurrentCollection(solver)
 
     def setupForDataCollection(self):
-        """ Save data in a python dictionary for easier data collection
+        """ Save data in typed, growable columns for easier data collection
         """
-        self.datadict = self.data.to_dict()
+        self.loadColumns()
+        self.databuilder = ColumnBuilder.fromDataFrame(self.data, self.histories)
         self.data = DataFrame(dtype = object)
+        self.histories = {}
+        self.problemnameindex = None
+
+    def mergeCollectedData(self, testrun):
+        """ Take over the data that was collected by a copy of this test run
+
+        the copy is usually obtained from a worker process that parsed the log files of this test run
+        """
+        self.databuilder = testrun.databuilder
+        self.data = testrun.data
+        self.histories = testrun.histories
+        self.metadatadict = testrun.metadatadict
+        self.parametervalues = testrun.parametervalues
+        self.defaultparametervalues = testrun.defaultparametervalues
+        self.currentproblemid = testrun.currentproblemid
+        self.problemnameindex = None
+
+    def appendProblemData(self, testrun):
+        """ Append the problems collected by another test run as new problems of this test run
+
+        the problem ids of the other test run are shifted behind the problem ids of this test run
+        """
+        self.databuilder.append(testrun.databuilder, self.currentproblemid)
+        self.currentproblemid = self.currentproblemid + testrun.currentproblemid
+        self.problemnameindex = None
 
     def setupAfterDataCollection(self):
         """ Save data in a pandas dataframe for futher use (i.e. reading and finding data)
+
+        the columns of data keys with a declared data type are converted, see ipet.Schema.
+        Bound histories are stored contiguously in the order of the problem ids, see HistoryColumn
         """
-        self.data = DataFrame(self.datadict)
-        self.datadict = {}
+        self.data = Schema.applySchema(self.databuilder.toDataFrame())
+        self.histories = self.databuilder.getHistories()
+        for column in self.histories.values():
+            column.compact()
+        self.databuilder = ColumnBuilder()
+        self.problemnameindex = None
 
     def hasProblemName(self, problemname):
         """ Return if already collected data for a problem with given name
         """
-        if self.datadict != {}:
-            return problemname in self.datadict.get(Key.ProblemName, {}).values()
-        else:
-            if Key.ProblemName in self.data.keys():
-                for name in self.data[Key.ProblemName]:
-                    if problemname == name:
-                        return True
-            return False
+        return problemname in self.getProblemNameIndex()
+
+    def getProblemNameIndex(self):
+        """ Return a dictionary that maps every problem name to the sorted list of its problem ids
+
+        The index is built once and maintained while problems are collected or deleted, such that
+        looking up problems by name takes constant time.
+        """
+        if self.problemnameindex is None:
+            index = {}
+            if not self.databuilder.isEmpty():
+                namecolumn = self.databuilder.getColumn(Key.ProblemName)
+                names = namecolumn.items() if namecolumn is not None else []
+            else:
+                self.loadColumns([Key.ProblemName])
+                names = zip(self.data.index, self.data[Key.ProblemName]) if Key.ProblemName in self.data.columns else []
+            for problemid, name in names:
+                index.setdefault(name, []).append(problemid)
+            self.problemnameindex = index
+        return self.problemnameindex
+
+    def getProblemIdsByName(self, problemname):
+        """ Return the sorted list of problem ids of a problem name, which is empty for unknown names
+        """
+        return self.getProblemNameIndex().get(problemname, [])
 
     def hasProblemId(self, problemid):
         """ Returns if there is already data collected for a problem with given id
@@ -252,31 +491,38 @@ class TestRun:
     def getProblemNames(self):
         """ Return an (unsorted) list of problemnames
         """
-        if self.datadict != {}:
-            return list(self.datadict.get(Key.ProblemName, []))
+        if not self.databuilder.isEmpty():
+            namecolumn = self.databuilder.getColumn(Key.ProblemName)
+            return [name for _, name in namecolumn.items()] if namecolumn is not None else []
         else:
+            self.loadColumns([Key.ProblemName])
             if Key.ProblemName in self.data.columns:
                 return list(self.data[Key.ProblemName])
             else:
                 return []
 
     def getProblemDataByName(self, problemname, datakey):
-        """Return the data collected for problems with given name
+        """Return the data collected for the first problem with given name, or None, if there is no such problem
+
+        Bound histories are returned as tuples (times, values) of float arrays, see getProblemDataById()
         """
-        collecteddata = []
-        if self.datadict != {}:
-            for key, dat in self.datadict.get("ProblemName", None):
-                if dat == problemname:
-                    collecteddata.append(self.getProblemDataById(key, datakey))
-        else:
-            collecteddata = list(self.data[self.data[Key.ProblemName] == problemname].loc[:, datakey])
-        try:
-            return collecteddata[0]
-        except IndexError:
+        problemids = self.getProblemIdsByName(problemname)
+        if len(problemids) == 0:
             return None
+        if not self.databuilder.isEmpty():
+            return self.getProblemDataById(problemids[0], datakey)
+
+        self.loadColumns([datakey])
+        if datakey in self.histories:
+            return self.histories[datakey].get(problemids[0])
+        return self.data.loc[problemids[0], datakey]
 
     def getProblemDataById(self, problemid, datakey = None):
         """Return data for a specific datakey, or None, if no such data exists for this (probname, datakey) key pair
+
+        For the bound histories Key.PrimalBoundHistory and Key.DualBoundHistory, the data is a tuple (times, values)
+        of two float arrays, which are views into the history column, see ColumnBuilder.HistoryColumn.
+        Older versions returned a list of (time, value) tuples, which list(zip(times, values)) restores.
         """
         if datakey is None:
             try:
@@ -285,8 +531,11 @@ class TestRun:
                 return "<%s> not contained in keys, have only\n%s" % \
                     (problemid, ",".join((ind for ind in self.getProblemIds())))
         else:
-            if self.datadict != {}:
-                return self.datadict.get(datakey, {}).get(problemid, None)
+            if not self.databuilder.isEmpty():
+                return self.databuilder.get(datakey, problemid)
+            self.loadColumns([datakey])
+            if datakey in self.histories:
+                return self.histories[datakey].get(problemid)
             else:
                 try:
                     data = self.data.loc[problemid, datakey]
@@ -297,39 +546,108 @@ class TestRun:
                 else:
                     return None
 
+    def getColumnValues(self, datakey, problemids):
+        """ Return the values of a data key for a sorted array of problem ids and the mask of the problems that have a value
+
+        In contrast to getProblemDataById(), collected values that are NaN are distinguished from missing values
+        """
+        if not self.databuilder.isEmpty():
+            return self.databuilder.getValues(datakey, problemids)
+        self.loadColumns([datakey])
+        if datakey not in self.data.columns:
+            return np.full(len(problemids), np.nan), np.zeros(len(problemids), dtype = np.bool_)
+        series = self.data[datakey].reindex(problemids)
+        return series.to_numpy(), series.notnull().to_numpy()
+
+    def getHistoryArrays(self, datakey, problemids):
+        """ Return the times, values, and offsets of the histories of a data key for an array of problem ids
+
+        see ipet.ColumnBuilder.HistoryColumn.getArrays()
+        """
+        if not self.databuilder.isEmpty():
+            column = self.databuilder.getColumn(datakey)
+        else:
+            self.loadColumns([datakey])
+            column = self.histories.get(datakey)
+        if column is None:
+            return np.empty(0), np.empty(0), np.zeros(len(problemids) + 1, dtype = np.int64)
+        return column.getArrays(problemids)
+
     def getProblemsDataById(self, problemids, datakey):
         """ Return data for a list of problems
         """
-        if self.datadict != {}:
-            return [self.datadict.get(datakey, {}).get(id, None) for id in problemids]
+        if not self.databuilder.isEmpty():
+            return [self.databuilder.get(datakey, id) for id in problemids]
+        self.loadColumns([datakey])
+        if datakey in self.histories:
+            return [self.histories[datakey].get(id) for id in problemids]
         else:
             return self.data.loc[problemids, datakey]
 
     def deleteProblemDataById(self, problemid):
         """ Delete all data acquired so far for problemid
         """
-        if self.datadict != {}:
-            for key in list(self.datadict.keys()):
-                try:
-                    del self.datadict[key][problemid]
-                except KeyError:
-                    pass
+        if self.problemnameindex is not None:
+            if not self.databuilder.isEmpty():
+                name = self.databuilder.get(Key.ProblemName, problemid)
+            else:
+                self.loadColumns([Key.ProblemName])
+                name = self.data[Key.ProblemName].get(problemid) if Key.ProblemName in self.data.columns else None
+            problemids = self.problemnameindex.get(name, [])
+            if problemid in problemids:
+                problemids.remove(problemid)
+                if len(problemids) == 0:
+                    del self.problemnameindex[name]
+            else:
+                # e.g., missing names, which are no reliable dictionary keys
+                self.problemnameindex = None
+        if not self.databuilder.isEmpty():
+            self.databuilder.deleteRow(problemid)
         else:
+            self.loadColumns()
+            for column in self.histories.values():
+                column.unset(problemid)
             try:
                 self.data.drop(problemid, inplace = True)
             except TypeError:
                 # needs to be caught for pandas version < 0.13
                 self.data = self.data.drop(problemid)
 
-    def saveToFile(self, filename):
-        """ Dump the pickled instance of itself into a .trn-file
-        """
+    def saveToFile(self, filename, columnar = True, outofband = True, compresslevel = None):
+        """ Save this test run into a .trn-file
+
+        Parameters
+        ----------
+        filename
+            name of the .trn-file
+        columnar
+            should the test run be saved in the columnar format of ipet.ColumnStore? Every column is then saved
+            as a separate block, such that loadFromFile() can read single columns. Otherwise, the test run is pickled
+        outofband
+            should the arrays of a pickled test run be stored out-of-band in a sidecar file, see ipet.misc.dumpPickle()
+        compresslevel
+            the compression level if filename has a compression extension, e.g., 'check.trn.gz', see ipet.misc.openFile()
+
+        Returns
+        -------
+        bool
+            True if the test run was saved, False if filename could not be written
+        """
+        if not columnar:
+            try:
+                misc.dumpPickle(self, filename, outofband, compresslevel)
+            except IOError:
+                print("Could not open %s for saving test run" % filename)
+                return False
+            return True
+        self.loadColumns()
+        state = {key : value for key, value in self.__dict__.items() if key not in ("data", "histories", "columnstore", "problemnameindex")}
         try:
-            f = open(filename, 'wb')
-            pickle.dump(self, f, protocol = 2)
-            f.close()
+            ColumnStore.writeColumnStore(filename, self.data, self.histories, state, compresslevel)
         except IOError:
             print("Could not open %s for saving test run" % filename)
+            return False
+        return True
 
     def emptyCurrentProblemData(self):
         """ Empty data of currently read problem
@@ -339,6 +657,7 @@ class TestRun:
     def printToConsole(self, formatstr = "{idx}: {d}"):
         """ Print data to console
         """
+        self.loadColumns()
         for idx, d in self.data.iterrows():
 #            pd.set_option('display.max_rows', len(d))
             print(formatstr.format(d = d, idx = idx))
@@ -347,29 +666,93 @@ class TestRun:
     def toJson(self):
         """ Return the data-object in json
         """
+        self.loadColumns()
         return self.data.to_json()
 
     @staticmethod
-    def loadFromFile(filename):
+    def loadFromFile(filename, datakeys = None, memorymap = False):
         """ Loads a .trn-File containing a particular instance of TestRun
-        """
+
+        Parameters
+        ----------
+        filename
+            name of a .trn-file in the columnar format, or of a .trn-file that contains a pickled test run
+        datakeys
+            list of data keys that are loaded immediately, or None to load all data keys. The remaining
+            columns of a columnar .trn-file are loaded on demand, see loadColumns()
+        memorymap
+            should numeric columns and bound histories of an uncompressed, columnar .trn-file, or the out-of-band
+            buffers of a pickled test run, be memory-mapped instead of read? Memory-mapped columns are read-only
+            and shared with other processes that map the same file
+        """
+        if ColumnStore.isColumnStore(filename):
+            columnstore = ColumnStore.ColumnStoreReader(filename, memorymap)
+            testrun = TestRun.__new__(TestRun)
+            testrun.__dict__.update(columnstore.readState())
+            testrun.data = DataFrame(index = pd.Index(columnstore.readIndex()))
+            testrun.histories = {}
+            testrun.columnstore = columnstore
+            testrun.problemnameindex = None
+            testrun.loadColumns(datakeys)
+            return testrun
         try:
-            if filename.endswith(".gz"):
-                import gzip
-                f = gzip.open(filename, 'rb')
-            else:
-                f = open(filename, 'rb')
+            testrun = misc.loadPickle(filename, memorymap)
         except IOError:
             print("Could not open %s for loading test run" % filename)
             return None
-        testrun = pickle.load(f)
-        f.close()
+        # test runs that were saved before their data keys were declared
+        testrun.data = Schema.applySchema(testrun.data)
         return testrun
 
-    def getData(self, datakey = None):
-        """Return a data frame object of the acquired data
+    def loadColumns(self, datakeys = None):
+        """ Load the columns of the given data keys from the column store of this test run, if not loaded yet
+
+        Parameters
+        ----------
+        datakeys
+            list of data keys, or None to load all remaining columns
         """
-        return self.data
+        if self.columnstore is None:
+            return
+        columnkeys = self.columnstore.getColumnKeys()
+        historykeys = self.columnstore.getHistoryKeys()
+        if datakeys is None:
+            datakeys = columnkeys + historykeys
+
+        newcolumns = [datakey for datakey in datakeys if datakey in columnkeys and datakey not in self.data.columns]
+        if len(newcolumns) > 0:
+            newdata = Schema.applySchema(self.columnstore.readColumns(newcolumns, self.data.index))
+            # keep the column order of the store
+            data = pd.concat([self.data, newdata], axis = 1)
+            # columns that were added after the data collection follow the columns of the store
+            self.data = data[[datakey for datakey in columnkeys if datakey in data.columns] +
+                             [datakey for datakey in self.data.columns if datakey not in columnkeys]]
+        for datakey in datakeys:
+            if datakey in historykeys and datakey not in self.histories:
+                self.histories[datakey] = self.columnstore.readHistory(datakey)
+
+        if all(datakey in self.data.columns for datakey in columnkeys) and len(self.histories) == len(historykeys):
+            self.columnstore = None
+
+    def getData(self, datakeys = None):
+        """Return a data frame object of the acquired data
+
+        Bound histories are stored outside of the data frame, see getHistoryArrays(). Histories whose data keys are
+        requested explicitly are added to a copy of the data frame as object columns of lists of (time, value)
+        tuples, the format of older test runs.
+
+        Parameters
+        ----------
+        datakeys
+            list of data keys that the data frame must contain, or None to load all columns, see loadColumns()
+        """
+        self.loadColumns(datakeys)
+        if datakeys is None:
+            return self.data
+        historykeys = [datakey for datakey in datakeys if datakey in self.histories]
+        if len(historykeys) == 0:
+            return self.data
+        return self.data.assign(**{datakey : self.histories[datakey].toSeries(self.data.index) for datakey in historykeys})
             
     def getCurrentLogfilename(self):
         """ Return the name of the current logfile 
@@ -379,6 +762,7 @@ class TestRun:
     def getSettings(self):
         """ Return the settings associated with this test run
         """
+        self.loadColumns(['Settings'])
         try:
             return self.data['Settings'][0]
         except KeyError:
@@ -393,7 +777,7 @@ class TestRun:
         """ Return identification string of this test run
         """
         # TODO Is this still the way to do this? What if we are reading from stdin?
-        return os.path.splitext(os.path.basename(self.filenames[0]))[0]
+        return misc.splitFilename(os.path.basename(self.filenames[0]))[0]
     
     def problemGetOptimalSolution(self, problemid):
         """ Return objective of an optimal or a best known solution
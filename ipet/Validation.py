@@ -0,0 +1,174 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2016 Zuse Institute Berlin, www.zib.de
+
+Permissions are granted as stated in the license file you have obtained
+with this software. If you find the library useful for your purpose,
+please refer to README.md for how to cite IPET.
+
+@author: Gregor Hendel
+
+vectorized validation of the collected data of test runs
+
+The functions of this module compute primal and dual gaps and problem status codes for many problems at once.
+Every column is passed as a pair of a value array and a boolean mask of the problems that have a value, such that
+missing values (None) remain distinguishable from stored NaN values. The decision rules are the same as the ones of
+the scalar methods of ipet.Experiment, e.g., Experiment.determineStatusForOptProblem(), and are evaluated as tables
+of masks by numpy.select().
+"""
+from ipet import Key
+from ipet.misc import misc
+from ipet.parsing import ObjsenseReader
+import numpy as np
+
+OBJECTIVELIMIT = "objectiveLimit"
+""" solver status of runs that stopped at the objective limit """
+
+LIMITSTATUSES = [Key.SolverStatusCodes.TimeLimit, Key.SolverStatusCodes.MemoryLimit, Key.SolverStatusCodes.NodeLimit]
+
+STATUSCODES = np.array(list(Key.ProblemStatusCodes.statusToPriority), dtype = object)
+""" all problem status codes; the decision tables select positions in this array instead of strings """
+
+def getStatusIndex(code):
+    return np.int8(list(STATUSCODES).index(code))
+
+def pyMax(values, othervalues):
+    """ Elementwise maximum with the semantics of Python's max(), which returns its first argument if the second is NaN
+    """
+    return np.where(othervalues > values, othervalues, values)
+
+def toFloat(column):
+    """ Return the values of a column as float array that is NaN where the column has no value
+    """
+    values, isvalid = column
+    result = np.full(len(values), np.nan)
+    result[isvalid] = np.asarray(values[isvalid], dtype = np.float64)
+    return result
+
+def equals(column, value):
+    """ Return the mask of the problems whose value equals the given value
+    """
+    values, isvalid = column
+    return isvalid & np.asarray(values == value, dtype = np.bool_)
+
+def isTrue(column):
+    """ Return the mask of the problems whose value is true in a boolean context
+    """
+    values, isvalid = column
+    if values.dtype == object:
+        return isvalid & np.fromiter((bool(value) for value in values), dtype = np.bool_, count = len(values))
+    return isvalid & (values != 0)
+
+def getGaps(values, hasvalues, referencevalues, hasreferencevalues, useCplexGap = False):
+    """ Calculate the gaps between two arrays of values in percent, see ipet.misc.getGap()
+
+    Parameters
+    ----------
+    values
+        float array of the values
+    hasvalues
+        mask of the values that are not None
+    referencevalues
+        float array of the reference values
+    hasreferencevalues
+        mask of the reference values that are not None
+    useCplexGap
+        Calculate the gap in 'Cplex'-fashion, see ipet.misc.getGap()
+
+    Returns
+    -------
+    array
+        the gaps, which are misc.FLOAT_INFINITY where a value is missing or equals misc.FLOAT_INFINITY
+    """
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        difference = np.abs(values - referencevalues)
+        if useCplexGap:
+            maximum = pyMax(np.abs(values), np.abs(referencevalues))
+            gaps = np.where(maximum <= 10e-9, 0.0, difference / maximum * 100)
+        else:
+            gaps = np.where(referencevalues == 0.0,
+                            np.where(values == 0.0, 0.0, misc.FLOAT_INFINITY),
+                            difference / np.abs(referencevalues) * 100)
+    isfinite = hasvalues & hasreferencevalues & (values != misc.FLOAT_INFINITY) & (referencevalues != misc.FLOAT_INFINITY)
+    return np.where(isfinite, gaps, misc.FLOAT_INFINITY)
+
+def getProblemStatus(columns, gaptol, validatedual):
+    """ Determine the status codes of all problems, see ipet.Experiment.checkProblemStatus()
+
+    Parameters
+    ----------
+    columns
+        dictionary that maps the data keys Key.PrimalBound, Key.DualBound, Key.OptimalValue, Key.ObjectiveLimit,
+        Key.ObjectiveSense, Key.SolverStatus, Key.SolutionFileStatus, Key.ErrorCode, Key.BestSolutionInfeasible,
+        and Key.SolvingTime to (values, isvalid) pairs of arrays of equal length
+    gaptol
+        relative tolerance for comparisons of bounds and known solution values
+    validatedual
+        should the gap between the primal and the dual bound be validated, too?
+
+    Returns
+    -------
+    array
+        object array of the status codes, see Key.ProblemStatusCodes
+    """
+    codes = Key.ProblemStatusCodes
+    ok, solvednotverified, better, unknown, fail, failabort, faildualbound, failobjectivevalue, failsolinfeasible, \
+        failsolinfeasibleinstance = [getStatusIndex(code) for code in [codes.Ok, codes.SolvedNotVerified, codes.Better,
+                                                                         codes.Unknown, codes.Fail, codes.FailAbort,
+                                                                         codes.FailDualBound, codes.FailObjectiveValue,
+                                                                         codes.FailSolInfeasible, codes.FailSolOnInfeasibleInstance]]
+    pb = toFloat(columns[Key.PrimalBound])
+    haspb = columns[Key.PrimalBound][1]
+    db = toFloat(columns[Key.DualBound])
+    hasdb = columns[Key.DualBound][1]
+    optval = toFloat(columns[Key.OptimalValue])
+    objlimit = toFloat(columns[Key.ObjectiveLimit])
+    solverstatus = columns[Key.SolverStatus]
+
+    minimize = equals(columns[Key.ObjectiveSense], ObjsenseReader.minimize)
+    maximize = equals(columns[Key.ObjectiveSense], ObjsenseReader.maximize)
+    solfound = haspb & ~(np.abs(pb) >= misc.FLOAT_INFINITY)
+
+    with np.errstate(invalid = "ignore"):
+        # the bounds are better than the known solution value, see Experiment.isPrimalBoundBetter() and isDualBoundBetter()
+        pbreltol = gaptol * pyMax(np.abs(pb), 1.0)
+        optreltol = gaptol * pyMax(np.abs(optval), 1.0)
+        pbbetter = haspb & ((minimize & (optval - pb > pbreltol)) | (maximize & (pb - optval > pbreltol)))
+        dbreltol = np.where(haspb, pbreltol, optreltol)
+        dbbetter = hasdb & ((minimize & (db - optval > dbreltol)) | (maximize & (optval - db > dbreltol)))
+        objlimitok = (minimize & (optval - objlimit >= -optreltol)) | (maximize & (objlimit - optval >= -optreltol))
+
+    pbdbconverged = getGaps(pb, haspb, db, hasdb) < gaptol
+    dualvalid = pbdbconverged if validatedual else np.ones(len(pb), dtype = np.bool_)
+
+    # the problem status codes of the solver status codes, see Key.solverToProblemStatusCode()
+    solvercode = np.select([equals(solverstatus, status) for status in Key.solver2problemStatusCode],
+                           [getStatusIndex(code) for code in Key.solver2problemStatusCode.values()], unknown)
+    limitreached = np.any([equals(solverstatus, status) for status in LIMITSTATUSES], axis = 0)
+    objlimitreached = equals(solverstatus, OBJECTIVELIMIT)
+
+    optcode = np.select([solfound & (pbbetter | dbbetter),
+                         ~solfound & objlimitreached & objlimitok,
+                         ~solfound & objlimitreached,
+                         limitreached,
+                         (~hasdb | dualvalid) & ~pbbetter],
+                        [failobjectivevalue, ok, failobjectivevalue, solvercode, ok],
+                        fail)
+    bestcode = np.select([dbbetter, limitreached & pbbetter, limitreached, dualvalid],
+                         [faildualbound, better, solvercode, solvednotverified],
+                         fail)
+    infcode = np.select([solfound, limitreached], [failsolinfeasibleinstance, solvercode], ok)
+    unkncode = np.select([isTrue(solverstatus) & haspb, isTrue(solverstatus), pbdbconverged],
+                         [better, solvercode, solvednotverified],
+                         unknown)
+
+    solustatus = columns[Key.SolutionFileStatus]
+    status = np.select([columns[Key.ErrorCode][1] | ~columns[Key.SolvingTime][1],
+                        equals(columns[Key.BestSolutionInfeasible], True),
+                        equals(solustatus, "opt"),
+                        equals(solustatus, "best"),
+                        equals(solustatus, "inf")],
+                       [failabort, failsolinfeasible, optcode, bestcode, infcode],
+                       unkncode)
+    return STATUSCODES[status]
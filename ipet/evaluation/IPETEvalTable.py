@@ -18,8 +18,10 @@ import numpy
 from ipet.concepts.IPETNode import IpetNode, IpetNodeAttributeError
 from ipet.misc import misc
 import logging
+import re
 from ipet import Experiment
 from ipet import Key
+from ipet.ColumnBuilder import ColumnBuilder
 from pandas.core.frame import DataFrame
 from numpy import isnan
 from ipet.evaluation.IPETFilter import IPETValue
@@ -371,6 +373,9 @@ class IPETEvaluationColumn(IpetNode):
                 try:
                     result = df[self.origcolname]
                 except KeyError as e:
+                    if self.origcolname in ColumnBuilder.historykeys:
+                        raise KeyError("Bound history %s of column %s is not available, none of the test runs has collected it" %
+                                       (self.origcolname, self.getName())) from e
                     # print an error message and make a series with NaN's
                     print(e)
                     print("Could not retrieve data %s" % self.origcolname)
@@ -394,7 +399,7 @@ class IPETEvaluationColumn(IpetNode):
 
                 # group the whole table per instance #
 
-                argdf = argdf.groupby(level=0)
+                argdf = argdf.groupby(level=0, observed = True)
 
                 # determine the axis along which to apply the transformation later on
                 applydict = {}
@@ -464,9 +469,19 @@ class IPETEvaluationColumn(IpetNode):
                 dep = i.getDependency(j)
                 if dep is not None:
                     self.addDependency(dependencies, dep)
+            if i.datakey is not None:
+                self.addDependency(dependencies, i.datakey)
 
         return dependencies
 
+    def getRegexes(self):
+        """Return a list of the regular expressions of this column and its children
+        """
+        regexes = [] if self.regex is None else [self.regex]
+        for child in self.children:
+            regexes += child.getRegexes()
+        return regexes
+
 class FormatFunc:
 
     def __init__(self, formatstr):
@@ -529,6 +544,12 @@ class IPETEvaluation(IpetNode):
     DEFAULT_INDEX = " ".join([Key.ProblemName, Key.LogFileName])
     DEFAULT_INDEXSPLIT= -1
     ALLTOGETHER = "_alltogether_"
+    countercolumns = ['_time_', '_limit_', '_fail_', '_abort_', '_solved_', '_unkn_', '_count_']
+    """ columns that count the status of every problem, see calculateNeededData() """
+    AUTOINDEXKEYS = [Key.ProblemName, Key.Solver, Key.Settings, Key.Version, Key.LogFileName]
+    """ data keys from which an automatic index is generated """
+    NEEDEDKEYS = [Key.ProblemStatus, Key.SolvingTime, Key.TimeLimit, Key.ProblemName]
+    """ data keys that every evaluation requires """
 
     editableAttributes = ["groupkey", "defaultgroup", "evaluateoptauto", "sortlevel", "comparecolformat", "index", "indexsplit"]
     attributes2Options = {"evaluateoptauto":[True, False], "sortlevel":[0, 1]}
@@ -750,7 +771,7 @@ class IPETEvaluation(IpetNode):
             # look if a comparison with the default group should be made
             if col.getTransLevel() == 0 and col.getCompareMethod() is not None:
 
-                grouped = df.groupby(self.getColIndex())[col.getName()]
+                grouped = df.groupby(self.getColIndex(), observed = True)[col.getName()]
                 compcol = dict(list(grouped))[self.getDefaultgroup()]
 
                 comparecolname = col.getCompareColName()
@@ -814,7 +835,7 @@ class IPETEvaluation(IpetNode):
                     raise e
 
         # concatenate level one columns into a new data frame and treat them as the altogether setting
-        newcols = [Key.ProblemStatus, Key.SolvingTime, Key.TimeLimit, Key.ProblemName]
+        newcols = list(IPETEvaluation.NEEDEDKEYS)
 
         for x in self.index.getTuple():
             if x not in newcols:
@@ -876,6 +897,108 @@ class IPETEvaluation(IpetNode):
                 adj.setdefault(key, set()).update(val)
         return adj
     
+    def getRequiredKeys(self, datakeys : list) -> set:
+        """ Compute the data keys that this evaluation reads from the data of an experiment.
+
+        The required data keys are the dependencies of the active columns, the data keys of the filters
+        of the active filter groups, the index and group keys, and the data keys that every evaluation needs.
+
+        Parameters
+        ----------
+        datakeys
+            The available data keys, which are matched against the regular expressions of the columns.
+
+        Returns
+        -------
+        set
+            The set of required data keys, which may contain names that are not among the available data keys.
+        """
+        required = set(IPETEvaluation.NEEDEDKEYS)
+        required.add(self.groupkey)
+        if self.autoIndex:
+            required.update(IPETEvaluation.AUTOINDEXKEYS)
+        else:
+            required.update(self.index.getTuple())
+
+        for key, dependencies in self.getDependencies(self.getActiveColumns()).items():
+            required.add(key)
+            required.update(dependencies)
+
+        for fg in self.getActiveFilterGroups():
+            for filter_ in fg.filters:
+                for dep in (filter_.getDependency(1), filter_.getDependency(2), filter_.datakey):
+                    if dep is not None:
+                        required.add(dep)
+
+        regexes = [regex for col in self.getActiveColumns() for regex in col.getRegexes()]
+        for datakey in datakeys:
+            if any(re.search(regex, datakey) for regex in regexes):
+                required.add(datakey)
+        return required
+
+    def getPushdownFilter(self, exp : Experiment):
+        """ Compute a row filter that removes rows that cannot appear in any active filter group.
+
+        The filters of the active filter groups that only use data keys of the experiment, see IPETFilter.isPushable(),
+        are evaluated on a data frame with only their data keys and the index keys. Rows whose row index belongs to
+        a group that passes no active filter group are dropped.
+
+        Parameters
+        ----------
+        exp
+            an experiment instance for which data has already been collected
+
+        Returns
+        -------
+        function or None
+            A function that maps a data frame to a boolean series of the rows to keep, see Experiment.getJoinedData(),
+            or None, if every row can appear in a filter group or the index is not known before the data is loaded.
+        """
+        activefiltergroups = self.getActiveFilterGroups()
+        if self.autoIndex or len(activefiltergroups) == 0:
+            return None
+
+        computedkeys = set(self.getDependencies(self.getActiveColumns()).keys()) | set(self.countercolumns)
+        indexkeys = list(self.index.getTuple())
+        rowindex = self.getRowIndex()
+        filterkeys = set(indexkeys)
+        for fg in activefiltergroups:
+            for filter_ in fg.getActiveFilters():
+                if filter_.isPushable(computedkeys):
+                    filterkeys.update(dep for dep in (filter_.getDependency(1), filter_.getDependency(2), filter_.datakey) if dep is not None)
+
+        data = exp.getJoinedData(filterkeys)
+        if any(key not in data.columns for key in indexkeys):
+            return None
+        data = data.dropna(subset = indexkeys)
+        if data.duplicated(subset = indexkeys).any():
+            # filter groups see the data after the reduction by index, which cannot be anticipated row by row
+            logging.debug("Index {} is not unique, skipping filter pushdown".format(indexkeys))
+            return None
+
+        sizes = data.groupby([data[key] for key in rowindex], observed = True).size()
+        if len(sizes) == 0:
+            return None
+        instancecount = sizes.max()
+        passing = pd.Series(False, index = sizes.index)
+        for fg in activefiltergroups:
+            passing = passing | fg.getPushdownResult(data, rowindex, instancecount, computedkeys)
+        if passing.all():
+            return None
+        if any(fg.filtertype == "intersection" for fg in activefiltergroups) and not (sizes[passing] == instancecount).any():
+            # keep one group of the highest number of rows, such that intersection filter groups see the same instance count
+            passing[(sizes == instancecount).idxmax()] = True
+
+        keep = sizes.index[passing.to_numpy()]
+        logging.info("Filter pushdown keeps {} of {} groups".format(len(keep), len(sizes)))
+        def rowfilter(df):
+            if any(key not in df.columns for key in rowindex):
+                return pd.Series(False, index = df.index)
+            if len(rowindex) == 1:
+                return df[rowindex[0]].isin(keep)
+            return pd.Series(pd.MultiIndex.from_frame(df[rowindex]).isin(keep), index = df.index)
+        return rowfilter
+
     def calculateNeededData(self, df : DataFrame) -> DataFrame:
         """ Add the status columns.
 
@@ -964,7 +1087,7 @@ class IPETEvaluation(IpetNode):
             The reduced DataFrame.
         """
         tmpcols = df.columns
-        grouped = df.groupby(by = self.index.getTuple())
+        grouped = df.groupby(by = list(self.index.getTuple()), observed = True)
         newcols = []
 
         reductionMap = {'_solved_' : numpy.all, '_count_' : numpy.max}
@@ -1125,7 +1248,7 @@ class IPETEvaluation(IpetNode):
         """
         calculate optimal auto settings instancewise
         """
-        grouped = df.groupby(level=0)
+        grouped = df.groupby(level=0, observed = True)
 
         #
         # every apply operation on the group element returns a pandas series
@@ -1248,7 +1371,7 @@ class IPETEvaluation(IpetNode):
             return
 
         lowerbound = 1 # 1 or bigger
-        possible_indices = [Key.ProblemName, Key.Solver, Key.Settings, Key.Version, Key.LogFileName]
+        possible_indices = IPETEvaluation.AUTOINDEXKEYS
         height = data.shape[0]
 
         # find the indices that are represented in the data with their numbers of unique values
@@ -1273,7 +1396,7 @@ class IPETEvaluation(IpetNode):
         self.set_index(" ".join([i[0] for i in [first] + second]))
         logging.info("Automatically set index to ({}, {})".format(self.getRowIndex(), self.getColIndex()))
         
-    def evaluate(self, exp : Experiment):
+    def evaluate(self, exp : Experiment, pushdown = False):
         """
         evaluate the data of an Experiment instance exp
 
@@ -1281,6 +1404,9 @@ class IPETEvaluation(IpetNode):
         ----------
         exp
             an experiment instance for which data has already been collected
+        pushdown
+            should filters of the active filter groups be applied while data is loaded? Rows that cannot appear in
+            any active filter group are then never loaded, and are also missing in the instance-wise table
 
         Returns
         -------
@@ -1291,8 +1417,11 @@ class IPETEvaluation(IpetNode):
         """
         self.checkMembers()
 
-        # data is concatenated along the rows and eventually extended by external data
-        data = exp.getJoinedData()
+        # data is concatenated along the rows and eventually extended by external data,
+        # the columns that this evaluation does not require are neither loaded nor concatenated
+        exp.updateDatakeys()
+        rowfilter = self.getPushdownFilter(exp) if pushdown else None
+        data = exp.getJoinedData(self.getRequiredKeys(exp.getDatakeys()), rowfilter)
         logging.debug("Result of getJoinedData:\n{}\n".format(data))
 
         self.tryGenerateIndexAndDefaultgroup(data)
@@ -1477,7 +1606,7 @@ class IPETEvaluation(IpetNode):
         if self.getColIndex() == []:
             return None
         # group the data by the groupkey
-        groupeddata = dict(list(df.groupby(self.getColIndex())))
+        groupeddata = dict(list(df.groupby(self.getColIndex(), observed = True)))
         stats = []
         names = []
         for col in self.getActiveColumns():
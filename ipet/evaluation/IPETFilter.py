@@ -311,6 +311,45 @@ class IPETFilter(IpetNode):
     def getNeededColumns(self, df):
         return [exp for exp in [self.expression1, self.expression2] if exp in df.columns]
 
+    def isPushable(self, computedkeys):
+        """Return True if this filter can be applied while data is loaded, i.e., if it does not use computed columns
+
+        Parameters
+        ----------
+        computedkeys : names of the columns that are computed during the evaluation
+        """
+        if self.operator in self.valueoperators:
+            return self.datakey not in computedkeys
+        return self.expression1 not in computedkeys and self.expression2 not in computedkeys
+
+    def getPushdownResult(self, df, groupkeys):
+        """Return a boolean series that states for every group of rows of df if the group passes this filter
+
+        The result matches filterDataFrame() applied to every group, but is computed for all groups at once.
+
+        Parameters
+        ----------
+        df : data frame with the data keys of this filter
+        groupkeys : list of data keys by which rows are grouped
+        """
+        groupby = [df[key] for key in groupkeys]
+        if self.operator in self.valueoperators:
+            self.checkAndUpdateValueSet()
+            contained = df[self.datakey].isin(self.valueset).groupby(groupby, observed = True).any()
+            return contained if self.operator == "keep" else ~contained
+
+        x = self.evaluateValueDataFrame(df, self.expression1)
+        y = self.evaluateValueDataFrame(df, self.expression2)
+        x = x.iloc[:, 0] if isinstance(x, pd.DataFrame) else x
+        y = y.iloc[:, 0] if isinstance(y, pd.DataFrame) else y
+        booleanseries = self.comparison.compare(x, y)
+        if not isinstance(booleanseries, pd.Series):
+            booleanseries = pd.Series(bool(booleanseries), index = df.index)
+        grouped = booleanseries.groupby(groupby, observed = True)
+        if self.anytestrun == 'all':
+            return grouped.all()
+        return grouped.any()
+
     def evaluateValueDataFrame(self, df, value):
         if value in df.columns:
             return df[[value]]
@@ -428,7 +467,7 @@ class IPETFilterGroup(IpetNode):
         """
         filters a data frame object as the intersection of all values that match the criteria defined by the filters
         """
-        groups = df.groupby(index)
+        groups = df.groupby(index, observed = True)
         # first, get the highest number of problem occurrences. This number must be matched to keep the problem
         if self.filtertype == "intersection":
             instancecount = groups.apply(len).max()
@@ -447,6 +486,30 @@ class IPETFilterGroup(IpetNode):
 
         return True
 
+    def getPushdownResult(self, df, groupkeys, instancecount, computedkeys):
+        """
+        returns a boolean series that states for every group of rows of df if the group can pass this filter group
+
+        Filters that are not pushable, see IPETFilter.isPushable(), are assumed to pass, such that groups for which
+        the result is False never pass this filter group.
+
+        Parameters
+        ----------
+        df : data frame whose groups are evaluated
+        groupkeys : list of data keys by which rows are grouped
+        instancecount : the highest number of rows of a group, which every group must have for intersection filter groups
+        computedkeys : names of the columns that are computed during the evaluation
+        """
+        sizes = df.groupby([df[key] for key in groupkeys], observed = True).size()
+        if self.filtertype == "intersection":
+            result = sizes == instancecount
+        else:
+            result = sizes >= 1
+        for filter_ in self.getActiveFilters():
+            if filter_.isPushable(computedkeys):
+                result = result & filter_.getPushdownResult(df, groupkeys)
+        return result
+
     def getNeededColumns(self, df):
         needed = []
         for filter_ in self.filters:
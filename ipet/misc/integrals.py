@@ -45,11 +45,155 @@ def calcIntegralValue(thedatalist, pwlinear=False):
         gaps = gaps[:-1]
     return np.sum((times[1:] - times[:-1]) * gaps)
     
+def calcIntegralValues(times, values, offsets, pwlinear = False, horizon = None, hashorizon = None):
+    """
+    calculates the integral values of many piece-wise constant or piece-wise linear functions at once, see calcIntegralValue()
+
+    Parameters
+    ----------
+    times : numpy array
+        the concatenated x_i of all functions
+    values : numpy array
+        the concatenated f(x_i) of all functions
+    offsets : numpy array
+        the i-th function is the slice [offsets[i], offsets[i + 1]) of times and values, starting with offsets[0] = 0
+    pwlinear: optional : should the method treat the functions as piece-wise linear (True) or piece-wise constant
+        step-functions.
+    horizon : numpy array, optional
+        the end of the integration range of every function. A function is cut off at its horizon, or its last value
+        is continued until its horizon
+    hashorizon : numpy array, optional
+        boolean mask of the functions that have a horizon, the others are integrated over the range of their x_i
+
+    Returns
+    -------
+    numpy array
+        the integral value of every function, which is 0 for functions with less than two points and no horizon
+    """
+    return calcLayoutIntegralValues(getIntegralLayout(times, offsets, horizon, hashorizon), values, pwlinear)
+
+def getIntegralLayout(times, offsets, horizon = None, hashorizon = None):
+    """
+    precomputes the parts of calcIntegralValues() that only depend on the times and horizons of the functions
+
+    The layout can be shared by functions with the same times and different values, see calcLayoutIntegralValues().
+
+    Returns
+    -------
+    tuple
+        the number of functions, the positions of the pieces that contribute to the integrals, their functions and
+        widths, the positions of the pieces that are cut off at a horizon among them and their fractions before the
+        horizon, and the functions that are continued until their horizons, the positions of their last points, and
+        the lengths of their continuations
+    """
+    nfunctions = len(offsets) - 1
+    functions = numpy.repeat(numpy.arange(nfunctions), numpy.diff(offsets))
+    # the term of the last point of a function reaches into the next function and is dropped by the segmented sum
+    isinner = functions[1:] == functions[:-1]
+    if horizon is not None:
+        hashorizon = numpy.asarray(hashorizon, dtype = numpy.bool_)
+        ends = numpy.where(hashorizon, numpy.asarray(horizon, dtype = numpy.float64), numpy.inf)[functions]
+        clippedtimes = numpy.minimum(times, ends)
+        widths = clippedtimes[1:] - clippedtimes[:-1]
+        # pieces that start at or after the horizon do not contribute
+        isinner &= times[:-1] < ends[:-1]
+        pieces = numpy.flatnonzero(isinner)
+        cutpieces = numpy.flatnonzero(times[1:][pieces] > ends[:-1][pieces])
+        iscut = pieces[cutpieces]
+        with numpy.errstate(invalid = "ignore", over = "ignore"):
+            fractions = (ends[iscut] - times[iscut]) / (times[iscut + 1] - times[iscut])
+
+        # the last value of a function is valid until its horizon
+        iscontinued = numpy.flatnonzero(hashorizon & (offsets[1:] > offsets[:-1]))
+        last = offsets[1:][iscontinued] - 1
+        extensions = numpy.asarray(horizon, dtype = numpy.float64)[iscontinued] - times[last]
+        ispositive = extensions > 0
+        continued = (iscontinued[ispositive], last[ispositive], extensions[ispositive])
+    else:
+        widths = times[1:] - times[:-1]
+        pieces = numpy.flatnonzero(isinner)
+        cutpieces = numpy.empty(0, dtype = numpy.int64)
+        fractions = numpy.empty(0, dtype = numpy.float64)
+        continued = None
+
+    return nfunctions, pieces, functions[pieces], widths[pieces], cutpieces, fractions, continued
+
+def calcLayoutIntegralValues(layout, values, pwlinear = False):
+    """
+    calculates the integral values of many functions whose times and horizons are described by a layout, see getIntegralLayout()
+    """
+    nfunctions, pieces, piecefunctions, widths, cutpieces, fractions, continued = layout
+    with numpy.errstate(invalid = "ignore", over = "ignore"):
+        if pwlinear:
+            heights = (values[pieces + 1] + values[pieces]) / 2
+            # a linear piece that is cut off is averaged between its first value and its value at the horizon
+            iscut = pieces[cutpieces]
+            heights[cutpieces] = values[iscut] + (values[iscut + 1] - values[iscut]) * fractions / 2
+        else:
+            heights = values[pieces]
+        terms = widths * heights
+
+    integrals = numpy.bincount(piecefunctions, weights = terms, minlength = nfunctions)
+    # the segmented sum of no terms at all has an integer type
+    integrals = integrals.astype(numpy.float64, copy = False)
+    if continued is not None:
+        iscontinued, last, extensions = continued
+        integrals[iscontinued] += extensions * values[last]
+    return integrals
+
+def getGapArrays(values, referencevalues, hasreferencevalues, cutoffgap = DEFAULT_CUTOFFGAP):
+    """
+    vectorized version of misc.getGap(value, referencevalue, True) with one reference value per value, capped at cutoffgap
+
+    Parameters
+    ----------
+    values : numpy array
+        the values, e.g., primal bounds
+    referencevalues : numpy array
+        the reference values, e.g., the optimal objective values
+    hasreferencevalues : numpy array
+        boolean mask of the reference values that are not None
+    cutoffgap : float
+        gaps are capped at this value. Infinite and undefined gaps, as well as gaps to missing or infinite
+        reference values, are replaced by the cutoff gap
+    """
+    values = numpy.asarray(values, dtype = numpy.float64)
+    referencevalues = numpy.asarray(referencevalues, dtype = numpy.float64)
+    absvalues = numpy.abs(values)
+    absreferences = numpy.abs(referencevalues)
+    # like the builtin max(), ignore an undefined reference value, but not undefined values
+    maximum = numpy.where(numpy.isnan(absreferences), absvalues, numpy.maximum(absvalues, absreferences))
+    with numpy.errstate(divide = "ignore", invalid = "ignore"):
+        gaps = numpy.abs(values - referencevalues) / maximum * 100
+    gaps[maximum <= 10e-9] = 0.0
+    gaps[values == misc.FLOAT_INFINITY] = misc.FLOAT_INFINITY
+    # undefined gaps are not smaller than the cutoff gap
+    gaps = numpy.where(gaps < cutoffgap, gaps, cutoffgap)
+    gaps[~numpy.asarray(hasreferencevalues, dtype = numpy.bool_) | (referencevalues == misc.FLOAT_INFINITY)] = cutoffgap
+    return gaps
+
+def getGaps(values, referencevalue, cutoffgap = DEFAULT_CUTOFFGAP):
+    """
+    vectorized version of misc.getGap(value, referencevalue, True) for an array of values, capped at cutoffgap
+
+    Parameters
+    ----------
+    values : numpy array
+        the values, e.g., primal bounds
+    referencevalue : float or None
+        the reference value, e.g., the optimal objective value
+    cutoffgap : float
+        gaps are capped at this value. Infinite and undefined gaps are replaced by the cutoff gap
+    """
+    nvalues = len(values)
+    return getGapArrays(values, numpy.full(nvalues, numpy.nan if referencevalue is None else referencevalue),
+                        numpy.full(nvalues, referencevalue is not None), cutoffgap)
+
 def getProcessPlotData(testrun, probid, normalize = True, access = "id", **kw):
     """
     get process plot data for a selected history (X_i,Y_i)
     
-    returns a list of tuples, where the second value of the history (Y's) are mapped via a gap function
+    returns a tuple of numpy arrays (X, Y), where the second value of the history (Y's) are mapped via a gap function
 
     Parameters
     ----------
@@ -76,43 +220,158 @@ def getProcessPlotData(testrun, probid, normalize = True, access = "id", **kw):
     
     if xlim is None and xaftersolve is None:
         return None
+
+    # histories are (times, values) views into the contiguous arrays of a history column
     if history is None:
-        history = []
-    
-    try:
-        lastbound = history[-1][1]
-    except:
-        lastbound = misc.FLOAT_INFINITY
+        times = values = numpy.empty(0, dtype = numpy.float64)
+    else:
+        times, values = history
 
-    if len(history) > 0:
-        x, y = list(zip(*history))
-        x = list(x)
-        y = list(y)
+    if len(times) > 0:
+        lastbound = values[-1]
     else:
-        x = []
-        y = []
+        lastbound = misc.FLOAT_INFINITY
 
+    parts = [(times, values)]
     if normalize:
-        x.insert(0, 0.0)
-        y.insert(0, misc.FLOAT_INFINITY)
+        parts.insert(0, ([0.0], [misc.FLOAT_INFINITY]))
+
+    if xaftersolve is not None:
+        if len(times) > 0:
+            xaftersolve = max(xaftersolve, times[-1])
+        parts.append(([xaftersolve], [lastbound]))
 
-    if xaftersolve is not None and lastbound is not None:
-        if len(history) > 0:
-            xaftersolve = max(xaftersolve, history[-1][0])
-        x.append(xaftersolve)
-        y.append(lastbound)
+    x = numpy.concatenate([part[0] for part in parts]).astype(numpy.float64)
+    y = numpy.concatenate([part[1] for part in parts]).astype(numpy.float64)
 
     # depending on the normalization parameter, the normfunction used is either the CPlex gap, or the identity  
     if normalize:
-        normfunction = lambda z : min(cutoffgap, misc.getGap(z, optimum, True))
-    else:
-        normfunction = lambda z : z
-
-    x = numpy.array(x)
-    y = numpy.array(list(map(normfunction, y)))
+        y = getGaps(y, optimum, cutoffgap)
 
     return x, y
 
+def getProcessPlotArrays(times, values, offsets, xaftersolve, hasxaftersolve, optimum, hasoptimum, normalize = True,
+                         cutoffgap = DEFAULT_CUTOFFGAP):
+    """
+    batch version of getProcessPlotData() for the histories of many problems
+
+    Parameters
+    ----------
+    times : numpy array
+        the concatenated times of the histories of all problems
+    values : numpy array
+        the concatenated values of the histories of all problems
+    offsets : numpy array
+        the history of the i-th problem is the slice [offsets[i], offsets[i + 1]) of times and values, starting
+        with offsets[0] = 0, see ipet.ColumnBuilder.HistoryColumn.getArrays()
+    xaftersolve : numpy array
+        the solving time of every problem
+    hasxaftersolve : numpy array
+        boolean mask of the problems whose solving time is not None
+    optimum : numpy array
+        the optimal objective value of every problem
+    hasoptimum : numpy array
+        boolean mask of the problems whose optimal objective value is not None
+    normalize : bool
+        should the values be mapped to gaps to the optimal objective value?
+    cutoffgap : float
+        gaps are capped at this value, see getGapArrays()
+
+    Returns
+    -------
+    tuple
+        arrays x, y, and plotoffsets, where the process plot data of the i-th problem is the slice
+        [plotoffsets[i], plotoffsets[i + 1]) of x and y
+    """
+    nproblems = len(offsets) - 1
+    lengths = numpy.diff(offsets)
+    hasxaftersolve = numpy.asarray(hasxaftersolve, dtype = numpy.bool_)
+    first = 1 if normalize else 0
+    plotoffsets = numpy.zeros(nproblems + 1, dtype = numpy.int64)
+    numpy.cumsum(lengths + first + hasxaftersolve, out = plotoffsets[1:])
+
+    x = numpy.empty(plotoffsets[-1], dtype = numpy.float64)
+    y = numpy.empty(plotoffsets[-1], dtype = numpy.float64)
+    positions = numpy.repeat(plotoffsets[:-1] + first - offsets[:-1], lengths) + numpy.arange(offsets[-1])
+    x[positions] = times[:offsets[-1]]
+    y[positions] = values[:offsets[-1]]
+    if normalize:
+        x[plotoffsets[:-1]] = 0.0
+        y[plotoffsets[:-1]] = misc.FLOAT_INFINITY
+
+    # the last bound is valid until the solving time, or the last time of the history, if it is later
+    hashistory = lengths > 0
+    lasttimes = numpy.full(nproblems, numpy.nan)
+    lastbounds = numpy.full(nproblems, misc.FLOAT_INFINITY)
+    lasttimes[hashistory] = times[offsets[1:][hashistory] - 1]
+    lastbounds[hashistory] = values[offsets[1:][hashistory] - 1]
+    xaftersolve = numpy.asarray(xaftersolve, dtype = numpy.float64)
+    xaftersolve = numpy.where(lasttimes > xaftersolve, lasttimes, xaftersolve)
+    x[plotoffsets[1:][hasxaftersolve] - 1] = xaftersolve[hasxaftersolve]
+    y[plotoffsets[1:][hasxaftersolve] - 1] = lastbounds[hasxaftersolve]
+
+    # depending on the normalization parameter, the normfunction used is either the CPlex gap, or the identity
+    if normalize:
+        plotlengths = numpy.diff(plotoffsets)
+        y = getGapArrays(y, numpy.repeat(numpy.asarray(optimum, dtype = numpy.float64), plotlengths),
+                         numpy.repeat(numpy.asarray(hasoptimum, dtype = numpy.bool_), plotlengths), cutoffgap)
+
+    return x, y, plotoffsets
+
+def getIntegralSweep(times, values, offsets, xaftersolve, hasxaftersolve, optimum, hasoptimum, horizons = [None],
+                     cutoffgaps = [DEFAULT_CUTOFFGAP], normalizations = [True], pwlinear = False):
+    """
+    calculates a grid of integral variants of many problems, which share a single assembly of their process plots
+
+    The process plots and the uncapped gaps are computed once for all variants, see getProcessPlotArrays(), and so
+    are the pieces of the process plots up to every horizon, see getIntegralLayout(). Every variant then only caps
+    the gaps at its cutoff gap and sums up the pieces, see calcLayoutIntegralValues().
+
+    Parameters
+    ----------
+    times, values, offsets, xaftersolve, hasxaftersolve, optimum, hasoptimum
+        the concatenated histories and the data of all problems, see getProcessPlotArrays()
+    horizons : list
+        the time horizons, each either a pair of arrays of the horizon of every problem and the mask of the problems
+        that have a horizon, or None to integrate up to the solving time like getProcessPlotData()
+    cutoffgaps : list
+        the cutoff gaps of the normalized variants
+    normalizations : list
+        True for the variants of the gaps to the optimal objective value, False for the variants of the raw values
+    pwlinear : bool
+        should the process plots be treated as piece-wise linear (True) or piece-wise constant step-functions?
+
+    Returns
+    -------
+    list
+        tuples (normalize, cutoffgap, horizon, integrals) of all variants, where horizon is the position in horizons,
+        integrals is the array of the integral values of all problems, and cutoffgap is None for raw variants
+    """
+    x, rawvalues, rawoffsets = getProcessPlotArrays(times, values, offsets, xaftersolve, hasxaftersolve, optimum,
+                                                    hasoptimum, normalize = False)
+    variants = []
+    for normalize in normalizations:
+        if normalize:
+            # the normalized process plots start with an infinite gap at time 0
+            plotx = numpy.insert(x, rawoffsets[:-1], 0.0)
+            plotoffsets = rawoffsets + numpy.arange(len(rawoffsets))
+            plotlengths = numpy.diff(plotoffsets)
+            gaps = getGapArrays(numpy.insert(rawvalues, rawoffsets[:-1], misc.FLOAT_INFINITY),
+                                numpy.repeat(numpy.asarray(optimum, dtype = numpy.float64), plotlengths),
+                                numpy.repeat(numpy.asarray(hasoptimum, dtype = numpy.bool_), plotlengths), numpy.inf)
+            # capping the uncapped gaps yields the same gaps as getGapArrays() with the cutoff gap
+            curves = [(cutoffgap, numpy.minimum(gaps, cutoffgap)) for cutoffgap in cutoffgaps]
+        else:
+            plotx, plotoffsets = x, rawoffsets
+            curves = [(None, rawvalues)]
+
+        layouts = [getIntegralLayout(plotx, plotoffsets) if horizon is None else getIntegralLayout(plotx, plotoffsets, *horizon)
+                   for horizon in horizons]
+        for cutoffgap, y in curves:
+            for position, layout in enumerate(layouts):
+                variants.append((normalize, cutoffgap, position, calcLayoutIntegralValues(layout, y, pwlinear)))
+    return variants
+
 def getMeanIntegral(testrun, problemlist, access = "id", **kw):
     """
     returns a numpy array that represents the mean integral over the selected problem list.
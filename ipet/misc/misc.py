@@ -15,6 +15,11 @@ import xml.etree.ElementTree as ElementTree
 import numpy as np
 import datetime
 import os
+import gzip
+import bz2
+import lzma
+import pickle
+import struct
 from ipet import Key
 """
    Various methods for evaluation such as gap calculation, geometric means etc. and some printing methods
@@ -28,6 +33,14 @@ numericExpressionOrInf = re.compile("([+\-]*[\d]+[.\d]*(?:e[+-])?-*[\d]*[kMG]{0,
 tablenumericExpression = re.compile("([+\-]*[\d]+[.\d]*(?:e[+-])?-*[\d]*[kMG]{0,1}|[\-]+|cutoff)")
 wordExpression = re.compile(r'[^\s]+')
 useStringSplit = False
+compressedfileopeners = {".gz" : gzip.open, ".bz2" : bz2.open, ".xz" : lzma.open}
+""" functions to open compressed files by their compression extension """
+compressionlevelarguments = {".gz" : "compresslevel", ".bz2" : "compresslevel", ".xz" : "preset"}
+""" names of the compression level arguments of the functions in compressedfileopeners """
+BUFFER_EXTENSION = ".buffers"
+""" extension of the sidecar files that store the out-of-band buffers of pickles, see dumpPickle() """
+BUFFER_MAGIC = b"IPETBUF\x00"
+BUFFER_ALIGNMENT = 64
 
 def sortingKeyContext(context):
     """
@@ -38,13 +51,273 @@ def sortingKeyContext(context):
     except IndexError:
         raise IndexError("Unknown context %d" % context)
 
+def isCompressed(filename):
+    """
+    is the file compressed, i.e., does it end with one of the extensions of compressedfileopeners?
+    """
+    return os.path.splitext(filename)[1] in compressedfileopeners
+
+def splitFilename(filename):
+    """
+    split a file name into its root and its extension, ignoring a compression extension
+
+    'check.out.gz' and 'check.out' are both split into 'check' and '.out'
+    """
+    if isCompressed(filename):
+        filename = os.path.splitext(filename)[0]
+    return os.path.splitext(filename)
+
 def filenameGetContext(filename):
     """
-    get filecontext via fileextension
+    get filecontext via fileextension, compressed files have the context of their uncompressed counterparts
     """
-    extension = os.path.splitext(os.path.basename(filename))[1]
+    extension = splitFilename(os.path.basename(filename))[1]
     return Key.fileextension2context[extension]
 
+def openFile(filename, mode = "r", compresslevel = None):
+    """
+    open a file, compressed files are decompressed while they are read and compressed while they are written
+
+    Parameters
+    ----------
+    filename
+        the name of the file, possibly with a compression extension
+    mode
+        the mode for opening the file, text mode by default
+    compresslevel
+        the compression level for writing a compressed file, i.e., 1 (fastest) to 9 (smallest) for gzip and bzip2,
+        and the preset 0 to 9 for xz. If None, the default level of the compression format is used
+    """
+    extension = os.path.splitext(filename)[1]
+    opener = compressedfileopeners.get(extension)
+    if opener is None:
+        return open(filename, mode)
+    # the openers of compressed files use binary mode by default
+    if "b" not in mode and "t" not in mode:
+        mode = mode + "t"
+    if compresslevel is not None and "r" not in mode:
+        return opener(filename, mode, **{compressionlevelarguments[extension] : compresslevel})
+    return opener(filename, mode)
+
+def getTemporaryFileName(filename):
+    """
+    get the name of a temporary file for writing a file atomically, which keeps the compression extension of the file
+    """
+    root, extension = os.path.splitext(filename)
+    if extension not in compressedfileopeners:
+        root, extension = filename, ""
+    return "%s.%d.tmp%s" % (root, os.getpid(), extension)
+
+def getBufferFileName(filename):
+    """
+    get the name of the sidecar file with the out-of-band buffers of a pickle file
+    """
+    return filename + BUFFER_EXTENSION
+
+def replaceFile(tmpfilename, filename):
+    """
+    replace a file by a temporary file, or remove the file if the temporary file does not exist
+    """
+    if tmpfilename is not None and os.path.exists(tmpfilename):
+        os.replace(tmpfilename, filename)
+    elif os.path.exists(filename):
+        os.remove(filename)
+
+def dumpPickle(obj, filename, outofband = True, compresslevel = None):
+    """
+    pickle an object into a file, which is compressed if its name has a compression extension
+
+    Parameters
+    ----------
+    obj
+        the object to pickle
+    filename
+        the name of the file
+    outofband
+        should large buffers, e.g., of numpy arrays and pandas data frames, be stored out-of-band? The object is
+        then pickled with protocol 5, and its buffers are written into the sidecar file getBufferFileName(filename),
+        from which loadPickle() can use them without copying. Compressed files always store their buffers in-band.
+    compresslevel
+        the compression level of a compressed file, see openFile()
+    """
+    outofband = outofband and not isCompressed(filename)
+    buffers = []
+    tmpfilename = getTemporaryFileName(filename)
+    tmpbufferfilename = getBufferFileName(tmpfilename) if outofband else None
+    try:
+        with openFile(tmpfilename, "wb", compresslevel) as f:
+            if outofband:
+                pickle.dump(obj, f, protocol = 5, buffer_callback = buffers.append)
+            else:
+                pickle.dump(obj, f, protocol = pickle.HIGHEST_PROTOCOL)
+
+        if outofband and len(buffers) > 0:
+            rawbuffers = [buffer.raw() for buffer in buffers]
+            offset = len(BUFFER_MAGIC) + 8 + 16 * len(rawbuffers)
+            table = []
+            for raw in rawbuffers:
+                offset += -offset % BUFFER_ALIGNMENT
+                table.append((offset, raw.nbytes))
+                offset += raw.nbytes
+            with open(tmpbufferfilename, "wb") as f:
+                f.write(BUFFER_MAGIC)
+                f.write(struct.pack("<Q", len(table)))
+                for entry in table:
+                    f.write(struct.pack("<QQ", *entry))
+                for (offset, _), raw in zip(table, rawbuffers):
+                    f.write(b"\x00" * (offset - f.tell()))
+                    f.write(raw)
+
+        # the sidecar file is replaced first, an outdated sidecar file of an in-band pickle is removed
+        replaceFile(tmpbufferfilename, getBufferFileName(filename))
+        os.replace(tmpfilename, filename)
+    finally:
+        for name in (tmpfilename, tmpbufferfilename):
+            if name is not None and os.path.exists(name):
+                os.remove(name)
+
+def loadPickle(filename, memorymap = False):
+    """
+    load a pickled object from a file, including the out-of-band buffers of its sidecar file, see dumpPickle()
+
+    Pickles of all protocols can be loaded, e.g., files that were written with protocol 2 by earlier versions.
+
+    Parameters
+    ----------
+    filename
+        the name of the file
+    memorymap
+        should the out-of-band buffers be memory-mapped instead of read? Arrays of memory-mapped buffers
+        are read-only. Otherwise, the sidecar file is read at once, and the arrays share its memory.
+    """
+    buffers = None
+    bufferfilename = getBufferFileName(filename)
+    if not isCompressed(filename) and os.path.exists(bufferfilename):
+        if memorymap:
+            content = np.memmap(bufferfilename, dtype = np.uint8, mode = "r")
+        else:
+            with open(bufferfilename, "rb") as f:
+                content = bytearray(f.read())
+        content = memoryview(content).cast("B")
+        if bytes(content[:len(BUFFER_MAGIC)]) != BUFFER_MAGIC:
+            raise pickle.UnpicklingError("%s is not a buffer file" % bufferfilename)
+        nbuffers, = struct.unpack_from("<Q", content, len(BUFFER_MAGIC))
+        table = struct.unpack_from("<%dQ" % (2 * nbuffers), content, len(BUFFER_MAGIC) + 8)
+        buffers = [content[offset:offset + nbytes] for offset, nbytes in zip(table[::2], table[1::2])]
+
+    with openFile(filename, "rb") as f:
+        return pickle.load(f, buffers = buffers)
+
+class LogLine(str):
+    """ A line of solver output that caches its tokenizations.
+
+    Log lines are passed to the solver and to many readers. Each of the token lists is computed
+    at most once, when it is requested first, see getWords(), getNumbers(), and getTableNumbers().
+    The returned lists are shared between all consumers of the line and must not be modified.
+    """
+
+    _words = None
+    _numbermatches = None
+    _numbers = None
+    _tablenumbers = None
+
+    def getWords(self) -> list:
+        """ Return the whitespace separated words of this line.
+        """
+        if self._words is None:
+            self._words = self.split()
+        return self._words
+
+    def getNumberMatches(self) -> list:
+        """ Return the match objects of all numbers in this line.
+        """
+        if self._numbermatches is None:
+            self._numbermatches = list(numericExpression.finditer(self))
+        return self._numbermatches
+
+    def getNumbers(self) -> list:
+        """ Return all numbers in this line as strings.
+        """
+        if self._numbers is None:
+            self._numbers = [match.group() for match in self.getNumberMatches()]
+        return self._numbers
+
+    def getTableNumbers(self) -> list:
+        """ Return all numbers in this line as strings, including 'cutoff' entries of a table.
+        """
+        if self._tablenumbers is None:
+            self._tablenumbers = tablenumericExpression.findall(self)
+        return self._tablenumbers
+
+    def __reduce__(self):
+        # the token caches are never stored, a pickled log line is an ordinary string
+        return (str, (str(self),))
+
+def getWords(line : str) -> list:
+    """ Get the whitespace separated words of a line.
+
+    Parameters
+    ----------
+    line
+        The string from which the words should be extracted; the result is cached for a LogLine
+        and must not be modified.
+
+    Returns
+    -------
+    list
+        The words of line.
+    """
+    if isinstance(line, LogLine):
+        return line.getWords()
+    return line.split()
+
+def getNumbers(line : str, start : int = 0, end : int = None) -> list:
+    """ Get the numbers of a line.
+
+    Parameters
+    ----------
+    line
+        The string from which the numbers should be extracted; the result is cached for a LogLine
+        and must not be modified.
+    start
+        The position in line at which the search for numbers starts.
+    end
+        The position in line at which the search for numbers ends, or None, to search until the end of line.
+
+    Returns
+    -------
+    list
+        All numbers between start and end as strings.
+    """
+    if end is None:
+        end = len(line)
+    if isinstance(line, LogLine):
+        if start == 0 and end == len(line):
+            return line.getNumbers()
+        matches = line.getNumberMatches()
+        # the cached matches can be reused unless one of them is cut by the range
+        if not any(match.start() < start < match.end() or match.start() < end < match.end() for match in matches):
+            return [match.group() for match in matches if match.start() >= start and match.end() <= end]
+    return numericExpression.findall(line[start:end])
+
+def getTableNumbers(line : str) -> list:
+    """ Get the numbers of a table line, including 'cutoff' entries.
+
+    Parameters
+    ----------
+    line
+        The string from which the numbers should be extracted; the result is cached for a LogLine
+        and must not be modified.
+
+    Returns
+    -------
+    list
+        All numbers of line as strings.
+    """
+    if isinstance(line, LogLine):
+        return line.getTableNumbers()
+    return tablenumericExpression.findall(line)
+
 def getWordAtIndex(line : str, index : int) -> str:
     """ Get the i'th word in a space separated string of words.
     
@@ -60,9 +333,9 @@ def getWordAtIndex(line : str, index : int) -> str:
     str
         The index'th word from line.
     """
-    if index < 0 or useStringSplit:
+    if index < 0 or useStringSplit or isinstance(line, LogLine):
         try:
-            return line.split()[index]
+            return getWords(line)[index]
         except:
             return None
     else:
@@ -87,8 +360,8 @@ def getNumberAtIndex(line : str, index : int) -> str:
         The index'th number from line.
     """
     try:
-        if index < 0:
-            return numericExpression.findall(line)[index]
+        if index < 0 or isinstance(line, LogLine):
+            return getNumbers(line)[index]
         else:
             for idx, word in enumerate(numericExpression.finditer(line)):
                 if idx == index:
@@ -98,6 +371,49 @@ def getNumberAtIndex(line : str, index : int) -> str:
     except IndexError:
         return None
 
+def getLiteralPrefix(pattern : str, anchored : bool = False) -> str:
+    """ Get the literal string that every line matching a regular expression pattern starts with.
+
+    Parameters
+    ----------
+    pattern
+        A regular expression pattern.
+    anchored
+        Is the pattern used with match() instead of search(), so that it is anchored
+        at the start of a line even without a leading '^'?
+
+    Returns
+    -------
+    str
+        The literal prefix of all matching lines, or None, if the pattern is not anchored,
+        has alternatives, or does not start with a literal.
+    """
+    if pattern.startswith("^"):
+        pattern = pattern[1:]
+    elif not anchored:
+        return None
+    if "|" in pattern:
+        return None
+
+    prefix = []
+    idx = 0
+    while idx < len(pattern):
+        char = pattern[idx]
+        if char == "\\":
+            if idx + 1 == len(pattern) or pattern[idx + 1].isalnum():
+                break
+            char = pattern[idx + 1]
+            idx += 1
+        elif char in ".^$*+?{}[]()":
+            # a quantifier makes the preceding literal optional
+            if char in "*?{" and prefix:
+                prefix.pop()
+            break
+        prefix.append(char)
+        idx += 1
+
+    return "".join(prefix) or None
+
 def getSoluFileProbName(probname):
     return probname.split('.')[0]
 
@@ -0,0 +1,298 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2016 Zuse Institute Berlin, www.zib.de
+
+Permissions are granted as stated in the license file you have obtained
+with this software. If you find the library useful for your purpose,
+please refer to README.md for how to cite IPET.
+
+@author: Gregor Hendel
+"""
+import os
+import sys
+import pickle
+import hashlib
+import logging
+from ipet.misc import misc
+from ipet.version import __version__
+
+class ParseCache:
+    """
+    persistent cache of parsed test runs
+
+    A test run is cached under a key that combines the fingerprints of all its files, i.e., their absolute paths,
+    sizes, and modification times, with the fingerprint of the reader manager that parsed it and of the sources of
+    the ipet package. Changing a log file, the reader configuration, or the parsing code therefore leads to a cache miss.
+    The content hashes of the files are recorded together with every entry, right after the files were parsed.
+    On a hit, the files are hashed again and compared with the recorded hashes to detect modifications that keep
+    the size and modification time of a file.
+
+    The cache stores test runs right after their files were read, such that the data of solu files is still joined,
+    and gaps, integrals, and problem statuses are still calculated by the experiment.
+
+    The cache also stores tables that were parsed from files that all test runs share, such as solu files.
+    A table is cached under the content hash of its file, such that a copy of a solu file is not parsed again, either.
+
+    The cache holds at most maxsize bytes. The least recently used entries are removed first.
+    """
+    DEFAULT_CACHEDIR = os.path.expanduser("~/.ipet/cache")
+    DEFAULT_MAXSIZE = 1 << 30
+    FILE_EXTENSION = ".trn"
+    TABLE_EXTENSION = ".tbl"
+    HASH_EXTENSION = ".sha1"
+    HASH_BLOCKSIZE = 1 << 20
+    FORMAT_VERSION = 2
+    """ version of the layout of cache entries, entries of other versions are never read """
+
+    sourcefingerprint = None
+
+    def __init__(self, cachedir = DEFAULT_CACHEDIR, maxsize = DEFAULT_MAXSIZE):
+        """
+        constructs a new parse cache
+
+        Parameters
+        ----------
+        cachedir : directory for the cached test runs, created on first use
+        maxsize : maximum total size of the cache entries in bytes
+        """
+        self.cachedir = cachedir
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def getFileFingerprint(self, filename):
+        """
+        returns a tuple of absolute path, size and modification time of a file
+        """
+        stat = os.stat(filename)
+        return (os.path.abspath(filename), stat.st_size, stat.st_mtime_ns)
+
+    def getContentHash(self, filename):
+        """
+        returns the SHA-1 hash of the content of a file
+        """
+        contenthash = hashlib.sha1()
+        with open(filename, "rb") as f:
+            for block in iter(lambda : f.read(ParseCache.HASH_BLOCKSIZE), b""):
+                contenthash.update(block)
+        return contenthash.hexdigest()
+
+    @classmethod
+    def getSourceFingerprint(cls):
+        """
+        returns a fingerprint of the format version of the cache and of the sources of all modules of the ipet package
+
+        The fingerprint covers the parsing code outside of the readers, e.g., the reader manager, the test runs and
+        their column builders, and the schema. It is computed once per process
+        """
+        if cls.sourcefingerprint is None:
+            fingerprint = hashlib.sha1()
+            fingerprint.update(repr((__version__, ParseCache.FORMAT_VERSION)).encode())
+            packagedir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            for dirpath, dirnames, filenames in sorted(os.walk(packagedir)):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if filename.endswith(".py"):
+                        fingerprint.update(os.path.relpath(os.path.join(dirpath, filename), packagedir).encode())
+                        with open(os.path.join(dirpath, filename), "rb") as f:
+                            fingerprint.update(f.read())
+            cls.sourcefingerprint = fingerprint.hexdigest()
+        return cls.sourcefingerprint
+
+    def getReaderFingerprint(self, readermanager):
+        """
+        returns a fingerprint of the readers and solvers of a reader manager and of the parsing code
+
+        The fingerprint covers the problem expressions, the names, classes and editable attributes of all readers,
+        the solvers, the source files of the modules that define them, and the sources of the ipet package,
+        see getSourceFingerprint().
+        """
+        fingerprint = hashlib.sha1()
+        fingerprint.update(self.getSourceFingerprint().encode())
+        fingerprint.update(repr((readermanager.problemexpression, readermanager.problemendexpression)).encode())
+
+        modules = set()
+        for reader in readermanager.getManageables(False):
+            fingerprint.update(repr((type(reader).__module__, type(reader).__qualname__, reader.getName(),
+                                     reader.isActive(), sorted(reader.attributesToStringDict().items()))).encode())
+            modules.add(type(reader).__module__)
+        for solver in readermanager.solvers:
+            fingerprint.update(repr((type(solver).__module__, type(solver).__qualname__, solver.getName())).encode())
+            modules.add(type(solver).__module__)
+
+        for modulename in sorted(modules):
+            modulefile = getattr(sys.modules.get(modulename), "__file__", None)
+            if modulefile is not None and os.path.isfile(modulefile):
+                with open(modulefile, "rb") as f:
+                    fingerprint.update(f.read())
+
+        return fingerprint.hexdigest()
+
+    def getKey(self, testrun, readerfingerprint):
+        """
+        returns the cache key of a test run, or None, if the test run cannot be cached
+
+        Test runs that read from standard input or whose files are not accessible cannot be cached.
+        """
+        if "" in testrun.filenames:
+            return None
+        key = hashlib.sha1(readerfingerprint.encode())
+        try:
+            for filename in sorted(testrun.filenames):
+                key.update(repr(self.getFileFingerprint(filename)).encode())
+        except OSError:
+            return None
+        return key.hexdigest()
+
+    def getCacheFileName(self, key, extension = FILE_EXTENSION):
+        return os.path.join(self.cachedir, key + extension)
+
+    def getContentHashes(self, filenames):
+        """
+        returns a string of the content hashes of a list of files in the order of their names
+        """
+        return repr([self.getContentHash(filename) for filename in sorted(filenames)])
+
+    def checkContentHashes(self, key, filenames):
+        """
+        returns if the files of an entry still have the content hashes that were recorded when the entry was stored
+
+        Entries without recorded content hashes are never valid.
+        """
+        try:
+            with open(self.getCacheFileName(key, ParseCache.HASH_EXTENSION), "r") as f:
+                contenthashes = f.read()
+            return self.getContentHashes(filenames) == contenthashes
+        except OSError:
+            return False
+
+    def load(self, key, filenames = None):
+        """
+        returns the cached test run for the given key, or None, if there is none
+
+        Parameters
+        ----------
+        key : cache key of the test run, see getKey()
+        filenames : the files of the test run, whose content hashes are compared with the ones recorded by store(),
+                    or None to skip this comparison
+        """
+        if key is not None and os.path.isfile(self.getCacheFileName(key)):
+            if filenames is not None and not self.checkContentHashes(key, filenames):
+                logging.debug("Files of cached test run for key %s changed" % key)
+                self.remove(key)
+            else:
+                try:
+                    with open(self.getCacheFileName(key), "rb") as f:
+                        testrun = pickle.load(f)
+                    # mark the entry as recently used
+                    os.utime(self.getCacheFileName(key))
+                    self.hits += 1
+                    return testrun
+                except (OSError, pickle.UnpicklingError, EOFError) as e:
+                    logging.debug("No cached test run for key %s: %s" % (key, e))
+        self.misses += 1
+        return None
+
+    def remove(self, key):
+        """
+        removes the cached test run and the content hashes of the given key
+        """
+        for extension in [ParseCache.FILE_EXTENSION, ParseCache.HASH_EXTENSION]:
+            try:
+                os.remove(self.getCacheFileName(key, extension))
+            except OSError:
+                pass
+
+    def store(self, key, testrun):
+        """
+        stores a test run under the given key together with the content hashes of its files
+
+        The test run should be stored right after its files were parsed, such that the hashes describe the parsed content.
+        """
+        if key is None:
+            return
+        try:
+            contenthashes = self.getContentHashes(testrun.filenames)
+            os.makedirs(self.cachedir, exist_ok = True)
+            # write to temporary files first, such that concurrent processes never read incomplete entries
+            tmpfilename = "%s.%d.tmp" % (self.getCacheFileName(key, ParseCache.HASH_EXTENSION), os.getpid())
+            with open(tmpfilename, "w") as f:
+                f.write(contenthashes)
+            os.replace(tmpfilename, self.getCacheFileName(key, ParseCache.HASH_EXTENSION))
+            tmpfilename = "%s.%d.tmp" % (self.getCacheFileName(key), os.getpid())
+            with open(tmpfilename, "wb") as f:
+                pickle.dump(testrun, f, protocol = pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpfilename, self.getCacheFileName(key))
+        except OSError as e:
+            logging.warning("Could not store test run in parse cache %s: %s" % (self.cachedir, e))
+        self.evict()
+
+    def evict(self):
+        """
+        removes the least recently used entries until the cache holds at most maxsize bytes
+        """
+        try:
+            entries = []
+            for filename in os.listdir(self.cachedir):
+                if os.path.splitext(filename)[1] in (ParseCache.FILE_EXTENSION, ParseCache.TABLE_EXTENSION):
+                    stat = os.stat(os.path.join(self.cachedir, filename))
+                    entries.append((stat.st_mtime_ns, stat.st_size, filename))
+        except OSError as e:
+            logging.warning("Could not list parse cache %s: %s" % (self.cachedir, e))
+            return
+        size = sum(entrysize for _, entrysize, _ in entries)
+        for _, entrysize, filename in sorted(entries):
+            if size <= self.maxsize:
+                break
+            key, extension = os.path.splitext(filename)
+            if extension == ParseCache.FILE_EXTENSION:
+                self.remove(key)
+            else:
+                try:
+                    os.remove(os.path.join(self.cachedir, filename))
+                except OSError:
+                    pass
+            size -= entrysize
+
+    def getTableKey(self, filename, kind):
+        """
+        returns the cache key of a table of the given kind, e.g., 'solu', parsed from a file, or None, if the file is not accessible
+        """
+        try:
+            contenthash = self.getContentHash(filename)
+        except OSError:
+            return None
+        return hashlib.sha1(repr((self.getSourceFingerprint(), kind, contenthash)).encode()).hexdigest()
+
+    def loadTable(self, key):
+        """
+        returns the cached table for the given key, or None, if there is none
+        """
+        if key is not None:
+            try:
+                table = misc.loadPickle(self.getCacheFileName(key, ParseCache.TABLE_EXTENSION))
+                os.utime(self.getCacheFileName(key, ParseCache.TABLE_EXTENSION))
+                return table
+            except (OSError, pickle.UnpicklingError, EOFError) as e:
+                logging.debug("No cached table for key %s: %s" % (key, e))
+        return None
+
+    def storeTable(self, key, table):
+        """
+        stores a table under the given key
+        """
+        if key is None:
+            return
+        try:
+            os.makedirs(self.cachedir, exist_ok = True)
+            misc.dumpPickle(table, self.getCacheFileName(key, ParseCache.TABLE_EXTENSION))
+        except OSError as e:
+            logging.warning("Could not store table in parse cache %s: %s" % (self.cachedir, e))
+        self.evict()
+
+    def getStatistics(self):
+        """
+        returns a string with the number of cache hits and misses
+        """
+        return "parse cache %s: %d hits, %d misses" % (self.cachedir, self.hits, self.misses)
@@ -0,0 +1,62 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2016 Zuse Institute Berlin, www.zib.de
+
+Permissions are granted as stated in the license file you have obtained
+with this software. If you find the library useful for your purpose,
+please refer to README.md for how to cite IPET.
+
+@author: Gregor Hendel
+"""
+import re
+
+class ReaderDispatcher:
+    """
+    dispatches lines only to those readers that can extract data from them
+
+    Readers declare the literal prefixes of the lines they are interested in, see StatisticReader.getLinePrefixes().
+    All prefixes are compiled into a single alternation, which is matched once per line. Readers
+    without prefixes are fallback readers that see every line.
+    """
+
+    def __init__(self, readers):
+        """
+        constructs a new dispatcher for a list of readers
+
+        Parameters
+        ----------
+        readers : list of readers; for every line, the readers are returned in the order of this list
+        """
+        reader2prefixes = {}
+        for reader in readers:
+            prefixes = reader.getLinePrefixes()
+            reader2prefixes[reader] = prefixes if prefixes else None
+
+        self.fallbackreaders = [reader for reader in readers if reader2prefixes[reader] is None]
+
+        # the alternation tries longer prefixes first, such that it matches the longest prefix of a line
+        allprefixes = sorted({prefix for prefixes in reader2prefixes.values() if prefixes is not None for prefix in prefixes},
+                             key = len, reverse = True)
+
+        if len(allprefixes) > 0:
+            self.prefixexp = re.compile("|".join("(%s)" % re.escape(prefix) for prefix in allprefixes))
+        else:
+            self.prefixexp = None
+
+        # every prefix of a line that is registered is a prefix of the longest registered prefix of that line
+        self.groupreaders = [None]
+        for longestprefix in allprefixes:
+            self.groupreaders.append([reader for reader in readers
+                                      if reader2prefixes[reader] is None or
+                                      any(longestprefix.startswith(prefix) for prefix in reader2prefixes[reader])])
+
+    def getReaders(self, line):
+        """
+        returns the readers that should operate on the given line
+        """
+        if self.prefixexp is not None:
+            match = self.prefixexp.match(line)
+            if match is not None:
+                return self.groupreaders[match.lastindex]
+        return self.fallbackreaders
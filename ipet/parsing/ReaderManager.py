@@ -10,7 +10,12 @@ please refer to README.md for how to cite IPET.
 @author: Gregor Hendel
 """
 import os
+import re
 import logging
+import pickle
+from itertools import islice
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 import xml.etree.ElementTree as ElementTree
 from .StatisticReader import ErrorFileReader, GapReader, TimeLimitReader, ListReader, \
     BestSolInfeasibleReader, MaxDepthReader, MetaDataReader, NodesReader, RootNodeFixingsReader, \
@@ -20,6 +25,7 @@ from .StatisticReader_VariableReader import VariableReader
 from .StatisticReader_SoluFileReader import SoluFileReader
 from .StatisticReader_CustomReader import CustomReader
 from .TraceFileReader import TraceFileReader
+from .ReaderDispatcher import ReaderDispatcher
 from ipet.concepts.Manager import Manager
 from ipet.concepts.IPETNode import IpetNode
 from ipet.parsing.Solver import Solver, SCIPSolver, CbcSolver, XpressSolver, GurobiSolver, CplexSolver
@@ -28,6 +34,41 @@ from ipet.misc import misc
 #     XpressSolver, GurobiSolver, CplexSolver
 from ipet import Key
 
+def collectChunkData(readermanagerdump, filenames, filename, offset, firstline, length, metadatadict):
+    """
+    parses a chunk of consecutive problems of a log file into a new test run
+
+    Parameters
+    ----------
+    readermanagerdump
+        pickled reader manager with the active solver of the log file, see ReaderManager.dumpWithoutTestRun()
+    filenames
+        the file names of the test run the log file belongs to
+    filename
+        the log file name
+    offset
+        byte offset of the first line of the chunk
+    firstline
+        line number of the first line of the chunk
+    length
+        number of lines of the chunk
+    metadatadict
+        the metadata collected before the first line of the chunk
+    """
+    from ipet.TestRun import TestRun
+    readermanager = pickle.loads(readermanagerdump)
+    chunktestrun = TestRun()
+    chunktestrun.filenames = filenames
+    chunktestrun.metadatadict = metadatadict
+    readermanager.setTestRun(chunktestrun)
+
+    context = Key.CONTEXT_LOGFILE
+    readers = [r for r in readermanager.getManageables(True) if r.supportsContext(context)]
+    with open(filename, "r") as f:
+        f.seek(offset)
+        readermanager.collectLines(enumerate(islice(f, length), firstline), context, readers)
+    return chunktestrun
+
 class ReaderManager(Manager, IpetNode):
     """
     acquires test run data. subclasses of manager, managing readers by their unique name
@@ -39,6 +80,16 @@ class ReaderManager(Manager, IpetNode):
     context2string = {Key.CONTEXT_LOGFILE:"LogFile",
                       Key.CONTEXT_ERRFILE:"ErrFile"}
 
+    universalnewlineexp = re.compile(b"[^\r\n]*(?:\r\n|\r|\n)?")
+
+    SOLVERCACHE_SIZE = 1024
+    """ maximum number of files in the solver cache of a reader manager """
+
+    solvercache = None
+    """ maps the (path, size, modification time) of files and the names of the solvers of this reader manager to the
+    name of the solver detected in them, or "" if none was detected. Reader managers from older pickles have no own
+    cache yet, which is created on first use """
+
     def __init__(self, problemexpression = "@01", problemendexpression = "=ready="):
         """
         constructs a new reader Manager
@@ -59,6 +110,7 @@ class ReaderManager(Manager, IpetNode):
         self.addSolvers()
         self.activeSolver = self.solvers[0]
         self.solverCanRead = True
+        self.solvercache = OrderedDict()
 
     def getEditableAttributes(self):
         return ["problemexpression", "problemendexpression"]
@@ -247,53 +299,319 @@ class ReaderManager(Manager, IpetNode):
         """
         return line.startswith(self.problemexpression)
 #
+    def getSolverCacheKey(self, filename):
+        """
+        returns the key of a file in the solver cache, or None, if the file cannot be cached
+        """
+        if filename == "":
+            return None
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        # a manager with other solvers may recognize a file that this manager does not recognize
+        return (os.path.abspath(filename), stat.st_size, stat.st_mtime_ns, tuple(solver.getName() for solver in self.solvers))
+
+    def recognizeSolver(self, line):
+        """
+        activates the first solver that recognizes the line as its output, returns True if there is such a solver
+        """
+        for solver in self.solvers:
+            if solver.recognizeOutput(line):
+                self.activeSolver = solver
+                return True
+        return False
+
     def readSolverType(self):
         """
         check the solver type for a given log file
+
+        the lines consumed for the detection are handed back to the test run, such that the
+        current file is read only once. Detected solvers are cached per file in every manager, see solvercache.
+        Files without a recognized solver are parsed with the default solver, and every file starts from
+        a clean solver state.
         """
+        self.activeSolver = self.solvers[0]
+        if self.solvercache is None:
+            self.solvercache = OrderedDict()
+        cachekey = self.getSolverCacheKey(self.testrun.iterationGetCurrentFile())
+        solvername = self.solvercache.get(cachekey)
+        if solvername is not None:
+            self.solvercache.move_to_end(cachekey)
+        if solvername == "":
+            return
+        for solver in self.solvers:
+            if solver.getName() == solvername:
+                self.activeSolver = solver
+                return
+
         lines = []
         for i,line in self.testrun:
             lines.append(line)
-            for solver in self.solvers:
-                if solver.recognizeOutput(line):
-                    self.activeSolver = solver
-                    self.testrun.iterationAddConsumedStdinput(lines)
-                    return
+            if self.recognizeSolver(line):
+                self.testrun.iterationAddConsumedInput(lines)
+                self.cacheSolverName(cachekey, self.activeSolver.getName())
+                return
         # raise ValueError("Input does not have a recognized format.")
+        self.testrun.iterationAddConsumedInput(lines)
+        self.cacheSolverName(cachekey, "")
 
-    def collectData(self):
+    def cacheSolverName(self, cachekey, solvername):
+        """
+        stores the name of the solver detected in a file, and forgets the least recently used files beyond SOLVERCACHE_SIZE
+        """
+        if cachekey is None:
+            return
+        self.solvercache[cachekey] = solvername
+        while len(self.solvercache) > ReaderManager.SOLVERCACHE_SIZE:
+            self.solvercache.popitem(last = False)
+
+    def collectData(self, workers = 1):
         """
         runs data collection on the specified testrun
+
+        Parameters
+        ----------
+        workers
+            number of processes to parse log files with. With more than one worker, every log file is split
+            into chunks of consecutive problems, which are parsed in parallel and stitched together in their original order
         """
         assert(self.testrun != None)
 
         self.testrun.iterationPrepare()
         while self.testrun.iterationNextFile():
-            self.readSolverType()
+            self.collectFileData(workers)
+
+        self.testrun.iterationCleanUp()
+        return 1
+
+    def collectFileData(self, workers = 1):
+        """
+        runs data collection on the current file of the test run iteration
+        """
+        self.readSolverType()
+        self.activeSolver.reset()
 
-            context = misc.filenameGetContext(self.testrun.iterationGetCurrentFile())
-            readers = [r for r in self.getManageables(True) if r.supportsContext(context)]
+        context = misc.filenameGetContext(self.testrun.iterationGetCurrentFile())
+        readers = [r for r in self.getManageables(True) if r.supportsContext(context)]
 
-            line = (0,"")
-            for line in self.testrun:
-                if self.startOfProblemReached(line[1]):
-                    self.updateProblemName(line, context, readers)
+        # compressed log files cannot be split into chunks, because they do not support seeking efficiently
+        currentfile = self.testrun.iterationGetCurrentFile()
+        if workers > 1 and context == Key.CONTEXT_LOGFILE and currentfile != "" and not misc.isCompressed(currentfile):
+            self.collectFileDataParallel(currentfile, readers, workers)
+        else:
+            self.collectLines(self.testrun, context, readers)
 
-                if self.endOfProblemReached(line[1]):
-                    self.finishProblemParsing(line, context, readers)
+        for reader in readers:
+            reader.execEndOfFile()
+        self.testrun.finishedReadingFile(self.activeSolver)
 
-                else:
-                    if self.activeSolver.isSolverInstance(context):
-                        self.activeSolver.readLine(line[1])
-                    for reader in readers:
-                        reader.operateOnLine(line[1])
+    def startFollowing(self):
+        """
+        prepares following the log file of the test run while it is still being written
 
-            # in case solver crashed, make sure that parsing is finished
-            self.finishProblemParsing(line, context, readers)
+        The files that precede the log file, such as the meta file, are read immediately. The log file itself
+        is parsed incrementally by followLogFile(), and the remaining files are read by stopFollowing().
+        """
+        assert(self.testrun != None)
+        if self.testrun.getLogFileName() is not None and misc.isCompressed(self.testrun.getLogFileName()):
+            raise ValueError("Cannot follow compressed log file %s" % self.testrun.getLogFileName())
+
+        self.followreaders = [r for r in self.getManageables(True) if r.supportsContext(Key.CONTEXT_LOGFILE)]
+        self.followsolverrecognized = False
+        self.followlastline = (0, "")
+        self.testrun.followPrepare()
+
+        self.testrun.iterationPrepare()
+        while self.testrun.iterationNextFile():
+            if self.testrun.iterationGetCurrentFile() == self.testrun.getLogFileName():
+                break
+            self.collectFileData()
+
+    def followLogFile(self):
+        """
+        parses the lines that were appended to the log file since the last call
+
+        Only complete lines are parsed, and the current problem stays open until its end expression is read,
+        such that the parser state is kept between calls.
+
+        Returns
+        -------
+        list
+            the ids of the problems that were finished during this call
+        """
+        filename = self.testrun.getLogFileName()
+        if filename is None:
+            return []
+        lines = self.testrun.followGetAppendedLines(filename)
+        if not self.followsolverrecognized:
+            self.followsolverrecognized = any(self.recognizeSolver(line) for _, line in lines)
+
+        firstproblemid = self.testrun.currentproblemid
+        if len(lines) > 0:
+            self.collectLines(lines, Key.CONTEXT_LOGFILE, self.followreaders, finish = False)
+            self.followlastline = lines[-1]
+        return list(range(firstproblemid, self.testrun.currentproblemid))
+
+    def stopFollowing(self):
+        """
+        parses the rest of the log file, including an incomplete last line, and reads the remaining files of the test run
+        """
+        filename = self.testrun.getLogFileName()
+        if filename is not None:
+            self.followLogFile()
+            lines = self.testrun.followGetAppendedLines(filename, complete = False)
+            self.collectLines(lines, Key.CONTEXT_LOGFILE, self.followreaders, finish = False)
+            self.followlastline = lines[-1] if len(lines) > 0 else self.followlastline
+
+            self.finishProblemParsing(self.followlastline, Key.CONTEXT_LOGFILE, self.followreaders)
+            for reader in self.followreaders:
+                reader.execEndOfFile()
             self.testrun.finishedReadingFile(self.activeSolver)
 
+        while self.testrun.iterationNextFile():
+            self.collectFileData()
+
         self.testrun.iterationCleanUp()
-        return 1
+
+    def collectLines(self, lines, context, readers, finish = True):
+        """
+        passes an iterable of (linenumber, line) tuples through the active solver and the given readers
+
+        if finish is True, the problem that is still open after the last line is finished, too.
+
+        every line is only passed to the readers that support the current section of the solver output
+        and whose line prefixes match it, see ReaderDispatcher. The line is passed as a misc.LogLine
+        such that it is tokenized at most once.
+        """
+        section2dispatcher = {}
+        line = (0,"")
+        for line in lines:
+            if self.startOfProblemReached(line[1]):
+                self.updateProblemName(line, context, readers)
+
+            if self.endOfProblemReached(line[1]):
+                self.finishProblemParsing(line, context, readers)
+
+            else:
+                # the solver and all readers share the tokenizations of the line
+                text = misc.LogLine(line[1])
+                section = None
+                if self.activeSolver.isSolverInstance(context):
+                    self.activeSolver.readLine(text)
+                    section = self.activeSolver.getSection()
+
+                dispatcher = section2dispatcher.get(section)
+                if dispatcher is None:
+                    dispatcher = ReaderDispatcher([reader for reader in readers if reader.supportsSection(section)])
+                    section2dispatcher[section] = dispatcher
+
+                for reader in dispatcher.getReaders(text):
+                    reader.operateOnLine(text)
+
+        # in case solver crashed, make sure that parsing is finished
+        if finish:
+            self.finishProblemParsing(line, context, readers)
+
+    def scanProblemOffsets(self, filename):
+        """
+        scans a log file for the start of problems
+
+        Returns
+        -------
+        offsets
+            list of (byte offset, line number) pairs of all lines that start with the problem expression
+        metadata
+            list of (line number, line) pairs of all metadata lines of the file
+        nlines
+            the total number of lines of the file
+        """
+        problemexpression = self.problemexpression.encode()
+        offsets = []
+        metadata = []
+        offset = 0
+        nlines = 0
+        with open(filename, "rb") as f:
+            for rawline in f:
+                # text mode iteration also breaks lines at single carriage returns
+                if b"\r" in rawline:
+                    lines = [m.group() for m in self.universalnewlineexp.finditer(rawline) if m.group()]
+                else:
+                    lines = [rawline]
+                for line in lines:
+                    if line.startswith(problemexpression):
+                        offsets.append((offset, nlines))
+                    elif line.startswith(b"@"):
+                        metadata.append((nlines, line.decode(errors = "replace")))
+                    offset += len(line)
+                    nlines += 1
+        return offsets, metadata, nlines
+
+    def getFileChunks(self, offsets, nlines, nchunks):
+        """
+        splits a log file into at most nchunks chunks of consecutive problems
+
+        Returns a list of (byte offset, first line number, number of lines) for every chunk. The first
+        chunk always starts at the beginning of the file such that it includes the output preceding the first problem
+        """
+        if len(offsets) == 0:
+            return [(0, 0, nlines)]
+        step = max(1, len(offsets) // nchunks)
+        starts = [(0, 0)] + offsets[step::step]
+        ends = [firstline for _, firstline in starts[1:]] + [nlines]
+        return [(offset, firstline, end - firstline) for (offset, firstline), end in zip(starts, ends)]
+
+    def collectFileDataParallel(self, filename, readers, workers):
+        """
+        parses the problems of a log file in chunks by a pool of worker processes
+
+        the problem data of the chunks is appended to the test run in the order of the chunks, such that
+        problem ids and line numbers are the same as for serial parsing
+        """
+        offsets, metadatalines, nlines = self.scanProblemOffsets(filename)
+        chunks = self.getFileChunks(offsets, nlines, 4 * workers)
+        usemetadata = any(isinstance(r, MetaDataReader) for r in readers)
+        logging.debug("Parsing %d chunks of file %s with %d worker processes" % (len(chunks), filename, workers))
+
+        # every chunk starts with the metadata that was collected before its first line
+        metadatadict = dict(self.testrun.metadatadict)
+        chunkmetadata = []
+        metadatalines = iter(metadatalines)
+        nextmetadata = next(metadatalines, None)
+        for _, firstline, _ in chunks:
+            while usemetadata and nextmetadata is not None and nextmetadata[0] < firstline:
+                metadata = MetaDataReader.getMetaData(nextmetadata[1])
+                if metadata is not None:
+                    metadatadict[metadata[0]] = metadata[1]
+                nextmetadata = next(metadatalines, None)
+            chunkmetadata.append(dict(metadatadict))
+
+        testrun = self.testrun
+        readermanagerdump = self.dumpWithoutTestRun()
+        with ProcessPoolExecutor(max_workers = workers) as executor:
+            futures = [executor.submit(collectChunkData, readermanagerdump, testrun.filenames, filename, offset, firstline, length, metadata)
+                       for (offset, firstline, length), metadata in zip(chunks, chunkmetadata)]
+            for future in futures:
+                chunktestrun = future.result()
+                testrun.appendProblemData(chunktestrun)
+                testrun.metadatadict = chunktestrun.metadatadict
+
+    def dumpWithoutTestRun(self):
+        """
+        returns this reader manager pickled without references to the current test run
+
+        worker processes receive their private copy of the reader manager from this dump, such that
+        the (possibly large) data of the test run is not transferred
+        """
+        testrun = getattr(self, "testrun", None)
+        self.testrun = None
+        for reader in self.getManageables():
+            reader.testrun = None
+        try:
+            return pickle.dumps(self)
+        finally:
+            if testrun is not None:
+                self.setTestRun(testrun)
 
     # ## XML IO methods
     def toXMLElem(self):
@@ -28,6 +28,16 @@ class Solver():
 
     solverstatusmap = {}
 
+    initialsection = None
+    """ the section at the beginning of a problem, None if the solver does not track sections """
+    section_exprs = []
+    """ list of (expression, section) pairs; a line matching an expression starts the corresponding section """
+
+    oneshotextractors = ["extractVersion"]
+    """ names of extractors that are skipped after they extracted their data once, until the next reset() """
+    extractorsections = {}
+    """ maps names of extractors to the sections of the solver output in which they run, other extractors run in all sections """
+
     def __init__(self,
                  solverId = None,
                  recognition_pattern = None,
@@ -53,49 +63,65 @@ class Solver():
 
         if solverstatusmap is not None:
             self.solverstatusmap = solverstatusmap
-        self.solverstatusses = sorted(self.solverstatusmap.items(), key = itemgetter(1))
+        self.solverstatusses = [(re.compile(pattern), status) for pattern, status in sorted(self.solverstatusmap.items(), key = itemgetter(1))]
 
 
         self.data = {}
         self.reset()
 
+    def extractSection(self, line : str):
+        """ Check if the line starts a new section of the solver output.
+
+        If one of the section expressions matches, the current section is changed accordingly.
+        """
+        for expr, section in self.section_exprs:
+            if expr.match(line):
+                self.section = section
+                break
+
+    def getSection(self) -> str:
+        """ Return the current section of the solver output, or None, if the solver does not track sections
+        """
+        return self.section
+
     def extractStatus(self, line : str):
         """ Check if the line matches one of the solverstatusmap patterns.
         
         If the one of the patterns matches, the data will be added data as Key.SolverStatus.
         """
-        for pattern, status in self.solverstatusses:
-            if re.compile(pattern).match(line):
+        for expr, status in self.solverstatusses:
+            if expr.match(line):
 
                 self.addData(Key.SolverStatus, status)
                 # break in order to prevent parsing a weaker status
-                break
+                return True
+        return False
 
     def extractVersion(self, line : str):
         """ Extract the version of the solver-software.
         
         If the versionpattern matches, the version will be added to data as Key.Version.
         """
-        self.extractByExpression(line, self.version_expr, Key.Version, str)
+        return self.extractByExpression(line, self.version_expr, Key.Version, str)
 
     def extractSolvingTime(self, line : str):
         """ Read the overall solving time given by the solver.
         
         If the solvingpatterns matches, the version will be added to data as Key.SolvingTime.
         """
-        self.extractByExpression(line, self.solvingtime_expr, Key.SolvingTime)
+        return self.extractByExpression(line, self.solvingtime_expr, Key.SolvingTime)
 
     def extractDualbound(self, line : str):
         """Return the reported dual bound (at the end of the solver-output)
         """
-        self.extractByExpression(line, self.dualbound_expr, Key.DualBound)
+        return self.extractByExpression(line, self.dualbound_expr, Key.DualBound)
 
     def extractPrimalbound(self, line : str):
         """Read the primal bound (at the end of the solver-output)
         """
-        self.extractByExpression(line, self.primalbound_expr, Key.PrimalBound)
+        return self.extractByExpression(line, self.primalbound_expr, Key.PrimalBound)
 
-    def extractByExpression(self, line : str, expr, key : str, datatype : type = float) -> None:
+    def extractByExpression(self, line : str, expr, key : str, datatype : type = float) -> bool:
         """
         Search for regular expression 'expr' and store a possible match under the given 'key'.
 
@@ -109,14 +135,21 @@ class Solver():
             data key to store datum after a match
         datatype
             data type for the datum, default : float
+
+        Returns
+        -------
+        bool
+            True, if a datum was stored, otherwise False
         """
         m = expr.match(line)
         if m is not None:
             try:
                 d = datatype(m.groups()[0])
                 self.addData(key, d)
+                return True
             except:
                 pass
+        return False
 
     def addData(self, key, datum):
         """Add data to local data-dictionary
@@ -161,10 +194,33 @@ class Solver():
         line
             a line of solver output that the information shall be read frome
         """
+        self.extractSection(line)
         self.extractElementaryInformation(line)
         self.extractOptionalInformation(line)
         self.extractGeneralInformation(line)
 
+    def runExtractor(self, extractor, line : str):
+        """Run an extractor on a line, unless the extractor is completed or does not run in the current section.
+
+        Extractors listed in oneshotextractors report by returning True that they extracted their data,
+        and are skipped from then on until the next reset().
+
+        Parameters
+        ----------
+        extractor
+            a bound extractor method of this solver
+        line
+            a line of solver output that the information shall be read from
+        """
+        name = extractor.__name__
+        if name in self.completedextractors:
+            return
+        sections = self.extractorsections.get(name)
+        if sections is not None and self.section is not None and self.section not in sections:
+            return
+        if extractor(line) and name in self.oneshotextractors:
+            self.completedextractors.add(name)
+
     def extractElementaryInformation(self, line : str):
         """Read Data that is needed for validation
 
@@ -173,12 +229,12 @@ class Solver():
         line
             a line of solver output that the information shall be read from
         """
-        self.extractPrimalbound(line)
-        self.extractDualbound(line)
-        self.extractSolvingTime(line)
-        self.extractVersion(line)
-        self.extractStatus(line)
-        self.extractHistory(line)
+        self.runExtractor(self.extractPrimalbound, line)
+        self.runExtractor(self.extractDualbound, line)
+        self.runExtractor(self.extractSolvingTime, line)
+        self.runExtractor(self.extractVersion, line)
+        self.runExtractor(self.extractStatus, line)
+        self.runExtractor(self.extractHistory, line)
 
     def extractHistory(self, line):
         """ Extract the sequence of primal and dual bounds.
@@ -238,6 +294,8 @@ class Solver():
         """Reset all Data except the solverId
         """
         self.data = {}
+        self.section = self.initialsection
+        self.completedextractors = set()
         self.addData(Key.Solver, self.solverId)
         self.addData(Key.SolverStatus, Key.SolverStatusCodes.Crashed)
 #        TODO how does the historydata work ?
@@ -283,8 +341,12 @@ class Solver():
         line
             a line of solver output that the information shall be read from
         """
-        splitline = line.split()
-        primalbound = line[:cutidx].split()[boundidx]
+        splitline = misc.getWords(line)
+        # cutting off trailing whitespace does not change the words of the line
+        if line[cutidx:].isspace():
+            primalbound = splitline[boundidx]
+        else:
+            primalbound = line[:cutidx].split()[boundidx]
         pointInTime = splitline[timeidx].strip(timestripchars)
         self.addHistoryData(Key.PrimalBoundHistory, pointInTime, primalbound)
 
@@ -317,6 +379,26 @@ class SCIPSolver(Solver):
     
     # variables needed for dual bound history
     regular_exp = re.compile('\|')  # compile the regular expression to speed up reader
+
+    initialsection = Key.SECTION_HEADER
+    section_exprs = [(re.compile("^SCIP Status"), Key.SECTION_STATISTICS),
+                     (re.compile("^presolving:"), Key.SECTION_PRESOLVE),
+                     (primalboundhistory_exp, Key.SECTION_TABLE),
+                     (re.compile("^     Time          Nodes        Left   Solvers"), Key.SECTION_TABLE)]
+
+    # the external libraries in the header may report a GitHash, too, which is why extractMoreData runs on the entire header
+    oneshotextractors = ["extractVersion", "extractPath"]
+    extractorsections = {"extractVersion" : [Key.SECTION_HEADER],
+                         "extractMoreData" : [Key.SECTION_HEADER],
+                         "extractPath" : [Key.SECTION_HEADER],
+                         "extractHistory" : [Key.SECTION_TABLE, Key.SECTION_STATISTICS],
+                         "extractPrimalbound" : [Key.SECTION_STATISTICS],
+                         "extractDualbound" : [Key.SECTION_STATISTICS],
+                         "extractSolvingTime" : [Key.SECTION_STATISTICS],
+                         "extractStatus" : [Key.SECTION_STATISTICS]}
+
+    moredata_exprs = [(keyword if keyword != "LP solver" else "LPSolver", re.compile(r"\[%s: ([\w .-]+)\]" % keyword))
+                      for keyword in ["mode", "LP solver", "GitHash"]]
     
     solverstatusmap = {
         "SCIP Status        : problem is solved \[optimal solution found\]":Key.SolverStatusCodes.Optimal,
@@ -350,9 +432,9 @@ class SCIPSolver(Solver):
             self.inTable and self.heurdispcharexpugmode.match(line) and self.ugmode:
 
             if not self.ugmode:
-                allmatches = misc.numericExpression.findall(line[:line.rindex("|")])
+                allmatches = misc.getNumbers(line, end = line.rindex("|"))
             else:
-                allmatches = misc.numericExpression.findall(line)[:5]
+                allmatches = misc.getNumbers(line)[:5]
 
             if len(allmatches) == 0:
                 return
@@ -363,7 +445,7 @@ class SCIPSolver(Solver):
             self.addHistoryData(Key.PrimalBoundHistory, pointInTime, PrimalBound)
 
         elif not self.inTable and self.firstsolexp.match(line):
-            matches = self.numericExpression.findall(line)
+            matches = misc.getNumbers(line)
             PrimalBound = matches[0]
             pointInTime = matches[3]
             # store newly found (time, primal bound) tuple if it differs from the last primal bound
@@ -383,7 +465,7 @@ class SCIPSolver(Solver):
 
         try:
             # TODO This works, why is eclipse complaining?
-            lineelems = misc.tablenumericExpression.findall(line)
+            lineelems = misc.getTableNumbers(line)
             # parse time and dual bound from the table
             time = lineelems[timeindex]
             dualbound = lineelems[self.dualboundindex]
@@ -415,10 +497,13 @@ class SCIPSolver(Solver):
     def extractMoreData(self, line : str):
         """Handle more than just the version
         """
-        for keyword in ["mode", "LP solver", "GitHash"]:
-            data = re.search(r"\[%s: ([\w .-]+)\]" % keyword, line)
+        found = False
+        for datakey, expr in self.moredata_exprs:
+            data = expr.search(line)
             if data:
-                self.addData(keyword if keyword != "LP solver" else "LPSolver", data.groups()[0])
+                self.addData(datakey, data.groups()[0])
+                found = True
+        return found
 
     def extractPath(self, line : str):
         """Extract the path info
@@ -428,12 +513,14 @@ class SCIPSolver(Solver):
             self.addData(Key.SettingsPathAbsolute, absolutesettingspath)
             settings = os.path.basename(absolutesettingspath)
             settings = os.path.splitext(settings)[0]
+            return True
+        return False
 
     def extractOptionalInformation(self, line : str):
         """Extract the path info
         """
-        self.extractPath(line)
-        self.extractMoreData(line)
+        self.runExtractor(self.extractPath, line)
+        self.runExtractor(self.extractMoreData, line)
 
 class GurobiSolver(Solver):
 
@@ -452,22 +539,29 @@ class GurobiSolver(Solver):
 #                       "" : Key.SolverStatusCodes.Interrupted
                        }
 
-    # variables needed for bound history
-    inTable = False
-    gurobiextralist = []
-    
+    initialsection = Key.SECTION_HEADER
+    section_exprs = [(re.compile("^Explored \d+ nodes"), Key.SECTION_STATISTICS),
+                     (re.compile("^Presolve"), Key.SECTION_PRESOLVE),
+                     (re.compile("^ Expl Unexpl \|"), Key.SECTION_TABLE)]
+
     def __init__(self, **kw):
         super(GurobiSolver, self).__init__(**kw)
 
+    def reset(self):
+        Solver.reset(self)
+        # variables needed for bound history
+        self.inTable = False
+        self.gurobiextralist = []
+
     def extractPrimalboundHistory(self, line : str):
         """ Extract the sequence of primal bounds  
         """
         if "Found heuristic solution" in line:
-            self.gurobiextralist.append(line.split()[-1])
+            self.gurobiextralist.append(misc.getWords(line)[-1])
         if "Expl Unexpl |  Obj  Depth" in line:
             self.inTable = True
         elif self.inTable and line.endswith("s\n") and self.gurobiextralist != []:
-            pointInTime = line.split()[-1].strip("s")
+            pointInTime = misc.getWords(line)[-1].strip("s")
             self.addHistoryData(Key.PrimalBoundHistory, pointInTime, self.gurobiextralist[-1])
             self.gurobiextralist = []
         elif self.inTable and line.startswith("H") or line.startswith("*"):
@@ -476,7 +570,7 @@ class GurobiSolver(Solver):
         elif "Cutting planes:" in line and self.inTable:
             self.inTable = False
         elif self.gurobiextralist != [] and "Explored " in line:
-            pointInTime = line.split()[-2]
+            pointInTime = misc.getWords(line)[-2]
             self.addHistoryData(Key.PrimalBoundHistory, pointInTime, self.gurobiextralist[-1])
             self.gurobiextralist = []
         return None
@@ -498,6 +592,11 @@ class CplexSolver(Solver):
 #                       "" : Key.SolverStatusCodes.Interrupted
                        }
 
+    initialsection = Key.SECTION_HEADER
+    section_exprs = [(re.compile("^Solution time ="), Key.SECTION_STATISTICS),
+                     (re.compile("^(?:MIP )?Presolve"), Key.SECTION_PRESOLVE),
+                     (re.compile("^   Node  Left     Objective"), Key.SECTION_TABLE)]
+
     # variables needed for primal bound history extraction
     easyCPLEX = False
     lastelapsedtime = 0.0
@@ -525,7 +624,7 @@ class CplexSolver(Solver):
         """ Extract the sequence of primal bounds  
         """
         if self.easyCPLEX and "Found incumbent of value" in line:
-            splitline = line.split()
+            splitline = misc.getWords(line)
             self.readBoundAndTime(line, splitline.index("Found") + 4, splitline.index("Found") + 6)
         elif not self.easyCPLEX:
             if "Welcome to IBM(R) ILOG(R) CPLEX(R)" in line:
@@ -548,20 +647,20 @@ class CplexSolver(Solver):
                 nnodes = int(line[:nodeinlineidx].split()[-1].strip('*+')) + 1
                 if line.startswith("*"):
                     if '+' in line:
-                        primalbound = line.split()[-3]
+                        primalbound = misc.getWords(line)[-3]
                     else:
-                        primalbound = line.split()[-4]
+                        primalbound = misc.getWords(line)[-4]
                     self.cpxprimals.append((nnodes, primalbound))
                 self.lastnnodes = nnodes
             elif "Elapsed time = " in line:
-                thetime = float(line.split()[3])
+                thetime = float(misc.getWords(line)[3])
                 self.processCpxprimals(thetime)
 
                 self.nnodessincelastelapsedtime = self.lastnnodes
                 self.lastelapsedtime = thetime
 
             elif "Solution time =" in line:
-                thetime = float(line.split()[3])
+                thetime = float(misc.getWords(line)[3])
                 self.processCpxprimals(thetime)
     
     def processCpxprimals(self, currenttime):
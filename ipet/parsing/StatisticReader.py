@@ -32,6 +32,12 @@ class StatisticReader(IpetNode):
 
     context = Key.CONTEXT_LOGFILE
 
+    lineprefixes = None
+    """ literal strings that all lines start with from which this reader extracts data, None if the reader must see all lines """
+
+    sections = None
+    """ the sections of the solver output this reader extracts data from, None for all sections """
+
     sleepAfterReturn = True
     sleep = False
 
@@ -67,6 +73,31 @@ class StatisticReader(IpetNode):
         else:
             return context in self.context
 
+    def supportsSection(self, section):
+        """
+        returns True if the reader needs to see lines from the given section of the solver output
+
+        Parameters
+        ----------
+        section : the current section of the solver output, or None, if the solver does not track sections
+        """
+        return section is None or self.sections is None or section in self.sections
+
+    def getLinePrefixes(self):
+        """
+        returns a list of literal strings, one of which every line must start with for this reader to act on it,
+        or None, if the reader needs to see every line
+
+        readers that rely on the default extractStatistic() method derive the prefix from their anchored regular expression
+        """
+        if self.lineprefixes is not None:
+            return self.lineprefixes
+        if type(self).extractStatistic is StatisticReader.extractStatistic:
+            prefix = misc.getLiteralPrefix(self.regular_exp.pattern)
+            if prefix is not None:
+                return [prefix]
+        return None
+
     def getSplitLineWithRegexp(self, regular_exp, line, index=-1, startofline=False):
         if startofline == True and not re.match(regular_exp, line):
             return None
@@ -74,9 +105,9 @@ class StatisticReader(IpetNode):
             return None
 
         if index == -1:
-            return line.split()
+            return misc.getWords(line)
         else:
-            return line.split()[index]
+            return misc.getWords(line)[index]
 
     def getName(self):
         """
@@ -111,6 +142,12 @@ class StatisticReader(IpetNode):
         """
         return None
 
+    def execEndOfFile(self):
+        """
+        overwrite this method to implement final behaviour at the end of each file, such as storing collected data at once
+        """
+        return None
+
     def operateOnLine(self, line):
         self.extractStatistic(line)
 
@@ -139,10 +176,12 @@ class MetaDataReader(StatisticReader):
 
     metadataexp = re.compile("^@\S{3,}\s+\S+$")
     name = 'MetaDataReader'
+    lineprefixes = ["@"]
     datakey = Key.MetaData
 
-    def extractStatistic(self, line):
-        """ Read metadata from specified line
+    @staticmethod
+    def getMetaData(line):
+        """ Return the pair (attribute, datum) of a metadata line, or None if the line holds no metadata
 
         Parameters
         ----------
@@ -150,10 +189,25 @@ class MetaDataReader(StatisticReader):
             string to be read from. has to have the form
                 @attribute datum
         """
-        if self.metadataexp.match(line):
+        if MetaDataReader.metadataexp.match(line):
 #            TODO better to allow more spaces?
             [attr, datum] = line.split('@')[1].split()
             datum = datum.split('\n')[0]
+            return attr, datum
+        return None
+
+    def extractStatistic(self, line):
+        """ Read metadata from specified line
+
+        Parameters
+        ----------
+        line
+            string to be read from. has to have the form
+                @attribute datum
+        """
+        metadata = self.getMetaData(line)
+        if metadata is not None:
+            attr, datum = metadata
             self.testrun.metadatadict[attr] = datum
 
 class BestSolInfeasibleReader(StatisticReader):
@@ -183,6 +237,7 @@ class DateTimeReader(StatisticReader):
     datetimeendkey = Key.DatetimeEnd  # : data key for end of run
 
     datetimekw = {datetimestartkey:datetimestartexp, datetimeendkey:datetimeendexp}
+    lineprefixes = ["@03 ", "@04 "]
 
     def extractStatistic(self, line):
         for key, exp in list(self.datetimekw.items()):
@@ -199,6 +254,7 @@ class DualLPTimeReader(StatisticReader):
     """
     name = 'DualLPTimeReader'
     regular_exp = re.compile('^  dual LP')
+    sections = [Key.SECTION_STATISTICS]
     datakey = Key.DualLpTime
     datatype = float
     lineindex = 3
@@ -266,6 +322,8 @@ class GapReader(StatisticReader):
     """
     name = 'GapReader'
     regular_exp = re.compile('^Gap                :')
+    lineprefixes = ['Gap                :']
+    sections = [Key.SECTION_STATISTICS]
     datakey = Key.Gap
     datatype = float
     lineindex = 2
@@ -285,6 +343,7 @@ class MaxDepthReader(StatisticReader):
     """
     name = 'MaxDepthReader'
     regular_exp = re.compile('  max depth        :')
+    sections = [Key.SECTION_STATISTICS]
     datakey = Key.MaximumDepth
     datatype = int
     lineindex = 3
@@ -295,6 +354,7 @@ class NodesReader(StatisticReader):
     """
     name = 'NodesReader'
     regular_exp = re.compile("^  nodes \(total\)    :")
+    sections = [Key.SECTION_STATISTICS]
     datakey = Key.Nodes
     datatype = int
     lineindex = 3
@@ -302,6 +362,8 @@ class NodesReader(StatisticReader):
 class ObjsenseReader(StatisticReader):
     name = 'ObjsenseReader'
     regular_exp = re.compile("^  Objective sense  : (\w*)")
+    lineprefixes = ["  Objective sense  : "]
+    sections = [Key.SECTION_STATISTICS]
     datakey = Key.ObjectiveSense
     minimize = 1
     maximize = -1
@@ -329,6 +391,7 @@ class RootNodeFixingsReader(StatisticReader):
     """
     name = 'RootNodeFixingsReader'
     regular_exp = re.compile('^  root node')
+    sections = [Key.SECTION_STATISTICS]
     datakey = Key.RootNodeFixings
     datatype = int
     lineindex = 4
@@ -350,11 +413,13 @@ class TimeLimitReader(StatisticReader):
 
     def extractStatistic(self, line):
         if re.search(self.timelimitreadkeys[StatisticReader.solvertype], line):
-            self.addData(self.datakey, float(line.split()[-1]))
+            self.addData(self.datakey, float(misc.getWords(line)[-1]))
 
 class TimeToBestReader(StatisticReader):
     name = 'TimeToBestReader'
     regular_exp = re.compile('  Primal Bound     :')
+    lineprefixes = ['  Primal Bound     :']
+    sections = [Key.SECTION_STATISTICS]
     datakey = Key.TimeToBestSolution
     datatype = float
     lineindex = 3
@@ -369,6 +434,8 @@ class TimeToBestReader(StatisticReader):
 class TimeToFirstReader(StatisticReader):
     name = 'TimeToFirstReader'
     regular_exp = re.compile('  First Solution   :')
+    lineprefixes = ['  First Solution   :']
+    sections = [Key.SECTION_STATISTICS]
     datakey = Key.TimeToFirstSolution
     datatype = float
     lineindex = 3
@@ -418,6 +485,10 @@ class ListReader(StatisticReader):
     def getEditableAttributes(self):
         return ["name", "regpattern"]
 
+    def getLinePrefixes(self):
+        prefix = misc.getLiteralPrefix(self.regpattern, anchored = True)
+        return [prefix] if prefix is not None else None
+
     def set_context(self, contextname):
         self.context = self.contextname2contexts.get(contextname, self.context)
 
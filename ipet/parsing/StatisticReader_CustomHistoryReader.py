@@ -25,7 +25,6 @@ class CustomHistoryReader(StatisticReader):
     regular_exp = re.compile('\|')  # compile the regular expression to speed up reader
     datakey = 'somehistory'
     heuristicdispcharexp = re.compile('[a-zA-Z*]')
-    numericexpression = misc.tablenumericExpression  # use the sophisticated numeric expression from the Custom Reader
 
     def __init__(self, listofheaders, listofindices=[], name='', collectheuristics=-1):
         """
@@ -66,7 +65,7 @@ class CustomHistoryReader(StatisticReader):
             # parse all numbers from the table, including '-' and '--'. If there are too few or no numbers,
             # line is most certainly one of the less frequent table header lines and can be used to retrieve
             # the index of the columns, if not already done.
-            listofnumbersintable = self.numericexpression.findall(line)
+            listofnumbersintable = misc.getTableNumbers(line)
             if len(listofnumbersintable) > 4:
                 try:
                     # parse values from the table
@@ -11,9 +11,9 @@ please refer to README.md for how to cite IPET.
 """
 from .StatisticReader import StatisticReader
 import re
-import builtins
 import logging
 from ipet import misc
+from ipet import Schema
 from ipet.concepts.IPETNode import IpetNode
 
 class CustomReader(StatisticReader):
@@ -42,8 +42,22 @@ class CustomReader(StatisticReader):
                   }
 
 
+    datatype2method = {
+                       "float" : float,
+                       "int" : int,
+                       "float32" : float,
+                       "int32" : int
+                       }
+
+    datatype2dtype = {
+                      "float" : Schema.DTYPE_FLOAT64,
+                      "int" : Schema.DTYPE_INT64,
+                      "float32" : Schema.DTYPE_FLOAT32,
+                      "int32" : Schema.DTYPE_INT32
+                      }
+
     requiredoptions = {
-            "datatype" : ["float", "int"],
+            "datatype" : ["float", "int", "float32", "int32"],
             "method" : list(str2method.keys())
         }
 
@@ -62,7 +76,7 @@ class CustomReader(StatisticReader):
 
         index : The zero-based index of the number in the specified line (only numbers count)
 
-        datatype : choose 'int' or 'float'
+        datatype : choose 'int' or 'float', or 'int32' or 'float32' for a more compact storage of the data
 
         method : how to treat multiple occurrences of this data within one problem; 'count' occurrences or parse 'first', 'last', 'sum', 'min' or 'max'
         """
@@ -95,6 +109,10 @@ class CustomReader(StatisticReader):
     def getEditableAttributes(self):
         return ['name', 'regpattern', 'datakey', 'index', 'datatype', 'method'] + IpetNode.getEditableAttributes(self)
 
+    def getLinePrefixes(self):
+        prefix = misc.getLiteralPrefix(self.regpattern)
+        return [prefix] if prefix is not None else None
+
     def getRequiredOptionsByAttribute(self, attr):
         return self.requiredoptions.get(attr, IpetNode.getRequiredOptionsByAttribute(self, attr))
 
@@ -149,14 +167,25 @@ class CustomReader(StatisticReader):
     def setDataType(self, sometype):
         """
         recognizes data types (e.g., 'float' or 'int') and sets reader data type to this value
+
+        the data type of the data key of this reader is declared accordingly, see ipet.Schema
         """
-        try:
-            self.datatypemethod = getattr(builtins, sometype)
+        if sometype in self.datatype2method:
+            self.datatypemethod = self.datatype2method[sometype]
             self.datatype = sometype
-        except:
+        else:
             logging.debug("Error: Could not recognize data type %s, using float" % sometype)
             self.datatypemethod = float
             self.datatype = 'float'
+        self.registerDataType()
+
+    def registerDataType(self):
+        """
+        declare the data type of the data key of this reader
+        """
+        if self.datatype in self.datatype2dtype:
+            Schema.registerDataType(self.datakey, self.datatype2dtype[self.datatype])
+
     def set_datatype(self, datatype):
         self.setDataType(datatype)
 
@@ -183,6 +212,7 @@ class CustomReader(StatisticReader):
         self.datakey = datakey
         if not self.username:
             self.name = self.datakey + "Reader"
+        self.registerDataType()
 
     def set_index(self, index):
         self.index = int(index)
@@ -11,6 +11,7 @@ please refer to README.md for how to cite IPET.
 """
 import re
 from ipet.misc import misc
+from ipet import Key
 from .StatisticReader import StatisticReader
 
 class PluginStatisticsReader(StatisticReader):
@@ -40,6 +41,7 @@ class PluginStatisticsReader(StatisticReader):
     replacecolumnnames = [''.join(sscname.split()) for sscname in spacesepcolumnnames]
     wrongplugintype = 'Wrong'
     plugintype = wrongplugintype
+    sections = [Key.SECTION_STATISTICS]
 
 
     def convertToFloat(self, x):
@@ -91,12 +93,11 @@ class PluginStatisticsReader(StatisticReader):
 
                 # treat tables (tables with at least two data columns)
                 datakeys = ['_'.join((self.plugintype, column, pluginname)) for column in self.columns]
-                data = list(map(self.convertToFloat, misc.numericExpression.findall(line[colonidx + 1:])))
+                data = list(map(self.convertToFloat, misc.getNumbers(line, colonidx + 1)))
             else:
                 # treat vectors (tables with only one data column)
                 datakeys = ['_'.join((self.plugintype, pluginname))]
-                # TODO This works, why is eclipse complaining?
-                data = [self.convertToFloat(misc.numericExpression.search(line, colonidx + 1).group(0))]
+                data = [self.convertToFloat(misc.getNumbers(line, colonidx + 1)[0])]
 
             # determine minimum length (necessary if more headers were recognized than actual available data)
             minlen = min(len(datakeys), len(data))
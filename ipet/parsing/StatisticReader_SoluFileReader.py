@@ -11,8 +11,10 @@ please refer to README.md for how to cite IPET.
 """
 from .StatisticReader import StatisticReader
 from ipet import Key
+from ipet.misc import misc
 import re
 import numpy as np
+import pandas as pd
 
 class SoluFileReader(StatisticReader):
     """A reader for solu file context information
@@ -24,14 +26,30 @@ class SoluFileReader(StatisticReader):
     columnwidth = 12
     columnheaderstr = 'SoluFile'.rjust(columnwidth)
     context = Key.CONTEXT_SOLUFILE
+    lineprefixes = ["="]
 
     def setTestRun(self, testrun):
         self.testrun = testrun
+        self.soludata = []
         if testrun != None:
             self.statistics = self.testrun.data
 
+    @staticmethod
+    def readSoluFile(filename):
+        """ Return the data of a solu file as a data frame with one row per line with problem data
+
+        The columns are the problem name, the optimal value, which is not converted into a floating point number yet,
+        and the solution status. Problem names may occur repeatedly, in which case the last occurrence is valid.
+        """
+        reader = SoluFileReader()
+        reader.soludata = []
+        with misc.openFile(filename, "r") as f:
+            for line in f:
+                if line.startswith("="):
+                    reader.extractStatistic(line)
+        return pd.DataFrame(reader.soludata, columns = [Key.ProblemName] + reader.datakeys, dtype = object)
+
     def extractStatistic(self, line):
-        assert self.testrun != None
         match = re.match("^=([a-zA-Z]+)=", line)
         if match:
             method = getattr(self, "new" + match.groups(0)[0] + "Problem")
@@ -40,11 +58,20 @@ class SoluFileReader(StatisticReader):
             return None
 
     def storeToStatistics(self, problemname, objval, status):
-        if self.testrun.hasProblemName(problemname):
-            self.testrun.addDataByName(self.datakeys, [float(objval), status], problemname)
+        # the data of all problems is stored at once at the end of the file
+        self.soludata.append((problemname, objval, status))
+
+    def execEndOfFile(self):
+        assert self.testrun != None
+        soludata = [(problemname, float(objval), status) for problemname, objval, status in self.soludata
+                    if self.testrun.hasProblemName(problemname)]
+        if len(soludata) > 0:
+            problemnames, objvals, statuses = zip(*soludata)
+            self.testrun.addDataByNames(self.datakeys, problemnames, [objvals, statuses])
+        self.soludata = []
 
     def newoptProblem(self, line):
-        splittedline = line.split()
+        splittedline = misc.getWords(line)
         assert splittedline[0] == '=opt='
         problem = splittedline[1]
         objval = splittedline[2]
@@ -52,7 +79,7 @@ class SoluFileReader(StatisticReader):
         self.storeToStatistics(problem, objval, status='opt')
 
     def newinfProblem(self, line):
-        splittedline = line.split()
+        splittedline = misc.getWords(line)
         assert splittedline[0] == '=inf='
         problem = splittedline[1]
         objval = np.nan
@@ -60,7 +87,7 @@ class SoluFileReader(StatisticReader):
         self.storeToStatistics(problem, objval, status='inf')
 
     def newunknProblem(self, line):
-        splittedline = line.split()
+        splittedline = misc.getWords(line)
         assert splittedline[0] == '=unkn='
         problem = splittedline[1]
         objval = np.nan
@@ -69,7 +96,7 @@ class SoluFileReader(StatisticReader):
 
 
     def newbestProblem(self, line):
-        splittedline = line.split()
+        splittedline = misc.getWords(line)
         assert splittedline[0] == '=best='
         problem = splittedline[1]
         objval = splittedline[2]
@@ -77,7 +104,7 @@ class SoluFileReader(StatisticReader):
         self.storeToStatistics(problem, objval, status='best')
 
     def newcutProblem(self, line):
-        splittedline = line.split()
+        splittedline = misc.getWords(line)
         assert splittedline[0] == '=cut='
         problem = splittedline[1]
         objval = splittedline[2]
@@ -85,7 +112,7 @@ class SoluFileReader(StatisticReader):
         self.storeToStatistics(problem, objval, status='cut')
 
     def newfeasProblem(self, line):
-        splittedline = line.split()
+        splittedline = misc.getWords(line)
         assert splittedline[0] == '=feas='
         problem = splittedline[1]
         objval = np.nan
@@ -93,7 +120,7 @@ class SoluFileReader(StatisticReader):
         self.storeToStatistics(problem, objval, status='feas')
 
     def newbestdualProblem(self, line):
-        splittedline = line.split()
+        splittedline = misc.getWords(line)
         assert splittedline[0] == '=bestdual='
         problem = splittedline[1]
         dualval = splittedline[2]
@@ -12,6 +12,7 @@ please refer to README.md for how to cite IPET.
 """
 from .StatisticReader import StatisticReader
 from ipet import misc
+from ipet import Key
 import re
 
 class VariableReader(StatisticReader):
@@ -24,6 +25,8 @@ class VariableReader(StatisticReader):
     varkeys = ['Vars', 'BinVars', 'IntVars', 'ImplVars', 'ContVars']
     conskeys = ["InitialNCons", "MaxNCons"]
     problemtype = None
+    lineprefixes = ['Presolved Problem  :', 'Original Problem   :', '  Variables        :', '  Constraints      :']
+    sections = [Key.SECTION_STATISTICS]
     
     def extractStatistic(self, line):
         
@@ -35,13 +38,13 @@ class VariableReader(StatisticReader):
      
         # check if the SCIP variable expression is matched by line
         elif self.problemtype and self.varexp.match(line):
-            nvariables = list(map(int, misc.numericExpression.findall(line)[:len(self.varkeys)]))
+            nvariables = list(map(int, misc.getNumbers(line)[:len(self.varkeys)]))
             datakeys = ["%s_%s" % (self.problemtype, key) for key in self.varkeys]
             self.addData(datakeys, nvariables)
 
         # check if the constraint expression is matched by line
         elif self.problemtype and self.consexp.match(line):
-            nconns = list(map(int, misc.numericExpression.findall(line)[:len(self.conskeys)]))
+            nconns = list(map(int, misc.getNumbers(line)[:len(self.conskeys)]))
 
             datakeys = ["%s_%s" % (self.problemtype, key) for key in self.conskeys]
             self.addData(datakeys, nconns)
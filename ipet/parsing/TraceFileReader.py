@@ -30,6 +30,10 @@ class TraceFileReader(StatisticReader):
                 "+INF":+FLOAT_INFINITY
                 }
 
+    def setTestRun(self, testrun):
+        self.testrun = testrun
+        self.tracedata = []
+
     def prepareData(self, value):
         value = self.floatmap.get(value, value)
         if value is None:
@@ -52,7 +56,22 @@ class TraceFileReader(StatisticReader):
             datavalues = list(map(self.prepareData, splitline[1:]))
 
             logging.debug("Trace File Reader adds data for problem %s", probname)
-            self.testrun.addDataByName(self.datakeys, datavalues, probname)
+            self.tracedata.append((probname, datavalues))
+
+    def execEndOfFile(self):
+        """ store the data of all trace lines at once, every run of lines with the same number of values with a single call
+        """
+        start = 0
+        while start < len(self.tracedata):
+            nvalues = len(self.tracedata[start][1])
+            end = start
+            while end < len(self.tracedata) and len(self.tracedata[end][1]) == nvalues:
+                end += 1
+            problemnames = [probname for probname, _ in self.tracedata[start:end]]
+            columns = list(zip(*[datavalues for _, datavalues in self.tracedata[start:end]]))
+            self.testrun.addDataByNames(self.datakeys[:nvalues], problemnames, columns)
+            start = end
+        self.tracedata = []
 
 
 
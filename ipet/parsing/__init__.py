@@ -11,6 +11,7 @@ please refer to README.md for how to cite IPET.
 @author: Gregor Hendel
 """
 from .ReaderManager import ReaderManager
+from .ParseCache import ParseCache
 from .StatisticReader_CustomReader import CustomReader
 from .StatisticReader_SoluFileReader import SoluFileReader
 from .StatisticReader_VariableReader import VariableReader
@@ -181,7 +181,7 @@ class IpetPbHistoryWindow(IpetMainWindow):
 
 
         for tr in testrunfiles:
-            tr = TestRun.loadFromFile(str(tr))
+            tr = TestRun.loadFromFile(str(tr), memorymap = True)
             try:
                 self.addTestrun(tr)
             except Exception as e:
@@ -326,7 +326,7 @@ class IpetPbHistoryWindow(IpetMainWindow):
             for filename in filenames:
                 try:
                     print(filename)
-                    tr = TestRun.loadFromFile(str(filename))
+                    tr = TestRun.loadFromFile(str(filename), memorymap = True)
                     try:
                         self.addTestrun(tr)
                     except Exception as e:
@@ -40,7 +40,7 @@ if withgui:
 required = []
 for r in requirementslist:
     with open(r, 'r') as requirements:
-        required.append(requirements.read().splitlines())
+        required.extend(requirements.read().splitlines())
 
     
 kwargs = {
@@ -55,6 +55,7 @@ kwargs = {
     "author_email": "hendel@zib.de",
     "maintainer_email": "hendel@zib.de",
     "install_requires": required,
+    "python_requires": ">=3.8",
     "url": "https://github.com/GregorCH/ipet",
     "download_url": "https://github.com/GregorCH/ipet/archive/master.zip",
     "keywords": "Mathematical Optimization solver log benchmark parser",
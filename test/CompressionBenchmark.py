@@ -0,0 +1,114 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2016 Zuse Institute Berlin, www.zib.de
+
+Permissions are granted as stated in the license file you have obtained
+with this software. If you find the library useful for your purpose,
+please refer to README.md for how to cite IPET.
+
+@author: Gregor Hendel
+
+compares the parsing throughput of plain and compressed log files, and the write and load times of compressed .trn-files
+
+Run with
+
+    >>> python test/CompressionBenchmark.py [-r REPETITIONS] [-n TESTRUNS] [-w WRITERS] [logfile ...]
+
+For every compression format, the benchmark reports the time for decompressing the log file alone
+and the time for parsing it, next to the parsing time of the uncompressed log file.
+
+For every compression format and level, the benchmark then reports the size of the .trn-files of TESTRUNS copies
+of the parsed test run, the time for writing all of them with WRITERS threads, and the time for loading them.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from ipet.Experiment import Experiment
+from ipet.TestRun import TestRun
+from ipet.misc import misc
+
+DATADIR = os.path.join(os.path.dirname(__file__), "data")
+DEFAULT_LOGFILE = os.path.join(DATADIR, "check.short.scip-3.1.0.1.linux.x86_64.gnu.dbg.spx.opt85.testmode.out")
+TESTRUNCOMPRESSIONS = [(None, None), (".gz", 1), (".gz", 6), (".bz2", 9), (".xz", 0), (".xz", 6)]
+""" pairs of compression extension and compression level of the .trn-files """
+
+def timeDecompression(filename, repetitions):
+    starttime = time.perf_counter()
+    for _ in range(repetitions):
+        with misc.openFile(filename, "rb") as f:
+            while f.read(1 << 20):
+                pass
+    return (time.perf_counter() - starttime) / repetitions
+
+def timeParsing(filename, repetitions):
+    starttime = time.perf_counter()
+    for _ in range(repetitions):
+        experiment = Experiment()
+        experiment.addOutputFile(filename)
+        experiment.collectData()
+    return (time.perf_counter() - starttime) / repetitions
+
+def runBenchmark(logfile, repetitions):
+    tmpdir = tempfile.mkdtemp()
+    try:
+        size = os.path.getsize(logfile)
+        print("%s (%.1f kB)" % (os.path.basename(logfile), size / 1024))
+        print("%-6s %12s %14s %12s" % ("format", "size [kB]", "decompress [s]", "parse [s]"))
+        print("%-6s %12.1f %14s %12.4f" % ("plain", size / 1024, "-", timeParsing(logfile, repetitions)))
+
+        with open(logfile, "rb") as f:
+            content = f.read()
+        for extension, opener in sorted(misc.compressedfileopeners.items()):
+            compressedfile = os.path.join(tmpdir, os.path.basename(logfile) + extension)
+            with opener(compressedfile, "wb") as f:
+                f.write(content)
+            print("%-6s %12.1f %14.4f %12.4f" % (extension, os.path.getsize(compressedfile) / 1024,
+                                               timeDecompression(compressedfile, repetitions),
+                                               timeParsing(compressedfile, repetitions)))
+    finally:
+        shutil.rmtree(tmpdir)
+
+def runTestRunBenchmark(logfile, repetitions, ntestruns, writers):
+    tmpdir = tempfile.mkdtemp()
+    try:
+        experiment = Experiment()
+        root, extension = misc.splitFilename(os.path.basename(logfile))
+        for i in range(ntestruns):
+            copiedlogfile = os.path.join(tmpdir, "%s-%d%s" % (root, i, extension))
+            shutil.copy(logfile, copiedlogfile)
+            experiment.addOutputFile(copiedlogfile)
+        experiment.collectData()
+
+        print("%d test runs written by %d threads" % (ntestruns, writers))
+        print("%-6s %6s %12s %12s %12s" % ("format", "level", "size [kB]", "write [s]", "load [s]"))
+        for compression, compresslevel in TESTRUNCOMPRESSIONS:
+            starttime = time.perf_counter()
+            for _ in range(repetitions):
+                filenames = [filename for _, filename in experiment.saveTestRunFiles(compression, compresslevel, writers)]
+            writetime = (time.perf_counter() - starttime) / repetitions
+
+            starttime = time.perf_counter()
+            for _ in range(repetitions):
+                for filename in filenames:
+                    TestRun.loadFromFile(filename)
+            loadtime = (time.perf_counter() - starttime) / repetitions
+
+            size = sum(os.path.getsize(filename) for filename in filenames)
+            print("%-6s %6s %12.1f %12.4f %12.4f" % (compression or "plain", "-" if compresslevel is None else compresslevel,
+                                                    size / 1024, writetime, loadtime))
+    finally:
+        shutil.rmtree(tmpdir)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "compare the parsing throughput of plain and compressed log files")
+    parser.add_argument("logfiles", nargs = "*", default = [DEFAULT_LOGFILE], help = "uncompressed log files")
+    parser.add_argument("-r", "--repetitions", type = int, default = 5, help = "number of repetitions per measurement")
+    parser.add_argument("-n", "--testruns", type = int, default = 16, help = "number of test runs that are written and loaded")
+    parser.add_argument("-w", "--writers", type = int, default = 4, help = "number of threads that write test runs")
+    args = parser.parse_args()
+    for logfile in args.logfiles:
+        runBenchmark(logfile, args.repetitions)
+        runTestRunBenchmark(logfile, args.repetitions, args.testruns, args.writers)
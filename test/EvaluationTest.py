@@ -158,6 +158,115 @@ class EvaluationTest(unittest.TestCase):
             raise e
 
 
+    def test_requiredKeys(self):
+        ev = IPETEvaluation(index = "ProblemName Settings", indexsplit = 1)
+        col = IPETEvaluationColumn(**columns[0])
+        col.addFilter(IPETFilter(**col_filters[2]))
+        ev.addColumn(col)
+        ev.addColumn(IPETEvaluationColumn(name = "Plugins", regex = "^Heur_"))
+        fg = IPETFilterGroup("nodes")
+        fg.addFilter(IPETFilter("Nodes", "10", "ge"))
+        ev.addFilterGroup(fg)
+        inactive = IPETEvaluationColumn(origcolname = "Gap", active = False)
+        ev.addColumn(inactive)
+
+        required = ev.getRequiredKeys(["Heur_rins", "Heur_rens", "Nodes", "Gap", "Pre_trivial"])
+        for key in ["Status", "SolvingTime", "TimeLimit", "ProblemName", "Settings", "Nodes", "Heur_rins", "Heur_rens"]:
+            self.assertIn(key, required)
+        self.assertNotIn("Gap", required)
+        self.assertNotIn("Pre_trivial", required)
+
+        # test runs from columnar files only load and concatenate the required columns
+        ex = Experiment()
+        ex.addOutputFile(os.path.join(DATADIR, "check.short.scip-3.1.0.1.linux.x86_64.gnu.dbg.spx.opt85.testmode.out"))
+        ex.collectData()
+        trn_file = os.path.join(TMPDIR, "short.trn")
+        ex.getTestRuns()[0].saveToFile(trn_file)
+        ex = Experiment()
+        ex.addOutputFile(trn_file)
+        data = ex.getJoinedData(required)
+        self.assertEqual(sorted(required.intersection(ex.getTestRuns()[0].getKeySet())), sorted(data.columns))
+        self.assertEqual(sorted(data.columns), sorted(ex.getTestRuns()[0].data.columns))
+
+    def test_categoricalIndex(self):
+        ex = Experiment()
+        for out_file in ["cplex-app1-2.out", "cplex-bab5.out", "gurobi-bab5.out"]:
+            ex.addOutputFile(os.path.join(DATADIR, out_file))
+        ex.collectData()
+        self.assertIsInstance(ex.getJoinedData()["Solver"].dtype, pd.CategoricalDtype)
+
+        ev = IPETEvaluation(index = "ProblemName Solver", indexsplit = 1)
+        ev.addColumn(IPETEvaluationColumn(**columns[0]))
+        ev.addFilterGroup(IPETFilterGroup(**filtergroups[0]))
+        tab_long, tab_agg = ev.evaluate(ex)
+        self.assertEqual(["app1-2", "bab5"], list(tab_long.index))
+        self.assertEqual(3, tab_long.count().sum())
+        self.assertEqual(2, len(tab_agg))
+
+        # combinations of categories without data yield no groups
+        df = pd.DataFrame({"ProblemName" : pd.Categorical(["a", "b"], categories = ["a", "b", "c"]),
+                           "Solver" : pd.Categorical(["X", "Y"], categories = ["X", "Y", "Z"]),
+                           "Time" : [1.0, 2.0]})
+        for col in ev.countercolumns:
+            df[col] = 1
+        reduced = ev.reduceByIndex(df)
+        self.assertEqual([("a", "X"), ("b", "Y")], list(zip(reduced["ProblemName"], reduced["Solver"])))
+        self.assertEqual([1.0, 2.0], list(reduced["Time"]))
+
+    def test_historyColumns(self):
+        ex = Experiment()
+        for out_file in ["cplex-app1-2.out", "cplex-bab5.out"]:
+            ex.addOutputFile(os.path.join(DATADIR, out_file))
+        ex.collectData()
+
+        # bound histories are evaluated in their older format of lists of (time, bound) tuples
+        ev = IPETEvaluation(index = "ProblemName", indexsplit = 1)
+        ev.addColumn(IPETEvaluationColumn(origcolname = "PrimalBoundHistory", name = "History"))
+        ev.addFilterGroup(IPETFilterGroup(**filtergroups[0]))
+        tab_long, _ = ev.evaluate(ex)
+        testrun = ex.getTestRuns()[0]
+        times, bounds = testrun.getProblemDataById(0, "PrimalBoundHistory")
+        history = list(zip(times.tolist(), bounds.tolist()))
+        self.assertEqual(str(history), tab_long.loc[testrun.getProblemDataById(0, "ProblemName"), "History"])
+        self.assertEqual(history, ex.getJoinedData(["PrimalBoundHistory"])["PrimalBoundHistory"].iloc[0])
+        self.assertNotIn("PrimalBoundHistory", testrun.getData().columns)
+
+        # missing bound histories are reported instead of evaluated as missing values
+        with self.assertRaisesRegex(KeyError, "DualBoundHistory"):
+            IPETEvaluationColumn(origcolname = "DualBoundHistory").getColumnData(pd.DataFrame({"SolvingTime" : [1.0]}))
+
+    def test_filterPushdown(self):
+        ex = Experiment()
+        for out_file in ["check.short.scip-3.1.0.1.linux.x86_64.gnu.dbg.spx.opt85.testmode.out", "scip-optimal.out", "bell3a.out"]:
+            ex.addOutputFile(os.path.join(DATADIR, out_file))
+        ex.addSoluFile(os.path.join(DATADIR, "short.solu"))
+        ex.collectData()
+        data = ex.getJoinedData().dropna(subset = ["ProblemName", "LogFileName"])
+
+        for filtertype in ["union", "intersection"]:
+            for anytestrun in ["one", "all"]:
+                ev = IPETEvaluation(index = "ProblemName LogFileName", indexsplit = 1)
+                ev.addColumn(IPETEvaluationColumn(**columns[0]))
+                fg = IPETFilterGroup("slow", filtertype = filtertype)
+                fg.addFilter(IPETFilter("SolvingTime", "1", "ge", anytestrun = anytestrun))
+                ev.addFilterGroup(fg)
+                rowfilter = ev.getPushdownFilter(ex)
+                self.assertIsNotNone(rowfilter)
+
+                # the filter group yields the same problems on the pruned data
+                pruned = ex.getJoinedData(rowfilter = rowfilter).dropna(subset = ["ProblemName", "LogFileName"])
+                self.assertLess(len(pruned), len(data))
+                expected = set(fg.filterDataFrame(data, ["ProblemName"])["ProblemName"])
+                self.assertEqual(expected, set(fg.filterDataFrame(pruned, ["ProblemName"])["ProblemName"]))
+
+        # filters on computed columns are not pushed down
+        ev = IPETEvaluation(index = "ProblemName LogFileName", indexsplit = 1)
+        ev.addColumn(IPETEvaluationColumn(**columns[0]))
+        fg = IPETFilterGroup("hard", filtertype = "union")
+        fg.addFilter(IPETFilter(**filters[1]))
+        ev.addFilterGroup(fg)
+        self.assertIsNone(ev.getPushdownFilter(ex))
+
     def test_xml(self):
         """
         test construction of modified evaluations, and if they persist after constructing a twin directly from the XML representation
@@ -11,21 +11,49 @@ please refer to README.md for how to cite IPET.
 """
 import unittest
 import os
+import glob
+import random
 import json
 import re
 import shutil
 import sys
+import pickle
 import numpy as np
-from pandas.util.testing import assert_frame_equal
+from pandas.testing import assert_frame_equal
 from ipet.Experiment import Experiment
 from ipet.TestRun import TestRun
-from ipet.parsing import ListReader
-from ipet.parsing import ReaderManager
-from ipet import Key
+from ipet.parsing import ListReader, NodesReader, GapReader, BestSolInfeasibleReader, CustomReader
+from ipet.parsing.ReaderDispatcher import ReaderDispatcher
+from ipet.parsing.TraceFileReader import TraceFileReader
+from ipet.parsing.Solver import SCIPSolver
+from ipet.parsing import ReaderManager, ParseCache
+from ipet import Key, Schema
+from ipet.misc import misc
+from ipet.misc.integrals import calcIntegralValue, getProcessPlotData
 
 DATADIR = os.path.join(os.path.dirname(__file__), "data")
 TMPDIR = os.path.join(os.path.dirname(__file__), ".tmp")
 
+class ScalarValidationExperiment(Experiment):
+    """
+    calculates gaps and problem status codes problem by problem, as reference for the vectorized validation
+    """
+
+    def calculateGaps(self):
+        for testrun in self.getTestRuns():
+            for problemid in testrun.getProblemIds():
+                optval = testrun.getProblemDataById(problemid, Key.OptimalValue)
+                if optval is not None:
+                    for key in [Key.PrimalBound, Key.DualBound]:
+                        val = testrun.getProblemDataById(problemid, key)
+                        if val is not None:
+                            testrun.addDataById(key[:-5] + "Gap", misc.getGap(val, optval, True), problemid)
+
+    def checkProblemStatus(self):
+        for testrun in self.getTestRuns():
+            for problemid in testrun.getProblemIds():
+                testrun.addDataById(Key.ProblemStatus, self.determineStatus(testrun, problemid), problemid)
+
 
 class ExperimentTest(unittest.TestCase):
 #     datasamples = [
@@ -95,6 +123,619 @@ class ExperimentTest(unittest.TestCase):
 
         self.checkTestrunsEqual(trstdin, trfile, columns)
 
+    def test_parallel_datacollection(self):
+        out_files = sorted(glob.glob(os.path.join(DATADIR, "*.out")))
+        solu_file = os.path.join(DATADIR, "short.solu")
+
+        experimentparallel = Experiment()
+        for experiment in (self.experiment, experimentparallel):
+            for out_file in out_files:
+                experiment.addOutputFile(out_file)
+            experiment.addSoluFile(solu_file)
+
+        self.experiment.collectData()
+        experimentparallel.collectData(workers = 2)
+
+        for tr in self.experiment.getTestRuns():
+            tr2 = experimentparallel.testrunmanager.getManageable(tr.getName())
+            self.assertEqual(sorted(tr.getKeySet()), sorted(tr2.getKeySet()))
+            # request all keys explicitly to compare the histories, too
+            datakeys = sorted(tr.getKeySet())
+            assert_frame_equal(tr.getData(datakeys), tr2.getData(datakeys), check_like = True, obj = tr.getName())
+
+    def test_chunked_datacollection(self):
+        fname = "check.short.scip-3.1.0.1.linux.x86_64.gnu.dbg.spx.opt85.testmode.out"
+        out_file = os.path.join(DATADIR, fname)
+        solu_file = os.path.join(DATADIR, "short.solu")
+
+        experimentchunked = Experiment()
+        for experiment in (self.experiment, experimentchunked):
+            experiment.addOutputFile(out_file)
+            experiment.addSoluFile(solu_file)
+
+        self.experiment.collectData()
+        # a single test run is split into chunks of problems
+        experimentchunked.collectData(workers = 3)
+
+        tr = self.experiment.getTestRuns()[0]
+        tr2 = experimentchunked.getTestRuns()[0]
+        self.assertEqual(sorted(tr.getData().columns), sorted(tr2.getData().columns))
+        self.checkTestrunsEqual(tr, tr2, list(tr.getData().columns))
+
+    def test_singlepass_solverdetection(self):
+        out_file = os.path.join(DATADIR, "bell3a.out")
+        self.experiment.addOutputFile(out_file)
+        self.experiment.collectData()
+        readermanager = self.experiment.readermanager
+        self.assertEqual("SCIP", readermanager.solvercache[readermanager.getSolverCacheKey(out_file)])
+
+        # the lines consumed by the solver detection are not read again from the file
+        with open(out_file, "r") as f:
+            filelines = f.readlines()
+        testrun = TestRun([out_file])
+        readermanager.setTestRun(testrun)
+        testrun.iterationPrepare()
+        while testrun.iterationNextFile() and testrun.iterationGetCurrentFile() != out_file:
+            pass
+        del readermanager.solvercache[readermanager.getSolverCacheKey(out_file)]
+        readermanager.readSolverType()
+        self.assertTrue(len(testrun.consumedinput) > 0)
+        self.assertEqual(list(enumerate(filelines)), list(testrun))
+        testrun.iterationCleanUp()
+        self.assertIsNone(testrun.currentinput)
+
+        # every reader manager has its own bounded solver cache, whose keys depend on the solvers of the manager
+        othermanager = ReaderManager()
+        self.assertEqual(0, len(othermanager.solvercache))
+        othermanager.solvers = [solver for solver in othermanager.solvers if solver.getName() != "SCIP"]
+        self.assertNotEqual(readermanager.getSolverCacheKey(out_file), othermanager.getSolverCacheKey(out_file))
+        for i in range(ReaderManager.SOLVERCACHE_SIZE + 1):
+            othermanager.cacheSolverName(("file%d" % i,), "")
+        self.assertEqual(ReaderManager.SOLVERCACHE_SIZE, len(othermanager.solvercache))
+        self.assertNotIn(("file0",), othermanager.solvercache)
+
+    def test_parsecache(self):
+        out_file = os.path.join(DATADIR, "check.short.scip-3.1.0.1.linux.x86_64.gnu.dbg.spx.opt85.testmode.out")
+        solu_file = os.path.join(DATADIR, "short.solu")
+        cachedir = os.path.join(TMPDIR, "cache")
+
+        experiments = [Experiment() for _ in range(4)]
+        for experiment in [self.experiment] + experiments:
+            experiment.addOutputFile(out_file)
+            experiment.addSoluFile(solu_file)
+        self.experiment.collectData()
+
+        caches = [ParseCache(cachedir) for _ in experiments]
+        # a changed reader configuration invalidates the cache
+        experiments[2].addReader(ListReader("Sep([ab]) +([^ ]*)", "testlr"))
+        for experiment, cache in zip(experiments, caches):
+            experiment.collectData(cache = cache)
+
+        self.assertEqual([(0, 1), (1, 0), (0, 1), (1, 0)], [(cache.hits, cache.misses) for cache in caches])
+        tr = self.experiment.getTestRuns()[0]
+        for experiment in experiments[:2]:
+            self.checkTestrunsEqual(tr, experiment.getTestRuns()[0], list(tr.getData().columns))
+
+        # a change of the parsing code outside of the readers invalidates the cache
+        fingerprint = caches[0].getReaderFingerprint(experiments[0].readermanager)
+        sourcefingerprint = ParseCache.getSourceFingerprint()
+        ParseCache.sourcefingerprint = "changed"
+        try:
+            self.assertNotEqual(fingerprint, caches[0].getReaderFingerprint(experiments[0].readermanager))
+        finally:
+            ParseCache.sourcefingerprint = sourcefingerprint
+
+    def test_parsecachecontent(self):
+        out_file = os.path.join(TMPDIR, "short.out")
+        shutil.copy(os.path.join(DATADIR, "check.short.scip-3.1.0.1.linux.x86_64.gnu.dbg.spx.opt85.testmode.out"), out_file)
+        cache = ParseCache(os.path.join(TMPDIR, "cache"))
+        experiment = Experiment()
+        experiment.addOutputFile(out_file)
+        experiment.collectData(cache = cache)
+        self.assertEqual((0, 1), (cache.hits, cache.misses))
+
+        # a modification that keeps the size and modification time is detected by the content hashes of the parsed file
+        stat = os.stat(out_file)
+        with open(out_file, "r+b") as f:
+            content = f.read()
+            f.seek(0)
+            f.write(content.replace(b"SCIP", b"PICS"))
+        os.utime(out_file, ns = (stat.st_atime_ns, stat.st_mtime_ns))
+        for _ in range(2):
+            experiment = Experiment()
+            experiment.addOutputFile(out_file)
+            experiment.collectData(cache = cache)
+        self.assertEqual((1, 2), (cache.hits, cache.misses))
+
+        # entries without content hashes are not used
+        cachefiles = [os.path.join(cache.cachedir, filename) for filename in os.listdir(cache.cachedir)]
+        self.assertEqual([ParseCache.HASH_EXTENSION, ParseCache.FILE_EXTENSION], sorted(os.path.splitext(filename)[1] for filename in cachefiles))
+        cachefile, hashfile = sorted(cachefiles, key = lambda filename : filename.endswith(ParseCache.HASH_EXTENSION))
+        os.remove(hashfile)
+        experiment = Experiment()
+        experiment.addOutputFile(out_file)
+        experiment.collectData(cache = cache)
+        self.assertEqual((1, 3), (cache.hits, cache.misses))
+
+        # the least recently used test runs are removed if the cache exceeds its size
+        cache = ParseCache(cache.cachedir, os.path.getsize(cachefile))
+        other_file = os.path.join(TMPDIR, "other.out")
+        shutil.copy(out_file, other_file)
+        experiment = Experiment()
+        experiment.addOutputFile(other_file)
+        experiment.collectData(cache = cache)
+        self.assertEqual([ParseCache.HASH_EXTENSION, ParseCache.FILE_EXTENSION], sorted(os.path.splitext(filename)[1] for filename in os.listdir(cache.cachedir)))
+        self.assertFalse(os.path.exists(cachefile))
+
+    def test_soludata(self):
+        out_files = [os.path.join(DATADIR, "cplex-%s.out" % name) for name in ["app1-2", "enlight14"]]
+        solu_file = os.path.join(DATADIR, "MMM.solu")
+        cache = ParseCache(os.path.join(TMPDIR, "cache"))
+
+        # the solu file is no input file of the test runs anymore, but parsed once and joined by problem name
+        experiments = [Experiment() for _ in range(2)]
+        for experiment in experiments:
+            for out_file in out_files:
+                experiment.addOutputFile(out_file)
+            experiment.addSoluFile(solu_file)
+            experiment.collectData(cache = cache)
+        self.assertNotIn(solu_file, experiments[0].getTestRuns()[0].filenames)
+        self.assertTrue(os.path.isfile(os.path.join(cache.cachedir, cache.getTableKey(solu_file, "solu") + ParseCache.TABLE_EXTENSION)))
+
+        data = experiments[1].getJoinedData([Key.ProblemName, Key.OptimalValue, Key.SolutionFileStatus]).set_index(Key.ProblemName)
+        self.assertEqual(-41.0, data.loc["app1-2", Key.OptimalValue])
+        self.assertEqual(["opt", "inf"], list(data[Key.SolutionFileStatus]))
+
+        # compare with reading the solu file as an input file of every test run
+        for testruns in zip(*[experiment.getTestRuns() for experiment in experiments]):
+            reference = TestRun(testruns[0].filenames + [solu_file])
+            experiments[0].readermanager.setTestRun(reference)
+            experiments[0].readermanager.collectData()
+            reference.setupAfterDataCollection()
+            for testrun in testruns:
+                self.checkTestrunsEqual(reference, testrun, [Key.ProblemName, Key.OptimalValue, Key.SolutionFileStatus])
+
+    def checkValidationEqual(self, experiment, reference):
+        for testrun, referencetestrun in zip(experiment.getTestRuns(), reference.getTestRuns()):
+            for problemid in referencetestrun.getProblemIds():
+                for datakey in ["PrimalGap", "DualGap", Key.ProblemStatus]:
+                    expected = referencetestrun.getProblemDataById(problemid, datakey)
+                    value = testrun.getProblemDataById(problemid, datakey)
+                    self.assertTrue(repr(expected) == repr(value), "%s %s %s: %s != %s" %
+                                    (testrun.getName(), problemid, datakey, repr(expected), repr(value)))
+
+    def test_validation(self):
+        # the vectorized validation agrees with the scalar validation on the bundled data
+        for validatedual in [False, True]:
+            for out_file in sorted(glob.glob(os.path.join(DATADIR, "*.out"))):
+                experiments = [Experiment(validatedual = validatedual), ScalarValidationExperiment(validatedual = validatedual)]
+                for experiment in experiments:
+                    experiment.addOutputFile(out_file)
+                    for solu_file in ["short.solu", "MMM.solu"]:
+                        experiment.addSoluFile(os.path.join(DATADIR, solu_file))
+                    experiment.collectData()
+                self.checkValidationEqual(*experiments)
+
+    def test_validationDecisionTable(self):
+        # random problems that cover every rule, including missing and NaN values
+        rng = random.Random(0)
+        bounds = [None, np.nan, 0.0, 1e-9, 5.0, -5.0, 4.9, 5.0000001, 10, 1e20, -1e20]
+        choices = {
+            Key.PrimalBound : bounds,
+            Key.DualBound : bounds,
+            Key.ObjectiveLimit : [np.nan, 4.0, 5.0, 6.0],
+            Key.ObjectiveSense : [None, 1, -1],
+            Key.SolverStatus : [None, -1, 0, 1, 2, 3, 4, 5, "objectiveLimit"],
+            Key.ErrorCode : [None, None, None, 1],
+            Key.BestSolutionInfeasible : [None, True, False],
+            Key.SolvingTime : [None, 1.0, 1.0]
+            }
+        testrun = TestRun(["validation.out"])
+        for problemid in range(5000):
+            solustatus = rng.choice([None, "opt", "best", "inf", "unkn"])
+            optval = rng.choice([0.0, 1e-10, 5.0, -5.0, 5.0000001] if solustatus in ["opt", "best"] else [None, np.nan])
+            datakeys = [Key.ProblemName, Key.SolutionFileStatus, Key.OptimalValue] + list(choices.keys())
+            data = ["p%d" % problemid, solustatus, optval] + [rng.choice(values) for values in choices.values()]
+            testrun.addDataById(datakeys, data, problemid)
+        testrun.currentproblemid = 5000
+
+        for gaptol, validatedual in [(1e-4, False), (1e-4, True), (0.1, True)]:
+            experiments = [Experiment(gaptol = gaptol, validatedual = validatedual),
+                           ScalarValidationExperiment(gaptol = gaptol, validatedual = validatedual)]
+            for experiment in experiments:
+                experiment.testrunmanager.addAndActivate(pickle.loads(pickle.dumps(testrun)))
+                experiment.calculateGaps()
+                experiment.checkProblemStatus()
+            self.checkValidationEqual(*experiments)
+
+    def checkIntegralsEqual(self, testrun):
+        for problemid in testrun.getProblemIds():
+            for historykey, integralkey, pwlinear in [("PrimalBoundHistory", "PrimalIntegral", False),
+                                                      ("DualBoundHistory", "DualIntegral", True)]:
+                processplotdata = getProcessPlotData(testrun, problemid, historytouse = historykey)
+                value = testrun.getProblemDataById(problemid, integralkey)
+                if processplotdata is None:
+                    self.assertIsNone(value)
+                    continue
+                expected = calcIntegralValue(processplotdata, pwlinear = pwlinear)
+                if np.isnan(expected):
+                    self.assertTrue(np.isnan(value), "%s %s: %s != nan" % (problemid, integralkey, value))
+                else:
+                    self.assertAlmostEqual(expected, value, delta = 1e-12 * max(abs(expected), 1.0))
+
+    def test_integrals(self):
+        # the integrals of all problems are calculated at once and agree with the per-problem calculation
+        for out_file in sorted(glob.glob(os.path.join(DATADIR, "*.out"))):
+            experiment = Experiment()
+            experiment.addOutputFile(out_file)
+            experiment.addSoluFile(os.path.join(DATADIR, "MMM.solu"))
+            experiment.collectData()
+            self.checkIntegralsEqual(experiment.getTestRuns()[0])
+
+        # histories with missing, NaN, and infinite data
+        testrun = TestRun(["integrals.out"])
+        problems = [
+                    (None, None, None, None),
+                    ([(1.0, 10.0), (2.0, 5.0)], 3.0, None, 5.0),
+                    ([(1.0, 10.0), (2.0, 5.0)], 1.5, 100.0, np.nan),
+                    ([], None, 10.0, 5.0),
+                    ([(0.5, 1e20), (2.0, 0.0)], 4.0, None, 0.0),
+                    ([(1.0, -3.0)], np.nan, None, -3.0),
+                    (None, 2.0, None, 1e20),
+                    ([(1.0, np.nan), (2.0, 4.0), (3.0, 4.0)], 5.0, None, 4.0)
+                    ]
+        for problemid, (history, solvingtime, timelimit, optval) in enumerate(problems):
+            testrun.addDataById(["ProblemName", "PrimalBoundHistory", "DualBoundHistory", "SolvingTime", "TimeLimit", "OptVal"],
+                                ["p%d" % problemid, history, history, solvingtime, timelimit, optval], problemid)
+        testrun.currentproblemid = len(problems)
+        experiment = Experiment()
+        experiment.testrunmanager.addAndActivate(testrun)
+        experiment.calculateIntegrals()
+        self.assertIsNone(testrun.getProblemDataById(0, "PrimalIntegral"))
+        self.assertEqual(100 * 1.0 + 50 * 1.0 + 0 * 1.0, testrun.getProblemDataById(1, "PrimalIntegral"))
+        self.checkIntegralsEqual(testrun)
+
+    def getClippedIntegral(self, processplotdata, horizon, pwlinear):
+        x, y = processplotdata
+        if horizon is not None:
+            # cut the process plot off at the horizon, or continue its last value until the horizon
+            before = x < horizon
+            nbefore = np.count_nonzero(before)
+            if nbefore == 0:
+                return 0.0
+            if nbefore < len(x):
+                later = nbefore
+                fraction = (horizon - x[later - 1]) / (x[later] - x[later - 1])
+                value = y[later - 1] + (y[later] - y[later - 1]) * fraction if pwlinear else y[later - 1]
+            else:
+                value = y[-1]
+            x = np.append(x[before], horizon)
+            y = np.append(y[before], value)
+        if len(x) < 2:
+            return 0.0
+        return calcIntegralValue((x, y), pwlinear = pwlinear)
+
+    def checkIntegralSweepEqual(self, experiment, cutoffgaps, xlimitkeys):
+        testrun = experiment.getTestRuns()[0]
+        for historykey, pwlinear in [("PrimalBoundHistory", False), ("DualBoundHistory", True)]:
+            sweep = experiment.calculateIntegralSweep(cutoffgaps, xlimitkeys, [True, False], historykey)
+            self.assertEqual(len(sweep), len(sweep.drop_duplicates(["ProblemId", "Normalize", "CutoffGap", "XLimitKey"])))
+            for normalize in [True, False]:
+                for cutoffgap in cutoffgaps if normalize else [misc.FLOAT_INFINITY]:
+                    for xlimitkey in xlimitkeys:
+                        rows = sweep[(sweep.Normalize == normalize) & (sweep.CutoffGap.fillna(misc.FLOAT_INFINITY) == cutoffgap) &
+                                     sweep.XLimitKey.apply(lambda key: key == xlimitkey)]
+                        integrals = dict(zip(rows.ProblemId, rows.Integral))
+                        for problemid in testrun.getProblemIds():
+                            processplotdata = getProcessPlotData(testrun, problemid, normalize = normalize,
+                                                                 historytouse = historykey, cutoffgap = cutoffgap)
+                            if processplotdata is None:
+                                self.assertNotIn(problemid, integrals)
+                                continue
+                            horizon = None if xlimitkey is None else testrun.getProblemDataById(problemid, xlimitkey)
+                            expected = self.getClippedIntegral(processplotdata, horizon, pwlinear)
+                            value = integrals[problemid]
+                            message = "%s %s %s %s %s: %s != %s" % (problemid, historykey, normalize, cutoffgap, xlimitkey, value, expected)
+                            if np.isnan(expected):
+                                self.assertTrue(np.isnan(value), message)
+                            else:
+                                self.assertAlmostEqual(expected, value, delta = 1e-12 * max(abs(expected), 1.0), msg = message)
+
+    def test_integralsweep(self):
+        # every variant of the sweep agrees with the per-problem calculation of the process plot data
+        for out_file in sorted(glob.glob(os.path.join(DATADIR, "*.out"))):
+            experiment = Experiment()
+            experiment.addOutputFile(out_file)
+            experiment.addSoluFile(os.path.join(DATADIR, "MMM.solu"))
+            experiment.collectData()
+            self.checkIntegralSweepEqual(experiment, [100, 1.0], [None, "TimeLimit"])
+
+        # stored variants are available as data columns after the data collection
+        sweep = experiment.calculateIntegralSweep([100, 1.0], [None, "TimeLimit"], [True], store = True)
+        data = experiment.getJoinedData()
+        testrun = experiment.getTestRuns()[0]
+        for normalize, cutoffgap, xlimitkey, integral, problemid in zip(sweep.Normalize, sweep.CutoffGap, sweep.XLimitKey,
+                                                                        sweep.Integral, sweep.ProblemId):
+            datakey = Experiment.getIntegralSweepKey("PrimalIntegral", normalize, cutoffgap, xlimitkey)
+            self.assertIn(datakey, data.columns)
+            self.assertEqual(integral, testrun.getProblemDataById(problemid, datakey))
+        self.assertTrue(data["PrimalIntegral"].equals(data["PrimalIntegral_Gap100"]))
+
+        # histories with missing, NaN, and infinite data, and horizons before, within, and after the histories
+        testrun = TestRun(["integrals.out"])
+        problems = [
+                    (None, None, None, None),
+                    ([(1.0, 10.0), (2.0, 5.0)], 3.0, None, 5.0),
+                    ([(1.0, 10.0), (2.0, 5.0)], 1.5, 100.0, np.nan),
+                    ([], None, 10.0, 5.0),
+                    ([(0.5, 1e20), (2.0, 0.0)], 4.0, 1.0, 0.0),
+                    ([(1.0, -3.0)], np.nan, None, -3.0),
+                    (None, 2.0, None, 1e20),
+                    ([(1.0, np.nan), (2.0, 4.0), (3.0, 4.0)], 5.0, 2.5, 4.0),
+                    ([(1.0, 10.0), (3.0, 6.0)], 4.0, 2.0, 5.0),
+                    ([(1.0, 10.0), (3.0, 6.0)], 4.0, 0.5, 5.0),
+                    ([(1.0, 10.0), (3.0, 6.0)], 4.0, 3.0, 5.0)
+                    ]
+        for problemid, (history, solvingtime, timelimit, optval) in enumerate(problems):
+            testrun.addDataById(["ProblemName", "PrimalBoundHistory", "DualBoundHistory", "SolvingTime", "TimeLimit", "OptVal"],
+                                ["p%d" % problemid, history, history, solvingtime, timelimit, optval], problemid)
+        testrun.currentproblemid = len(problems)
+        experiment = Experiment()
+        experiment.testrunmanager.addAndActivate(testrun)
+        self.checkIntegralSweepEqual(experiment, [100, 10, 0.5], [None, "TimeLimit"])
+        sweep = experiment.calculateIntegralSweep([100], ["TimeLimit"], [True])
+        self.assertEqual(100 * 1.0 + 50 * 1.0, sweep.Integral[sweep.ProblemId == 8].item())
+
+    def test_followdata(self):
+        fname = "check.short.scip-3.1.0.1.linux.x86_64.gnu.dbg.spx.opt85.testmode.out"
+        out_file = os.path.join(DATADIR, fname)
+        solu_file = os.path.join(DATADIR, "short.solu")
+        follow_file = os.path.join(TMPDIR, fname)
+        with open(out_file, "rb") as f:
+            content = f.read()
+        # the log file grows in chunks that end in the middle of lines
+        open(follow_file, "wb").close()
+
+        experimentfollow = Experiment()
+        for experiment, filename in ((self.experiment, out_file), (experimentfollow, follow_file)):
+            experiment.addOutputFile(filename)
+            experiment.addSoluFile(solu_file)
+
+        self.experiment.collectData()
+        experimentfollow.startFollowing()
+        finishedproblemids = []
+        chunksize = 997
+        for start in range(0, len(content), chunksize):
+            with open(follow_file, "ab") as f:
+                f.write(content[start:start + chunksize])
+            for _, problemids in experimentfollow.followData():
+                finishedproblemids.extend(problemids)
+        experimentfollow.stopFollowing()
+
+        tr = self.experiment.getTestRuns()[0]
+        tr2 = experimentfollow.getTestRuns()[0]
+        self.assertEqual(list(range(len(tr.getData()))), finishedproblemids)
+        columns = [c for c in tr.getData().columns if c != Key.LogFileName]
+        self.assertEqual(sorted(tr.getData().columns), sorted(tr2.getData().columns))
+        self.checkTestrunsEqual(tr, tr2, columns)
+
+    def test_compressed_datacollection(self):
+        fname = "check.short.scip-3.1.0.1.linux.x86_64.gnu.dbg.spx.opt85.testmode.out"
+        out_file = os.path.join(DATADIR, fname)
+        solu_file = os.path.join(DATADIR, "short.solu")
+        self.experiment.addOutputFile(out_file)
+        self.experiment.addSoluFile(solu_file)
+        self.experiment.collectData()
+        tr = self.experiment.getTestRuns()[0]
+        columns = [c for c in tr.getData().columns if c != Key.LogFileName]
+
+        with open(out_file, "rb") as f:
+            content = f.read()
+        for extension, opener in misc.compressedfileopeners.items():
+            compressed_file = os.path.join(TMPDIR, fname + extension)
+            with opener(compressed_file, "wb") as f:
+                f.write(content)
+
+            experiment = Experiment()
+            experiment.addOutputFile(compressed_file)
+            experiment.addSoluFile(solu_file)
+            experiment.collectData(workers = 2)
+            tr2 = experiment.getTestRuns()[0]
+            self.assertEqual(tr.getIdentification(), tr2.getIdentification())
+            self.checkTestrunsEqual(tr, tr2, columns)
+
+    def test_columnardatacollection(self):
+        testrun = TestRun(["columnar.out"])
+        testrun.addDataById(["ProblemName", "Nodes", "SolvingTime", "PrimalBound"], ["a", 5, 1.5, None], 0)
+        testrun.addDataById(["ProblemName", "Nodes", "SolvingTime", "PrimalBound"], ["b", 7, 2, 3.0], 1)
+        testrun.addDataById(["ProblemName", "Nodes"], ["c", 2**70], 2)
+        testrun.addDataById("Timeout", True, 3)
+        self.assertIsNone(testrun.getProblemDataById(0, "PrimalBound"))
+        self.assertEqual(2**70, testrun.getProblemDataById(2, "Nodes"))
+        self.assertEqual(["a", "b", "c"], testrun.getProblemNames())
+        self.assertEqual({"ProblemName" : "b", "Nodes" : 7, "SolvingTime" : 2.0, "PrimalBound" : 3.0},
+                         testrun.getCollectedProblemData(1))
+
+        # deleted problems do not appear in the data frame
+        testrun.deleteProblemDataById(2)
+        testrun.currentproblemid = 4
+        other = TestRun(["columnar.out"])
+        other.addDataById(["ProblemName", "Nodes"], ["d", 9], 0)
+        other.currentproblemid = 1
+        testrun.appendProblemData(other)
+        testrun.setupAfterDataCollection()
+
+        df = testrun.getData()
+        self.assertEqual([0, 1, 3, 4], list(df.index))
+        self.assertEqual(np.float64, df["SolvingTime"].dtype)
+        self.assertEqual(np.float64, df["Nodes"].dtype)
+        self.assertEqual([5, 7, 9], list(df["Nodes"].dropna()))
+        self.assertEqual(["a", "b", "d"], list(df["ProblemName"].dropna()))
+        self.assertEqual(True, df.loc[3, "Timeout"])
+
+        # the data frame survives the conversion back into columns
+        testrun.setupForDataCollection()
+        self.assertEqual(9, testrun.getProblemDataById(4, "Nodes"))
+        testrun.setupAfterDataCollection()
+        assert_frame_equal(df, testrun.getData())
+
+    def test_problemNameIndex(self):
+        testrun = TestRun(["names.out"])
+        for problemid, name in enumerate(["a", "b", "a", "c"]):
+            testrun.addDataById(["ProblemName", "SolvingTime"], [name, float(problemid)], problemid)
+        testrun.currentproblemid = 4
+        self.assertEqual([0, 2], testrun.getProblemIdsByName("a"))
+        self.assertTrue(testrun.hasProblemName("c"))
+        self.assertFalse(testrun.hasProblemName("d"))
+
+        # unknown names are ignored, and the last occurrence of a name wins
+        testrun.addDataByNames(["OptimalValue", "SolutionFileStatus"], ["a", "d", "c", "a"],
+                               [[1.0, 2.0, 3.0, 4.0], ["opt", "opt", "best", "best"]])
+        self.assertEqual([4.0, None, 4.0, 3.0], [testrun.getProblemDataById(i, "OptimalValue") for i in range(4)])
+        self.assertEqual("best", testrun.getProblemDataByName("c", "SolutionFileStatus"))
+
+        # the index is maintained while problems are collected and deleted
+        testrun.addData("ProblemName", "b")
+        testrun.finalizeCurrentCollection(SCIPSolver())
+        self.assertEqual([1, 4], testrun.getProblemIdsByName("b"))
+        testrun.deleteProblemDataById(0)
+        self.assertEqual([2], testrun.getProblemIdsByName("a"))
+
+        reader = TraceFileReader()
+        reader.setTestRun(testrun)
+        for line in ["* Trace Record Definition", "b,MIP,SCIP,,0,10", "e,MIP,SCIP,,0,20", "c,LP,CPLEX"]:
+            reader.extractStatistic(line)
+        reader.execEndOfFile()
+        self.assertEqual(["MIP", None, "LP", "MIP"], [testrun.getProblemDataById(i, "ModelType") for i in range(1, 5)])
+        self.assertEqual([10, None, None, 10], [testrun.getProblemDataById(i, "NumberOfEquations") for i in range(1, 5)])
+
+        testrun.setupAfterDataCollection()
+        self.assertEqual([2], testrun.getProblemIdsByName("a"))
+        self.assertEqual(3.0, testrun.getProblemDataByName("c", "OptimalValue"))
+        self.assertIsNone(testrun.getProblemDataByName("d", "OptimalValue"))
+        testrun.deleteProblemDataById(2)
+        self.assertFalse(testrun.hasProblemName("a"))
+
+    def test_historycolumns(self):
+        testrun = TestRun(["histories.out"])
+        testrun.addDataById(["ProblemName", "PrimalBoundHistory", "SolvingTime"], ["a", [(1.0, 10.0), (2.0, 5.0)], 3.0], 0)
+        testrun.addDataById(["ProblemName", "PrimalBoundHistory", "SolvingTime"], ["b", [], 1.0], 1)
+        testrun.addDataById(["ProblemName", "PrimalBoundHistory", "SolvingTime"], ["c", [(0.5, 7.0)], 2.0], 2)
+        # overwrite the history of the first problem
+        testrun.addDataById("PrimalBoundHistory", [(1.0, 10.0), (2.0, 5.0), (2.5, 4.0)], 0)
+        testrun.currentproblemid = 3
+        x, y = getProcessPlotData(testrun, 0, normalize = False)
+        self.assertEqual([1.0, 2.0, 2.5, 3.0], list(x))
+        self.assertEqual([10.0, 5.0, 4.0, 4.0], list(y))
+        integral = calcIntegralValue((x, y))
+        testrun.setupAfterDataCollection()
+
+        # histories are not part of the data frame, but views of contiguous arrays
+        self.assertNotIn("PrimalBoundHistory", testrun.getData().columns)
+        self.assertIn("PrimalBoundHistory", testrun.getKeySet())
+        column = testrun.histories["PrimalBoundHistory"]
+        self.assertEqual([1.0, 2.0, 2.5, 0.5], list(column.times))
+        times, values = testrun.getProblemDataById(0, "PrimalBoundHistory")
+        self.assertIs(column.times, times.base)
+        self.assertEqual(0, len(testrun.getProblemDataById(1, "PrimalBoundHistory")[0]))
+        self.assertEqual([7.0], list(testrun.getProblemDataByName("c", "PrimalBoundHistory")[1]))
+        self.assertEqual(integral, calcIntegralValue(getProcessPlotData(testrun, 0, normalize = False)))
+        times, values, offsets = column.getArrays([0, 1, 2])
+        self.assertEqual([0, 3, 3, 4], list(offsets))
+
+        # histories survive pickling and older pickles with histories in the data frame
+        restored = pickle.loads(pickle.dumps(testrun))
+        self.assertEqual([4.0], list(restored.getProblemDataById(0, "PrimalBoundHistory")[1][2:]))
+        legacy = testrun.__dict__.copy()
+        del legacy["histories"]
+        legacy["data"] = testrun.getData().assign(PrimalBoundHistory = [[(1.0, 10.0)], [], [(0.5, 7.0)]])
+        restored = TestRun.__new__(TestRun)
+        restored.__setstate__(legacy)
+        self.assertNotIn("PrimalBoundHistory", restored.getData().columns)
+        self.assertEqual([10.0], list(restored.getProblemDataById(0, "PrimalBoundHistory")[1]))
+
+    def test_columnstore(self):
+        out_file = os.path.join(DATADIR, "check.short.scip-3.1.0.1.linux.x86_64.gnu.dbg.spx.opt85.testmode.out")
+        self.experiment.addOutputFile(out_file)
+        self.experiment.addSoluFile(os.path.join(DATADIR, "short.solu"))
+        self.experiment.collectData()
+        tr = self.experiment.getTestRuns()[0]
+        trn_file = os.path.join(TMPDIR, "columnstore.trn")
+        tr.saveToFile(trn_file)
+
+        # only the requested columns are loaded, the remaining columns on demand
+        tr2 = TestRun.loadFromFile(trn_file, [Key.SolvingTime, Key.ProblemStatus])
+        self.assertEqual([Key.SolvingTime, Key.ProblemStatus], list(tr2.data.columns))
+        self.assertEqual(tr.getKeySet(), tr2.getKeySet())
+        self.assertEqual(tr.getProblemDataById(3, Key.Nodes), tr2.getProblemDataById(3, Key.Nodes))
+        self.assertNotIn(Key.PrimalBoundHistory, tr2.histories)
+        self.assertEqual(list(tr.getProblemDataById(3, Key.PrimalBoundHistory)[0]), list(tr2.getProblemDataById(3, Key.PrimalBoundHistory)[0]))
+        assert_frame_equal(tr.getData(), tr2.getData())
+        self.assertIsNone(tr2.columnstore)
+
+        # lazily loaded test runs can be pickled, and pickled test runs remain readable
+        tr3 = pickle.loads(pickle.dumps(TestRun.loadFromFile(trn_file, [])))
+        assert_frame_equal(tr.getData(), tr3.getData())
+        pickle_file = os.path.join(TMPDIR, "pickled.trn")
+        with open(pickle_file, "wb") as f:
+            pickle.dump(tr, f, protocol = 2)
+        assert_frame_equal(tr.getData(), TestRun.loadFromFile(pickle_file).getData())
+
+        # the header of a lazily loaded test run does not describe a replaced file
+        tr4 = TestRun.loadFromFile(trn_file, [])
+        tr.saveToFile(trn_file)
+        with self.assertRaises(IOError):
+            tr4.getData()
+
+    def test_memorymap(self):
+        out_file = os.path.join(DATADIR, "check.short.scip-3.1.0.1.linux.x86_64.gnu.dbg.spx.opt85.testmode.out")
+        self.experiment.addOutputFile(out_file)
+        self.experiment.collectData()
+        tr = self.experiment.getTestRuns()[0]
+        trn_file = os.path.join(TMPDIR, "memorymap.trn")
+        tr.saveToFile(trn_file)
+
+        tr2 = TestRun.loadFromFile(trn_file, memorymap = True)
+        assert_frame_equal(tr.getData(), tr2.getData())
+        solvingtime = tr2.getData()[Key.SolvingTime].to_numpy()
+        times, _ = tr2.getProblemDataById(0, Key.PrimalBoundHistory)
+        for array in (solvingtime, times):
+            self.assertFalse(array.flags.writeable)
+            while not isinstance(array, np.memmap) and array.base is not None:
+                array = array.base
+            self.assertIsInstance(array, np.memmap)
+
+        # saving over a mapped file keeps the mapped data valid
+        tr.saveToFile(trn_file)
+        self.assertEqual(list(tr.getData()[Key.SolvingTime]), list(solvingtime))
+
+        # mapped test runs can collect further data
+        tr2.setupForDataCollection()
+        tr2.addDataById([Key.PrimalBoundHistory, Key.SolvingTime], [[(0.5, 1.0)], 10.0], 0)
+        tr2.setupAfterDataCollection()
+        self.assertEqual([0.5], list(tr2.getProblemDataById(0, Key.PrimalBoundHistory)[0]))
+        self.assertEqual(10.0, tr2.getProblemDataById(0, Key.SolvingTime))
+
+    def test_schema(self):
+        out_file = os.path.join(DATADIR, "check.short.scip-3.1.0.1.linux.x86_64.gnu.dbg.spx.opt85.testmode.out")
+        self.experiment.addOutputFile(out_file)
+        self.experiment.addOutputFile(os.path.join(DATADIR, "scip-optimal.out"))
+        self.experiment.addSoluFile(os.path.join(DATADIR, "short.solu"))
+        self.experiment.addReader(CustomReader(regpattern = "Solving Nodes", datakey = "CustomNodes", index = 0, datatype = "int32"))
+        self.experiment.collectData()
+
+        self.assertEqual(Schema.DTYPE_INT32, Schema.getDataType("CustomNodes"))
+        for tr in self.experiment.getTestRuns():
+            df = tr.getData()
+            self.assertEqual("category", df[Key.ProblemName].dtype)
+            self.assertEqual(np.int32, df["CustomNodes"].dtype)
+            self.assertEqual(np.int64, df[Key.Nodes].dtype)
+
+        # the categories of different test runs are joined
+        data = self.experiment.getJoinedData()
+        self.assertEqual("category", data[Key.ProblemName].dtype)
+        self.assertEqual(np.float64, data[Key.SolvingTime].dtype)
+
     def test_problem_name_parsing(self):
         fname = "check.IP_0s_1s.scip-3.2.1.2.linux.x86_64.gnu.dbg.cpx.opt-low.default.out"
         out_file = os.path.join(DATADIR, fname)
@@ -127,6 +768,111 @@ class ExperimentTest(unittest.TestCase):
         tr2 = TestRun.loadFromFile(trn_file)
         self.checkTestrunsEqual(tr, tr2)
 
+    def test_snapshot(self):
+        out_file = os.path.join(DATADIR, "check.short.scip-3.1.0.1.linux.x86_64.gnu.dbg.spx.opt85.testmode.out")
+        solu_file = os.path.join(DATADIR, "short.solu")
+        self.experiment.addOutputFile(out_file)
+        self.experiment.addSoluFile(solu_file)
+        self.experiment.addReader(ListReader("Sep([ab]) +([^ ]*)", "testlr"))
+        self.experiment.collectData()
+        tr = self.experiment.getTestRuns()[0]
+
+        save_file = os.path.join(TMPDIR, ".testsnapshot.cmp")
+        self.experiment.saveToFile(save_file)
+        self.assertTrue(os.path.isfile(os.path.join(save_file, "manifest.json")))
+
+        # test runs are only loaded on access
+        experiment = Experiment.loadFromFile(save_file)
+        self.assertEqual(len(experiment.pendingtestruns), 1)
+        self.assertEqual(sorted(experiment.getDatakeys()), sorted(self.experiment.getDatakeys()))
+        self.assertEqual(experiment.solufiles, [os.path.abspath(solu_file)])
+        self.assertTrue(experiment.hasReader(ListReader("Sep([ab]) +([^ ]*)", "testlr")))
+        tr2 = experiment.getTestRuns()[0]
+        self.assertEqual(experiment.pendingtestruns, [])
+        self.assertEqual(tr2.getName(), tr.getName())
+        self.checkTestrunsEqual(tr, tr2)
+
+        # appending a test run leaves the files of the other test runs untouched
+        trn_file = os.path.join(save_file, "testruns", "0000.trn")
+        mtime = os.stat(trn_file).st_mtime_ns
+        experiment2 = Experiment()
+        experiment2.addOutputFile(os.path.join(DATADIR, "scip-optimal.out"))
+        experiment2.collectData()
+        tr3 = experiment2.getTestRuns()[0]
+        experiment.appendToFile(save_file, tr3)
+        self.assertEqual(os.stat(trn_file).st_mtime_ns, mtime)
+        with self.assertRaises(KeyError):
+            experiment.appendToFile(save_file, tr3)
+
+        experiment3 = Experiment.loadFromFile(save_file)
+        self.assertEqual(sorted(t.getName() for t in experiment3.getTestRuns()), sorted([tr.getName(), tr3.getName()]))
+        self.checkTestrunsEqual(tr3, experiment3.getManager("testrun").getManageable(tr3.getName()), ["SolvingTime", "Nodes"])
+
+    def test_outofbandPickle(self):
+        out_file = os.path.join(DATADIR, "check.short.scip-3.1.0.1.linux.x86_64.gnu.dbg.spx.opt85.testmode.out")
+        self.experiment.addOutputFile(out_file)
+        self.experiment.addSoluFile(os.path.join(DATADIR, "short.solu"))
+        self.experiment.collectData()
+        tr = self.experiment.getTestRuns()[0]
+        columns = list(tr.getData().columns)
+
+        trn_file = os.path.join(TMPDIR, ".testrun.trn")
+        tr.saveToFile(trn_file, columnar = False)
+        self.assertTrue(os.path.exists(misc.getBufferFileName(trn_file)))
+        for memorymap in (False, True):
+            tr2 = TestRun.loadFromFile(trn_file, memorymap = memorymap)
+            self.checkTestrunsEqual(tr, tr2, columns)
+            self.assertEqual(tr.histories.keys(), tr2.histories.keys())
+            for datakey, historycolumn in tr.histories.items():
+                for problemid, (times, values) in historycolumn.items():
+                    times2, values2 = tr2.histories[datakey].get(problemid)
+                    self.assertTrue(np.array_equal(times, times2) and np.array_equal(values, values2))
+            tr2.deleteProblemDataById(0)
+
+        # pickles of earlier versions and in-band pickles are still loaded, the latter remove outdated buffers
+        for protocol in (2, pickle.HIGHEST_PROTOCOL):
+            with open(trn_file, "wb") as f:
+                pickle.dump(tr, f, protocol = protocol)
+            self.checkTestrunsEqual(tr, TestRun.loadFromFile(trn_file), columns)
+        tr.saveToFile(trn_file, columnar = False, outofband = False)
+        self.assertFalse(os.path.exists(misc.getBufferFileName(trn_file)))
+        self.checkTestrunsEqual(tr, TestRun.loadFromFile(trn_file), columns)
+
+        save_file = os.path.join(TMPDIR, ".testcomp.cmp")
+        self.experiment.saveToFile(save_file, snapshot = False)
+        self.assertTrue(os.path.exists(misc.getBufferFileName(save_file)))
+        experiment = Experiment.loadFromFile(save_file)
+        self.checkTestrunsEqual(tr, experiment.getTestRuns()[0], columns)
+
+    def test_saveTestRunFiles(self):
+        for fname in ("check.short.scip-3.1.0.1.linux.x86_64.gnu.dbg.spx.opt85.testmode.out", "bell3a.out"):
+            shutil.copy(os.path.join(DATADIR, fname), TMPDIR)
+            self.experiment.addOutputFile(os.path.join(TMPDIR, fname))
+        self.experiment.addSoluFile(os.path.join(DATADIR, "short.solu"))
+        self.experiment.collectData()
+
+        with self.assertRaises(ValueError):
+            self.experiment.saveTestRunFiles(".zip")
+        for compression, compresslevel in ((None, None), (".gz", 1), (".xz", 0), (".bz2", 9)):
+            saved = self.experiment.saveTestRunFiles(compression, compresslevel, workers = 2)
+            self.assertEqual(len(saved), 2)
+            for tr, filename in saved:
+                self.assertTrue(filename.endswith(TestRun.FILE_EXTENSION + (compression or "")))
+                tr2 = TestRun.loadFromFile(filename)
+                self.checkTestrunsEqual(tr, tr2, list(tr.getData().columns))
+                # compressed files are read instead of memory-mapped
+                tr2 = TestRun.loadFromFile(filename, datakeys = [], memorymap = True)
+                self.checkTestrunsEqual(tr, tr2, list(tr.getData().columns))
+
+        # a directory in place of a .trn-file cannot be written
+        trn_file = os.path.join(TMPDIR, "bell3a" + TestRun.FILE_EXTENSION)
+        os.remove(trn_file)
+        os.mkdir(trn_file)
+        with self.assertLogs(level = "WARNING"):
+            saved = dict((tr.getName(), filename) for tr, filename in self.experiment.saveTestRunFiles())
+        self.assertIsNone(saved["bell3a"])
+        self.assertIsNotNone(saved["check.short.scip-3.1.0.1.linux.x86_64.gnu.dbg.spx.opt85.testmode"])
+
     def test_problemNameRecognition(self):
         rm = ReaderManager()
         problemnames2line = {}
@@ -168,8 +914,12 @@ class ExperimentTest(unittest.TestCase):
         for extension in ReaderManager().getFileExtensions():
             self.experiment.addOutputFile("bla" + extension)
 
+        # compressed files are recognized by the extension of their uncompressed counterparts
+        for extension in [".out.gz", ".err.bz2", ".solu.xz"]:
+            self.experiment.addOutputFile("bla" + extension)
+
         # if called with an unknown extension, this should raise a ValueError
-        for otherextension in [".res", ".txt"]:
+        for otherextension in [".res", ".txt", ".res.xz"]:
             with self.assertRaises(ValueError):
                 self.experiment.addOutputFile("bla" + otherextension)
 
@@ -181,6 +931,20 @@ class ExperimentTest(unittest.TestCase):
             lrlinedata = lr.getLineData(line)
             self.assertEqual(lrlinedata, correctanswers[idx], "Wrongly parsed line '%s'" % line)
 
+    def test_ReaderDispatcher(self):
+        nodesreader = NodesReader()
+        gapreader = GapReader()
+        lr = ListReader("Sep([ab]) +([^ ]*)", "testlr")
+        fallbackreader = BestSolInfeasibleReader()
+        dispatcher = ReaderDispatcher([nodesreader, gapreader, lr, fallbackreader])
+
+        lines2readers = (("  nodes (total)    :        1 (run 1)", [nodesreader, fallbackreader]),
+                         ("Gap                :       0.00 %", [gapreader, fallbackreader]),
+                         ("Sepa 1", [lr, fallbackreader]),
+                         ("  0.1s|     1 |     0 |   123 |", [fallbackreader]))
+        for line, readers in lines2readers:
+            self.assertEqual(dispatcher.getReaders(line), readers, "Wrong readers for line '%s'" % line)
+
     def test_parsingOfSettingsFile(self):
         fname = "check.bugs.scip-221aa62.linux.x86_64.gnu.opt.spx.opt97.default.set"
         set_file = os.path.join(DATADIR, fname)
@@ -7,6 +7,7 @@ import unittest
 import os
 from ipet.parsing.Solver import SCIPSolver, GurobiSolver, CplexSolver, CbcSolver, XpressSolver
 from ipet import Key
+from ipet.misc import misc
 from ipet.parsing.MIPCLSolver import MIPCLSolver
 
 DATADIR = os.path.join(os.path.dirname(__file__), "data")
@@ -236,6 +237,49 @@ class SolverTest(unittest.TestCase):
             for key in self.fileinfo.get(filename)[ALMOST].keys():
                 self.assertAlmost(filename, key)
 
+    def testSections(self):
+        expectedsections = [Key.SECTION_HEADER, Key.SECTION_PRESOLVE, Key.SECTION_TABLE, Key.SECTION_STATISTICS]
+        for filename in ["scip-optimal", "gurobi-bab5", "cplex-bab5"]:
+            file = self.getFileName(filename)
+            self.readSolver(file)
+            self.activeSolver.reset()
+            sections = []
+            with open(file, "r") as f:
+                for line in f:
+                    self.activeSolver.readLine(line)
+                    if len(sections) == 0 or sections[-1] != self.activeSolver.getSection():
+                        sections.append(self.activeSolver.getSection())
+            self.assertEqual(expectedsections, sections, "wrong sections in {}".format(filename))
+
+    def testLogLine(self):
+        for filename in list(self.fileinfo.keys()) + ["scip-optimal", "scip-timelimit"]:
+            file = self.getFileName(filename)
+            self.readFile(file)
+            strdata = dict(zip(*self.activeSolver.getData()))
+            self.readFile(file, linetype = misc.LogLine)
+            loglinedata = dict(zip(*self.activeSolver.getData()))
+            self.assertEqual(strdata, loglinedata, "different data for log lines in {}".format(filename))
+
+        line = misc.LogLine("  1.5s|     1 |  12 | cutoff | 3.0e+01 |  -- | 4.2%\n")
+        for start, end in [(0, None), (6, None), (0, line.rindex("|")), (7, 20), (3, 5)]:
+            self.assertEqual(misc.getNumbers(str(line), start, end), misc.getNumbers(line, start, end))
+        self.assertIs(misc.getTableNumbers(line), misc.getTableNumbers(line))
+
+    def testOneShotExtractors(self):
+        self.readFile(self.getFileName("scip-optimal"))
+        self.assertIn("extractVersion", self.activeSolver.completedextractors)
+        version = self.activeSolver.getData(Key.Version)
+
+        # completed extractors and extractors outside of their sections do not run until the next reset
+        self.activeSolver.readLine("SCIP version 0.0.0 [mode: none]\n")
+        self.assertEqual(version, self.activeSolver.getData(Key.Version))
+        self.assertNotEqual("none", self.activeSolver.getData("mode"))
+
+        self.activeSolver.reset()
+        self.activeSolver.readLine("SCIP version 0.0.0 [mode: none]\n")
+        self.assertEqual("0.0.0", self.activeSolver.getData(Key.Version))
+        self.assertEqual("none", self.activeSolver.getData("mode"))
+
     def assertPrecise(self, filename, key):
         refvalue = self.fileinfo.get(filename)[PRECISE].get(key)
         self.assertEqual(refvalue, self.activeSolver.getData(key))
@@ -248,12 +292,12 @@ class SolverTest(unittest.TestCase):
         else:
             self.assertIsNone(self.activeSolver.getData(key), "'{}' should have 'None' as {}".format(filename, key))
 
-    def readFile(self, filename):
+    def readFile(self, filename, linetype = str):
         self.readSolver(filename)
         self.activeSolver.reset()
         with open(filename, "r") as f:
             for line in f:
-                self.activeSolver.readLine(line)
+                self.activeSolver.readLine(linetype(line))
 
     def readSolver(self, filename):
         with open(filename) as f:
@@ -0,0 +1,78 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2016 Zuse Institute Berlin, www.zib.de
+
+Permissions are granted as stated in the license file you have obtained
+with this software. If you find the library useful for your purpose,
+please refer to README.md for how to cite IPET.
+
+@author: Gregor Hendel
+
+measures the time for calculating gaps and problem status codes of many problems
+
+Run with
+
+    >>> python test/ValidationBenchmark.py [-n PROBLEMS] [-r REPETITIONS]
+
+The benchmark collects random bounds, known solution values, and solver and solu file status codes for PROBLEMS problems
+and reports the time of the vectorized validation next to the time of the scalar status calculation for 1% of the problems.
+"""
+import argparse
+import pickle
+import time
+import numpy as np
+from ipet import Key
+from ipet.Experiment import Experiment
+from ipet.TestRun import TestRun
+
+def createTestRun(nproblems, seed = 0):
+    """ Return a test run in collection mode with random data for the given number of problems
+    """
+    rng = np.random.default_rng(seed)
+    testrun = TestRun(["benchmark.out"])
+    problemids = np.arange(nproblems)
+    optval = rng.normal(size = nproblems) * 100
+    columns = {
+               Key.PrimalBound : optval + rng.choice([0.0, 1e-3, 1.0], nproblems),
+               Key.DualBound : optval - rng.choice([0.0, 1e-3, 1.0], nproblems),
+               Key.OptimalValue : optval,
+               Key.ObjectiveSense : rng.choice([1, -1], nproblems),
+               Key.SolverStatus : rng.integers(0, 5, nproblems),
+               Key.SolvingTime : rng.random(nproblems),
+               Key.SolutionFileStatus : rng.choice(np.array(["opt", "best", "inf", "unkn"], dtype = object), nproblems)
+               }
+    for datakey, values in columns.items():
+        testrun.addDataByIds(datakey, problemids, values)
+    testrun.currentproblemid = nproblems
+    return testrun
+
+def timeValidation(testrun, repetitions):
+    starttime = time.perf_counter()
+    for _ in range(repetitions):
+        experiment = Experiment()
+        experiment.testrunmanager.addAndActivate(testrun)
+        experiment.calculateGaps()
+        experiment.checkProblemStatus()
+    return (time.perf_counter() - starttime) / repetitions
+
+def timeScalarValidation(testrun, nproblems):
+    experiment = Experiment()
+    starttime = time.perf_counter()
+    for problemid in range(nproblems):
+        experiment.determineStatus(testrun, problemid)
+    return time.perf_counter() - starttime
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "measure the time for calculating gaps and problem status codes")
+    parser.add_argument("-n", "--problems", type = int, default = 10 ** 6, help = "number of problems")
+    parser.add_argument("-r", "--repetitions", type = int, default = 3, help = "number of repetitions")
+    args = parser.parse_args()
+
+    testrun = createTestRun(args.problems)
+    vectorized = timeValidation(pickle.loads(pickle.dumps(testrun)), args.repetitions)
+    nscalar = max(args.problems // 100, 1)
+    scalar = timeScalarValidation(testrun, nscalar)
+    print("%-12s %12s %12s" % ("validation", "problems", "time [s]"))
+    print("%-12s %12d %12.4f" % ("vectorized", args.problems, vectorized))
+    print("%-12s %12d %12.4f (%.4f s extrapolated to %d problems)" % ("scalar", nscalar, scalar, scalar * args.problems / nscalar, args.problems))